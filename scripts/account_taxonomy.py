@@ -0,0 +1,278 @@
+import csv
+import os
+import re
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from financial_ingest import FinancialBatch
+
+# 표준계정코드가 없는 행의 account_id
+NON_STANDARD_ACCOUNT_ID = '-표준계정코드 미사용-'
+
+# 표준 계정 ID 접두사 (ifrs_는 이전 taxonomy 표기로 ifrs-full_과 같은 개념)
+CANONICAL_IFRS_PREFIX = 'ifrs-full_'
+LEGACY_IFRS_PREFIX = 'ifrs_'
+STANDARD_PREFIXES = (CANONICAL_IFRS_PREFIX, LEGACY_IFRS_PREFIX, 'dart_')
+
+# 재무제표와 관계없이 적용하는 계정명 매핑 키
+ANY_STATEMENT = '*'
+
+# 저장 파일 컬럼 순서
+TAXONOMY_COLUMNS = ['statement_name', 'account_nm', 'account_id']
+
+BALANCE_SHEET = ('재무상태표',)
+INCOME_STATEMENT = ('손익계산서', '포괄손익계산서')
+CASH_FLOW = ('현금흐름표',)
+
+# 직접 정한 계정명 → 표준 계정 ID (재무제표, 계정명 목록, 표준 계정 ID)
+# 데이터에서 학습한 매핑보다 우선합니다.
+SEED_ACCOUNT_NAMES = [
+    (BALANCE_SHEET, ['자산총계'], 'ifrs-full_Assets'),
+    (BALANCE_SHEET, ['유동자산'], 'ifrs-full_CurrentAssets'),
+    (BALANCE_SHEET, ['비유동자산'], 'ifrs-full_NoncurrentAssets'),
+    (BALANCE_SHEET, ['부채총계'], 'ifrs-full_Liabilities'),
+    (BALANCE_SHEET, ['유동부채'], 'ifrs-full_CurrentLiabilities'),
+    (BALANCE_SHEET, ['비유동부채'], 'ifrs-full_NoncurrentLiabilities'),
+    (BALANCE_SHEET, ['자본총계'], 'ifrs-full_Equity'),
+    (BALANCE_SHEET, ['부채와자본총계', '자본과부채총계'], 'ifrs-full_EquityAndLiabilities'),
+    (BALANCE_SHEET, ['현금및현금성자산'], 'ifrs-full_CashAndCashEquivalents'),
+    (BALANCE_SHEET, ['재고자산'], 'ifrs-full_Inventories'),
+    (BALANCE_SHEET, ['자본금'], 'ifrs-full_IssuedCapital'),
+    (BALANCE_SHEET, ['이익잉여금', '이익잉여금(결손금)', '결손금'], 'ifrs-full_RetainedEarnings'),
+    (INCOME_STATEMENT, ['매출액', '수익(매출액)', '영업수익'], 'ifrs-full_Revenue'),
+    (INCOME_STATEMENT, ['매출원가'], 'ifrs-full_CostOfSales'),
+    (INCOME_STATEMENT, ['매출총이익'], 'ifrs-full_GrossProfit'),
+    (INCOME_STATEMENT, ['영업이익', '영업손익'], 'dart_OperatingIncomeLoss'),
+    (INCOME_STATEMENT, ['법인세비용차감전순이익', '법인세비용차감전순손익', '법인세차감전순이익',
+                        '법인세비용차감전계속영업이익'], 'ifrs-full_ProfitLossBeforeTax'),
+    (INCOME_STATEMENT, ['법인세비용'], 'ifrs-full_IncomeTaxExpenseContinuingOperations'),
+    (INCOME_STATEMENT, ['당기순이익', '당기순손익'], 'ifrs-full_ProfitLoss'),
+    (INCOME_STATEMENT, ['총포괄이익', '총포괄손익', '당기총포괄이익'], 'ifrs-full_ComprehensiveIncome'),
+    (CASH_FLOW, ['영업활동현금흐름', '영업활동으로인한현금흐름'], 'ifrs-full_CashFlowsFromUsedInOperatingActivities'),
+    (CASH_FLOW, ['투자활동현금흐름', '투자활동으로인한현금흐름'], 'ifrs-full_CashFlowsFromUsedInInvestingActivities'),
+    (CASH_FLOW, ['재무활동현금흐름', '재무활동으로인한현금흐름'], 'ifrs-full_CashFlowsFromUsedInFinancingActivities'),
+    (CASH_FLOW, ['당기순이익', '당기순손익'], 'ifrs-full_ProfitLoss'),
+]
+
+# 계정명 앞 번호 (Ⅰ. / 1. / 가. / (1) / (가)), NFKC 정규화 후 적용
+_NUMBERING = re.compile(r'^(?:(?:[IVX]+|\d+|[가-하])\s*[.)]|\(\s*(?:\d+|[가-하])\s*\))\s*')
+# 손익 계정명 뒤에 붙는 부호 표기 (예: 영업이익(손실))
+_SIGN_SUFFIX = re.compile(r'\((?:손실|이익|손익)\)')
+_PUNCTUATION = re.compile(r"[\s.,·ㆍ_\-'\"]")
+
+
+def canonical_account_id(account_id: str) -> str:
+    """
+    표준 계정 ID의 taxonomy 표기 통일 (ifrs_X → ifrs-full_X, 그 외는 그대로)
+    """
+    if account_id.startswith(LEGACY_IFRS_PREFIX):
+        return CANONICAL_IFRS_PREFIX + account_id[len(LEGACY_IFRS_PREFIX):]
+    return account_id
+
+
+def is_standard_account_id(account_id: str) -> bool:
+    """
+    ifrs-full_/ifrs_/dart_ 표준 계정 ID인지 확인 (미사용 표기, 회사 자체 ID는 False)
+    """
+    return account_id.startswith(STANDARD_PREFIXES)
+
+
+def normalize_account_nm(name: str) -> str:
+    """
+    계정명 비교용 정규화 (전각/로마 숫자 통일, 앞 번호·부호 표기·공백·구두점 제거)
+    """
+    name = unicodedata.normalize('NFKC', name or '').strip()
+    name = _NUMBERING.sub('', name)
+    return _PUNCTUATION.sub('', _SIGN_SUFFIX.sub('', name))
+
+
+def _seed_names() -> Dict[Tuple[str, str], str]:
+    return {
+        (statement, normalize_account_nm(name)): account_id
+        for statements, names, account_id in SEED_ACCOUNT_NAMES
+        for statement in statements
+        for name in names
+    }
+
+
+class AccountTaxonomy:
+    """
+    계정 ID 정규화 색인
+
+    - 표준 계정 ID는 ifrs_ → ifrs-full_ 표기를 통일합니다.
+    - 표준계정코드 미사용 행(및 회사 자체 ID)은 (재무제표, 정규화 계정명) 색인으로
+      표준 계정 ID를 찾고, 찾지 못하면 원래 ID를 유지합니다.
+    - 배치 안의 서로 다른 (ID, 계정명, 재무제표) 조합마다 한 번만 계산하고
+      결과를 재사용하므로 행마다 조건 분기를 타지 않습니다.
+    """
+
+    def __init__(self, names: Optional[Dict[Tuple[str, str], str]] = None):
+        """
+        Args:
+            names (Optional[Dict[Tuple[str, str], str]]): (재무제표, 정규화 계정명) → 표준 계정 ID
+                (SEED_ACCOUNT_NAMES가 같은 키에 우선 적용됨)
+        """
+        self.names = {**(names or {}), **_seed_names()}
+        self._resolved: Dict[Tuple[str, str, str], str] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def resolve(self, account_id: str, account_nm: str = '', statement_name: str = '') -> str:
+        """
+        행 하나의 표준 계정 ID
+        """
+        key = (account_id, account_nm, statement_name)
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            if is_standard_account_id(account_id):
+                resolved = canonical_account_id(account_id)
+            else:
+                name = normalize_account_nm(account_nm)
+                resolved = (self.names.get((statement_name, name))
+                            or self.names.get((ANY_STATEMENT, name))
+                            or account_id)
+            self._resolved[key] = resolved
+        return resolved
+
+    def canonicalize_ids(self, account_ids: Sequence[str], account_nms: Sequence[str],
+                         statement_names: Sequence[str]) -> List[str]:
+        """
+        account_id 목록을 표준 계정 ID 목록으로 변환
+        """
+        resolve = self.resolve
+        return [
+            sys.intern(resolve(account_id, account_nm, statement_name))
+            for account_id, account_nm, statement_name in zip(account_ids, account_nms, statement_names)
+        ]
+
+    def canonicalize_batch(self, batch: FinancialBatch) -> FinancialBatch:
+        """
+        배치의 account_id 컬럼을 표준 계정 ID로 교체한 새 배치 (raw_account_id의 원본 계정 ID는 그대로)
+        """
+        columns = dict(batch.columns)
+        columns['account_id'] = self.canonicalize_ids(
+            columns['account_id'], columns['account_nm'], columns['statement_name']
+        )
+        return FinancialBatch(columns)
+
+    def canonicalize_frame(self, df):
+        """
+        DataFrame의 account_id 컬럼을 표준 계정 ID로 교체한 복사본 (이미 저장된 데이터용)
+
+        서로 다른 (account_id, account_nm, statement_name) 조합만 계산해 다시 펼칩니다.
+        """
+        import pandas as pd
+
+        keys = df[['account_id', 'account_nm', 'statement_name']].astype(str)
+        codes, uniques = pd.MultiIndex.from_frame(keys).factorize()
+        resolved = self.canonicalize_ids(
+            uniques.get_level_values(0), uniques.get_level_values(1), uniques.get_level_values(2)
+        )
+
+        result = df.copy()
+        result['account_id'] = pd.Index(resolved, dtype=object).take(codes).to_numpy()
+        return result
+
+    @classmethod
+    def learn(cls, rows: Iterable[Tuple[str, str, str]], min_count: int = 2,
+              min_share: float = 0.8) -> 'AccountTaxonomy':
+        """
+        표준 계정 ID가 있는 행에서 (재무제표, 정규화 계정명) → 표준 계정 ID 매핑 학습
+
+        같은 계정명이 여러 ID로 쓰였으면 가장 많이 쓰인 ID가 min_share 이상일 때만 채택합니다.
+
+        Args:
+            rows (Iterable[Tuple[str, str, str]]): (account_id, account_nm, statement_name)
+            min_count (int): 채택할 최소 관측 수
+            min_share (float): 채택할 최소 비율
+
+        Returns:
+            AccountTaxonomy: 학습한 매핑이 담긴 색인
+        """
+        counts: Dict[Tuple[str, str], Counter] = defaultdict(Counter)
+        for account_id, account_nm, statement_name in rows:
+            if not is_standard_account_id(account_id):
+                continue
+            name = normalize_account_nm(account_nm)
+            if name:
+                counts[(statement_name, name)][canonical_account_id(account_id)] += 1
+
+        names = {}
+        for key, ids in counts.items():
+            account_id, count = ids.most_common(1)[0]
+            total = sum(ids.values())
+            if total >= min_count and count / total >= min_share:
+                names[key] = account_id
+        return cls(names)
+
+    @classmethod
+    def learn_csv(cls, path: str, **kwargs) -> 'AccountTaxonomy':
+        """
+        delisted_financials_all 형식 CSV에서 한 행씩 읽어 학습
+        """
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.DictReader(f)
+            return cls.learn(
+                # 표준 계정 ID로 바꿔 저장한 파일이면 DART 원본 계정 ID로 학습
+                ((row.get('raw_account_id') or row['account_id'] or '', row['account_nm'] or '',
+                  row['statement_name'] or '') for row in reader),
+                **kwargs
+            )
+
+    @classmethod
+    def load(cls, path: str) -> 'AccountTaxonomy':
+        """
+        save로 저장한 매핑 파일 읽기
+        """
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f, delimiter='\t')
+            next(reader, None)
+            return cls({(statement_name, account_nm): account_id for statement_name, account_nm, account_id in reader})
+
+    def save(self, path: str):
+        """
+        매핑을 탭 구분 파일로 저장 (임시 파일에 쓴 뒤 교체)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter='\t', lineterminator='\n')
+            writer.writerow(TAXONOMY_COLUMNS)
+            writer.writerows(
+                (statement_name, account_nm, account_id)
+                for (statement_name, account_nm), account_id in sorted(self.names.items())
+            )
+        os.replace(tmp_path, path)
+
+
+def load_taxonomy(path: Optional[str]) -> AccountTaxonomy:
+    """
+    매핑 파일이 있으면 읽고, 없으면 기본 계정명 매핑만 사용
+    """
+    if path and os.path.exists(path):
+        return AccountTaxonomy.load(path)
+    return AccountTaxonomy()
+
+
+def main():
+    """
+    기존 CSV에서 계정명 매핑을 학습해 저장
+
+    python account_taxonomy.py [CSV 경로]  (DELIST_ACCOUNT_TAXONOMY로 저장 경로 지정)
+    """
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'data/delisted_financials_all.csv'
+    taxonomy_path = os.getenv('DELIST_ACCOUNT_TAXONOMY') or 'data/account_taxonomy.tsv'
+
+    taxonomy = AccountTaxonomy.learn_csv(csv_path)
+    taxonomy.save(taxonomy_path)
+    print(f"계정 매핑 저장 완료: {taxonomy_path} ({len(taxonomy)}개 계정명)")
+
+
+if __name__ == "__main__":
+    main()
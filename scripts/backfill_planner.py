@@ -0,0 +1,145 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+# DART 보고서 코드
+ANNUAL_REPORT = '11011'     # 사업보고서
+HALF_YEAR_REPORT = '11012'  # 반기보고서
+Q1_REPORT = '11013'         # 1분기보고서
+Q3_REPORT = '11014'         # 3분기보고서
+
+REPORT_CODES = (ANNUAL_REPORT, HALF_YEAR_REPORT, Q3_REPORT, Q1_REPORT)
+
+# 같은 연도 안에서의 보고서 우선순위 (사업보고서 → 반기 → 3분기 → 1분기)
+REPORT_PRIORITY = {code: i for i, code in enumerate(REPORT_CODES)}
+
+
+class FetchTask(NamedTuple):
+    """
+    재무제표 조회 작업 하나 (기업 × 연도 × 보고서)
+    """
+    priority: int
+    ticker: str
+    corp_code: str
+    year: str
+    reprt_code: str
+
+    @property
+    def key(self) -> tuple:
+        """
+        중복 판별 키 (corp_code, year, reprt_code)
+        """
+        return (self.corp_code, self.year, self.reprt_code)
+
+    @property
+    def checkpoint_key(self) -> str:
+        """
+        체크포인트에 기록하는 작업 식별자
+        """
+        return f"{self.ticker}|{self.year}|{self.reprt_code}"
+
+
+class BackfillPlanner:
+    """
+    상장 폐지 기업을 (corp_code, 연도, 보고서) 조회 작업으로 펼치는 planner
+
+    - 폐지 직전년도부터 years_back개 연도의 보고서를 대상으로 합니다.
+    - 사업보고서의 frmtrm_amount(전기 금액)가 직전 연도 값을 담고 있으므로,
+      skip_covered_years를 켜면 사업보고서는 두 해에 한 번만 조회합니다. 건너뛴 연도는 출력에
+      행이 없으므로(해당 값은 다음 연도 행의 prev_term_amount에만 있음) this_term_amount를
+      (ticker, year)별로 쓰는 pivot/ratios/panel 결과에서는 빠집니다. DART 호출 수를 줄여야 할 때만 켭니다.
+    - 기업 간(같은 corp_code) 중복 작업과 이전 실행에서 완료된 작업을 제거하고
+      우선순위(직전년도 사업보고서 → 과거 사업보고서 → 분기/반기 보고서) 순으로 정렬합니다.
+    """
+
+    def __init__(self, years_back: int = 1, reprt_codes: Sequence[str] = (ANNUAL_REPORT,),
+                 skip_covered_years: bool = False):
+        """
+        Args:
+            years_back (int): 폐지 직전년도를 포함해 조회할 연도 수
+            reprt_codes (Sequence[str]): 조회할 보고서 코드 (11011/11012/11013/11014)
+            skip_covered_years (bool): 전기 금액으로 채워지는 연도의 사업보고서 조회 생략 여부
+        """
+        unknown = [code for code in reprt_codes if code not in REPORT_PRIORITY]
+        if unknown:
+            raise ValueError(f"지원하지 않는 보고서 코드입니다: {unknown}")
+        if years_back < 1:
+            raise ValueError("years_back은 1 이상이어야 합니다.")
+
+        self.years_back = years_back
+        self.reprt_codes = sorted(set(reprt_codes), key=REPORT_PRIORITY.get)
+        self.skip_covered_years = skip_covered_years
+
+    def annual_years(self, target_year: int) -> List[int]:
+        """
+        사업보고서를 조회할 연도 목록
+
+        Args:
+            target_year (int): 폐지 직전년도
+
+        Returns:
+            List[int]: 조회 연도 (최근 연도부터)
+        """
+        years = [target_year - offset for offset in range(self.years_back)]
+        if self.skip_covered_years:
+            # y년 사업보고서의 frmtrm_amount가 y-1년 값을 담으므로 한 해씩 건너뜀
+            years = years[::2]
+        return years
+
+    def expand(self, company: Dict[str, Any], target_year: str) -> List[FetchTask]:
+        """
+        기업 하나를 조회 작업 목록으로 펼치기
+
+        Args:
+            company (Dict[str, Any]): 기업 정보 (ticker, corp_code)
+            target_year (str): 폐지 직전년도
+
+        Returns:
+            List[FetchTask]: 조회 작업 목록
+        """
+        ticker = company.get('ticker')
+        corp_code = company.get('corp_code')
+        if not corp_code or not target_year:
+            return []
+
+        target = int(target_year)
+        tasks = []
+        for reprt_code in self.reprt_codes:
+            if reprt_code == ANNUAL_REPORT:
+                years = self.annual_years(target)
+            else:
+                years = [target - offset for offset in range(self.years_back)]
+
+            for year in years:
+                # 직전년도 사업보고서가 가장 먼저, 이후 연도가 오래될수록·분기 보고서일수록 뒤로
+                priority = (target - year) * len(REPORT_CODES) + REPORT_PRIORITY[reprt_code]
+                if reprt_code != ANNUAL_REPORT:
+                    priority += self.years_back * len(REPORT_CODES)
+                tasks.append(FetchTask(priority, ticker, corp_code, str(year), reprt_code))
+
+        return tasks
+
+    def plan(self, companies: Iterable[Dict[str, Any]], target_years: Dict[str, str],
+             completed: Optional[Set[str]] = None) -> List[FetchTask]:
+        """
+        전체 기업의 조회 작업을 중복 제거 후 우선순위 순으로 정렬
+
+        Args:
+            companies (Iterable[Dict[str, Any]]): 기업 목록
+            target_years (Dict[str, str]): ticker → 폐지 직전년도
+            completed (Optional[Set[str]]): 이전 실행에서 완료된 작업 식별자(checkpoint_key)
+
+        Returns:
+            List[FetchTask]: 실행할 조회 작업 목록
+        """
+        completed = completed or set()
+        seen = set()
+        tasks = []
+
+        for company in companies:
+            for task in self.expand(company, target_years.get(company.get('ticker'))):
+                if task.key in seen or task.checkpoint_key in completed:
+                    continue
+                seen.add(task.key)
+                tasks.append(task)
+
+        tasks.sort()
+        return tasks
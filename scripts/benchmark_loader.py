@@ -0,0 +1,162 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from dart_stub_server import COMPANIES_FIXTURE, FINANCIALS_FIXTURE, StubConfig, StubState, create_server, load_fixtures
+
+
+def _serve(config: StubConfig, financials_path: str, companies_path: str, ready, stop):
+    """
+    별도 프로세스에서 가짜 서버 실행 (로더 프로세스의 RSS에 서버 메모리가 섞이지 않도록)
+    """
+    statements, companies = load_fixtures(financials_path, companies_path)
+    state = StubState(statements, companies, config)
+    server = create_server(state)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    ready.put(server.server_address[1])
+    stop.wait()
+    server.shutdown()
+    ready.put({'requests': state.requests, 'errors': state.errors, 'throttles': state.throttles})
+
+
+def _percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) * 1000 if values else 0.0
+
+
+def run_benchmark(port: int, workers: int, limit: int = None, requests_per_second: float = None,
+                  output_format: str = 'csv', verbose: bool = False) -> Dict[str, Any]:
+    """
+    가짜 서버를 대상으로 DelistDataLoader 전체 실행 한 번 측정
+
+    Args:
+        port (int): 가짜 서버 포트
+        workers (int): 동시 조회 워커 수
+        limit (int): 처리할 기업 수 제한
+        requests_per_second (float): DART 초당 호출 제한 (None이면 DART_REQUESTS_PER_SECOND 설정 사용)
+        output_format (str): 출력 형식
+        verbose (bool): 로더 출력 표시 여부
+
+    Returns:
+        Dict[str, Any]: 측정 결과
+    """
+    output_dir = tempfile.mkdtemp(prefix='delist_bench_')
+    base_url = f"http://127.0.0.1:{port}"
+    os.environ.update({
+        'SUPABASE_URL': base_url,
+        'SUPABASE_ANON_KEY': 'benchmark',
+        'DART_API_KEY': 'benchmark',
+        'DART_BASE_URL': f"{base_url}/api",
+        'DART_CACHE_PATH': '',
+        'DART_CORP_INDEX_PATH': '',
+        'DELIST_COMPANIES_PATH': '',
+        'DELIST_DB_SINK': '',
+        'DELIST_STATE_PATH': os.path.join(output_dir, 'loader_state.sqlite3'),
+        'DELIST_STORE_PATH': os.path.join(output_dir, 'delisted_financials.sqlite3'),
+        'DELIST_LOG_LEVEL': 'INFO' if verbose else 'ERROR',
+        'DELIST_OUTPUT_PATH': os.path.join(output_dir, f"delisted_financials_all.{output_format}"),
+    })
+
+    from delist_data_loader import DelistDataLoader
+
+    latencies = []
+    loader = DelistDataLoader(max_workers=workers, requests_per_second=requests_per_second,
+                              output_format=output_format)
+    loader.http.hooks['response'].append(lambda response, *args, **kwargs: latencies.append(
+        response.elapsed.total_seconds()
+    ))
+
+    try:
+        start = time.perf_counter()
+        summary = loader.process_all_delisted_companies(limit=limit)
+        elapsed = time.perf_counter() - start
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    companies = summary['companies']
+    return {
+        'workers': workers,
+        'companies': companies,
+        'tasks': summary['tasks'],
+        'succeeded': summary['succeeded'],
+        'elapsed_sec': round(elapsed, 3),
+        'companies_per_sec': round(companies / elapsed, 2) if elapsed and companies else 0.0,
+        'requests': len(latencies),
+        'requests_per_sec': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_p50_ms': round(_percentile(latencies, 50), 2),
+        'latency_p99_ms': round(_percentile(latencies, 99), 2),
+        'retries': loader.http.retry_count,
+        'throttled': loader.http.throttle_count,
+        # Linux에서 ru_maxrss 단위는 KB
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    """
+    가짜 DART/Supabase 서버로 로더 처리량 벤치마크 실행
+    """
+    parser = argparse.ArgumentParser(description='DelistDataLoader 오프라인 처리량 벤치마크')
+    parser.add_argument('--workers', default='1,4,8', help='워커 수 목록 (쉼표 구분)')
+    parser.add_argument('--limit', type=int, default=None, help='처리할 기업 수 제한')
+    # 속도 제한기가 있으면 순차 모드의 고정 0.3초 대기를 건너뛰므로 기본값은 충분히 큰 값
+    parser.add_argument('--rps', type=float, default=1000.0, help='DART 초당 호출 제한')
+    parser.add_argument('--format', default='csv', help='출력 형식 (csv/parquet/arrow)')
+    parser.add_argument('--latency', type=float, default=0.05, help='평균 응답 지연(초)')
+    parser.add_argument('--jitter', type=float, default=0.02, help='응답 지연 무작위 범위(초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='HTTP 500 응답 비율')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='요청 제한 응답 비율')
+    parser.add_argument('--throttle-code', default='020', choices=['020', '429'], help='요청 제한 응답 형식')
+    parser.add_argument('--seed', type=int, default=0, help='장애 주입 난수 시드')
+    parser.add_argument('--financials', default=FINANCIALS_FIXTURE, help='재무제표 fixture CSV')
+    parser.add_argument('--companies', default=COMPANIES_FIXTURE, help='기업 목록 fixture CSV')
+    parser.add_argument('--output', default=None, help='결과 JSON 저장 경로')
+    parser.add_argument('--verbose', action='store_true', help='로더 출력 표시')
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.throttle_code, args.seed)
+
+    results = []
+    for workers in (int(w) for w in args.workers.split(',')):
+        # 실행마다 새 서버와 새 프로세스로 측정해 통계와 최대 RSS가 섞이지 않게 함
+        ready, stop = multiprocessing.Queue(), multiprocessing.Event()
+        server = multiprocessing.Process(
+            target=_serve, args=(config, args.financials, args.companies, ready, stop), daemon=True
+        )
+        server.start()
+        port = ready.get(timeout=60)
+
+        with multiprocessing.Pool(1) as pool:
+            result = pool.apply(run_benchmark, (port, workers, args.limit, args.rps, args.format, args.verbose))
+
+        stop.set()
+        result['server'] = ready.get(timeout=10)
+        server.join(timeout=10)
+        results.append(result)
+
+        print(f"워커 {workers}개: {result['companies_per_sec']} 기업/초, {result['requests_per_sec']} 요청/초, "
+              f"p50 {result['latency_p50_ms']}ms, p99 {result['latency_p99_ms']}ms, "
+              f"재시도 {result['retries']}회, 최대 RSS {result['peak_rss_mb']}MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            # failing(frozenset)은 JSON으로 바로 쓸 수 없으므로 정렬된 목록으로 변환
+            failing = sorted([item] if isinstance(item, str) else list(item) for item in config.failing)
+            json.dump({'config': dict(config._asdict(), failing=failing), 'results': results}, f,
+                      ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    return results
+
+
+if __name__ == "__main__":
+    main()
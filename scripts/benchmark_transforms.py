@@ -0,0 +1,353 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from synthetic_financials import (NAN_COUNT_PATH, TEMPLATE_PATH, SyntheticFinancials, account_presence,
+                                  load_nan_counts, load_templates, sparsity_report, to_statement_lists)
+
+# 기준 결과 파일
+BASELINE_PATH = 'data/benchmarks/transform_baseline.json'
+
+# 측정 단계 (실행 순서)
+STAGES = ('generate', 'ingest', 'write', 'read', 'pivot_notebook', 'pivot', 'ratios')
+
+# 회귀 판정: 기준보다 tolerance 이상 느리거나 무겁고, 차이가 최소값보다 클 때만 (측정 잡음 무시)
+DEFAULT_TOLERANCE = 0.3
+MIN_SECONDS_DELTA = 0.05
+MIN_MEMORY_DELTA_MB = 16.0
+
+# 합성 데이터를 만드는 기업 수 단위 (DART 응답 형식 dict가 수집 단계 메모리에 섞이는 양 제한)
+BENCHMARK_CHUNK_COMPANIES = 200
+
+# RSS 표본 간격(초)
+SAMPLE_INTERVAL = 0.005
+
+
+def _current_rss_mb() -> float:
+    """
+    현재 프로세스 RSS (Linux는 /proc, 그 외는 지금까지의 최대 RSS로 대신함)
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StageMeter:
+    """
+    단계별 누적 시간과 최대 추가 메모리 측정
+
+    ru_maxrss는 프로세스 전체 최댓값만 알려 주므로, 표본 스레드가 RSS를 짧은 간격으로 읽어
+    단계에 들어갈 때의 RSS 대비 최댓값을 기록합니다. (pyarrow 등 파이썬 밖 할당도 포함)
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.results: Dict[str, Dict[str, float]] = {}
+        self._peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self._peak = max(self._peak, _current_rss_mb())
+
+    @contextmanager
+    def stage(self, name: str, baseline_mb: Optional[float] = None) -> Iterator[None]:
+        """
+        단계 측정 (같은 이름으로 여러 번 들어가면 시간은 합산, 메모리는 최댓값)
+
+        Args:
+            name (str): 단계 이름
+            baseline_mb (Optional[float]): 추가 메모리 기준 RSS (기본값: 단계에 들어갈 때의 RSS)
+        """
+        start_rss = _current_rss_mb()
+        self._peak = start_rss
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = max(self._peak, _current_rss_mb())
+            result = self.results.setdefault(name, {'seconds': 0.0, 'peak_mb': 0.0, 'rss_mb': 0.0})
+            result['seconds'] += elapsed
+            reference = start_rss if baseline_mb is None else baseline_mb
+            result['peak_mb'] = max(result['peak_mb'], peak - reference)
+            result['rss_mb'] = max(result['rss_mb'], peak)
+
+    def close(self) -> Dict[str, Dict[str, float]]:
+        self._stop.set()
+        self._thread.join()
+        return {
+            name: {key: round(value, 3 if key == 'seconds' else 1) for key, value in result.items()}
+            for name, result in self.results.items()
+        }
+
+
+def _loader_env(output_dir: str, output_format: str) -> Dict[str, str]:
+    """
+    네트워크/상태 파일 없이 로더의 수집·저장 경로만 쓰도록 하는 환경 변수
+    """
+    from delist_data_loader import OUTPUT_EXTENSIONS
+
+    return {
+        'SUPABASE_URL': 'http://127.0.0.1:9',
+        'SUPABASE_ANON_KEY': 'benchmark',
+        'DART_API_KEY': 'benchmark',
+        'DART_CACHE_PATH': '',
+        'DART_CORP_INDEX_PATH': '',
+        'DELIST_DB_SINK': '',
+        'DELIST_STORE': '',
+        'DELIST_STATE_PATH': '',
+        'DELIST_OUTPUT_PATH': os.path.join(output_dir, f"delisted_financials_all.{OUTPUT_EXTENSIONS[output_format]}"),
+    }
+
+
+def run_benchmark(scale: float, output_format: str = 'csv', seed: int = 0, notebook_pivot: bool = True,
+                  template_path: str = TEMPLATE_PATH) -> Dict[str, Any]:
+    """
+    합성 데이터 scale배로 오프라인 변환 단계 한 번 측정
+
+    - ingest: DelistDataLoader.collect_financial_data_for_csv (DART list → 컬럼 배치, 계정 ID 정규화)
+    - write: flush_csv_batch / save_all_data_to_csv (DELIST_BATCH_SIZE 단위 기록)
+    - read: 저장한 출력을 long DataFrame으로 읽기
+    - pivot_notebook: 노트북의 pivot_table(aggfunc='first')
+    - pivot: build_feature_matrix (sparse)
+    - ratios: compute_ratios + grade_risk
+
+    Returns:
+        Dict[str, Any]: 데이터 규모와 단계별 {'seconds', 'peak_mb', 'rss_mb'}
+    """
+    output_dir = tempfile.mkdtemp(prefix='delist_transform_bench_')
+    os.environ.update(_loader_env(output_dir, output_format))
+
+    from delist_cli import _load_financials
+    from delist_data_loader import DelistDataLoader
+    from feature_matrix import build_feature_matrix
+    from ratio_engine import compute_ratios, grade_risk
+    from run_metrics import set_log_level
+
+    set_log_level('ERROR')
+    meter = StageMeter()
+    rows = companies = filings = 0
+    presence = pd.Series(dtype=np.int64)
+    try:
+        loader = DelistDataLoader(output_format=output_format)
+        loader.open_output()
+
+        with meter.stage('generate'):
+            generator = SyntheticFinancials(load_templates(template_path), seed=seed)
+            n_companies = generator.companies_for_scale(scale)
+
+        # 수집/기록은 번갈아 실행되므로 메모리는 반복 시작 전 RSS 기준
+        # (DELIST_BATCH_SIZE 행까지 쌓이는 버퍼와 합성 청크 하나가 포함됨)
+        streaming_rss = _current_rss_mb()
+        for chunk in generator.iter_chunks(n_companies, BENCHMARK_CHUNK_COMPANIES):
+            with meter.stage('generate'):
+                statements = to_statement_lists(chunk)
+                rows += len(chunk)
+                # 합성 데이터가 원본 희소성을 유지했는지 확인용 (로더가 계정 ID를 바꾸기 전 기준)
+                filings += len(chunk[['ticker', 'year']].drop_duplicates())
+                presence = presence.add(account_presence(chunk), fill_value=0)
+                del chunk
+
+            # 로더의 수집 루프와 같이 batch_size 행이 쌓이면 기록
+            for ticker, year, fs_div, items in statements:
+                with meter.stage('ingest', streaming_rss):
+                    loader.collect_financial_data_for_csv(ticker, year, items, fs_div)
+                if loader._buffered_rows >= loader.batch_size:
+                    with meter.stage('write', streaming_rss):
+                        loader.flush_csv_batch()
+            del statements
+
+        with meter.stage('write', streaming_rss):
+            loader.save_all_data_to_csv()
+        companies = n_companies
+
+        with meter.stage('read'):
+            df = _load_financials(loader.output_path, output_format)
+
+        if notebook_pivot:
+            with meter.stage('pivot_notebook'):
+                data = df[df['statement_name'] != '현금흐름표']
+                pivot = data.pivot_table(index='ticker', columns='account_id', values='this_term_amount',
+                                         aggfunc='first')
+                del data, pivot
+
+        with meter.stage('pivot'):
+            matrix = build_feature_matrix(df, backend='sparse')
+            pivot_shape = list(matrix.shape)
+            del matrix
+
+        with meter.stage('ratios'):
+            graded = grade_risk(compute_ratios(df))
+            ratio_rows = len(graded)
+            del graded
+        sparsity = sparsity_report(presence, filings, load_nan_counts(NAN_COUNT_PATH)) \
+            if os.path.exists(NAN_COUNT_PATH) else {}
+    finally:
+        stages = meter.close()
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    return {
+        'scale': scale,
+        'format': output_format,
+        'companies': companies,
+        'rows': rows,
+        'pivot_shape': pivot_shape,
+        'ratio_rows': ratio_rows,
+        'sparsity': {key: sparsity[key] for key in ('fill_mean_abs_error', 'fill_max_abs_error', 'density')
+                     if key in sparsity},
+        'stages': stages,
+        # Linux에서 ru_maxrss 단위는 KB
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def _baseline_key(result: Dict[str, Any]) -> str:
+    return f"{result['scale']:g}x-{result['format']}"
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict[str, Any]:
+    if not path or not os.path.exists(path):
+        return {'environment': {}, 'runs': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results: List[Dict[str, Any]], path: str = BASELINE_PATH):
+    """
+    측정 결과를 기준으로 저장 (같은 규모/형식의 기존 기준만 교체)
+    """
+    baseline = load_baseline(path)
+    baseline['environment'] = _environment()
+    for result in results:
+        baseline['runs'][_baseline_key(result)] = result
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """
+    기준 대비 단계별 변화 (회귀 여부 포함)
+
+    Returns:
+        List[Dict[str, Any]]: 단계별 {'stage', 'metric', 'baseline', 'current', 'ratio', 'regression'}
+    """
+    reference = baseline.get('runs', {}).get(_baseline_key(result))
+    if not reference:
+        return []
+
+    changes = []
+    for stage, current in result['stages'].items():
+        previous = reference['stages'].get(stage)
+        if not previous:
+            continue
+        for metric, min_delta in (('seconds', MIN_SECONDS_DELTA), ('peak_mb', MIN_MEMORY_DELTA_MB)):
+            before, after = previous[metric], current[metric]
+            ratio = after / before if before else float('inf') if after else 1.0
+            changes.append({
+                'stage': stage,
+                'metric': metric,
+                'baseline': before,
+                'current': after,
+                'ratio': round(ratio, 2),
+                'regression': ratio > 1 + tolerance and after - before > min_delta,
+            })
+    return changes
+
+
+def main():
+    """
+    합성 데이터 규모별 오프라인 변환(수집/저장/읽기/피벗/비율) 벤치마크
+
+    python benchmark_transforms.py --scales 1,10,100
+    python benchmark_transforms.py --scales 10 --save-baseline
+    python benchmark_transforms.py --scales 10 --check   (기준 대비 회귀가 있으면 종료 코드 1)
+    """
+    parser = argparse.ArgumentParser(description='합성 데이터로 오프라인 변환 단계 시간/최대 메모리 측정')
+    parser.add_argument('--scales', default='1,10', help='원본 행 수 대비 배율 목록 (쉼표 구분, 예: 10,100,1000)')
+    parser.add_argument('--format', choices=['csv', 'parquet', 'arrow'], default='csv', help='로더 출력 형식')
+    parser.add_argument('--seed', type=int, default=0, help='합성 데이터 난수 시드')
+    parser.add_argument('--skip-notebook-pivot', action='store_true', help='노트북 pivot_table 측정 생략 (큰 규모용)')
+    parser.add_argument('--template', default=TEMPLATE_PATH, help='원본 long 데이터 CSV')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='기준 결과 JSON 경로')
+    parser.add_argument('--save-baseline', action='store_true', help='이번 결과를 기준으로 저장')
+    parser.add_argument('--check', action='store_true', help='기준 대비 회귀가 있으면 종료 코드 1')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='회귀 판정 허용 비율')
+    parser.add_argument('--output', default=None, help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.baseline)
+    results = []
+    regressions = []
+    for scale in (float(s) for s in args.scales.split(',')):
+        # 규모마다 새 프로세스에서 측정해 이전 실행의 메모리가 섞이지 않게 함
+        with multiprocessing.Pool(1) as pool:
+            result = pool.apply(run_benchmark, (scale, args.format, args.seed, not args.skip_notebook_pivot,
+                                                args.template))
+        results.append(result)
+
+        print(f"\n{scale:g}배: {result['companies']}개 기업, {result['rows']}개 행, "
+              f"피벗 {result['pivot_shape'][0]}×{result['pivot_shape'][1]}, 최대 RSS {result['peak_rss_mb']}MB")
+        changes = {(c['stage'], c['metric']): c for c in compare(result, baseline, args.tolerance)}
+        for stage in STAGES:
+            if stage not in result['stages']:
+                continue
+            measured = result['stages'][stage]
+            line = f"  {stage:<15} {measured['seconds']:>9.3f}s {measured['peak_mb']:>9.1f}MB"
+            for metric in ('seconds', 'peak_mb'):
+                change = changes.get((stage, metric))
+                if change:
+                    line += f"  {metric} x{change['ratio']}{' ⚠️ 회귀' if change['regression'] else ''}"
+                    if change['regression']:
+                        regressions.append(change)
+            print(line)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'environment': _environment(), 'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"기준 저장: {args.baseline}")
+
+    if regressions:
+        print(f"\n기준 대비 회귀 {len(regressions)}건 (허용 비율 {args.tolerance:.0%})")
+        if args.check:
+            raise SystemExit(1)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import os
+import shutil
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from financial_ingest import FinancialBatch
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # CSV 출력만 사용할 때는 필요 없음
+    pa = None
+
+# 파일 형식별 확장자
+FORMAT_EXTENSIONS = {'parquet': 'parquet', 'arrow': 'arrow'}
+
+# 디렉터리 파티션 컬럼 (hive 형식: year=2024/fs_div=CFS/)
+PARTITION_COLUMNS = ['year', 'fs_div']
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("Parquet/Arrow 출력에는 pyarrow가 필요합니다. pip install pyarrow")
+
+
+def financials_schema() -> 'pa.Schema':
+    """
+    재무 데이터 컬럼 스키마 (ticker는 선행 0 보존을 위해 문자열, 반복 문자열은 딕셔너리 인코딩)
+    """
+    _require_pyarrow()
+    return pa.schema([
+        ('ticker', pa.string()),
+        ('year', pa.int16()),
+        ('account_id', pa.dictionary(pa.int32(), pa.string())),
+        ('account_nm', pa.string()),
+        ('account_detail', pa.string()),
+        ('this_term_amount', pa.float64()),
+        ('prev_term_amount', pa.float64()),
+        ('statement_name', pa.dictionary(pa.int8(), pa.string())),
+        ('fs_div', pa.dictionary(pa.int8(), pa.string())),
+        ('reprt_code', pa.dictionary(pa.int8(), pa.string())),
+        ('raw_account_id', pa.dictionary(pa.int32(), pa.string())),
+    ])
+
+
+def partitioning() -> 'ds.Partitioning':
+    """
+    year/fs_div hive 파티션 정의
+    """
+    _require_pyarrow()
+    return ds.partitioning(pa.schema([('year', pa.int16()), ('fs_div', pa.string())]), flavor='hive')
+
+
+class ColumnarBatchWriter:
+    """
+    재무 데이터 행을 year/fs_div로 파티션된 Parquet 또는 Arrow IPC 파일로 기록하는 writer
+
+    CsvBatchWriter와 같은 인터페이스(write_batch, write_rows, close, rows_written)를 제공하며,
+    배치마다 파티션별로 파일을 하나씩 추가합니다.
+    """
+
+    def __init__(self, root: str, file_format: str = 'parquet', append: bool = False):
+        """
+        Args:
+            root (str): 데이터셋 루트 디렉터리
+            file_format (str): 'parquet' 또는 'arrow'
+            append (bool): 기존 데이터셋에 파일을 추가할지 여부 (False면 기존 디렉터리 삭제)
+        """
+        _require_pyarrow()
+        if file_format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {file_format}")
+
+        self.root = root
+        self.file_format = file_format
+        self.schema = financials_schema()
+        self.rows_written = 0
+        self._run_id = uuid.uuid4().hex[:8]
+        self._batch_seq = 0
+
+        if not append and os.path.isdir(root):
+            shutil.rmtree(root)
+        os.makedirs(root, exist_ok=True)
+
+    def _to_table(self, batch: FinancialBatch) -> 'pa.Table':
+        columns = {}
+        for field in self.schema:
+            values = batch.columns[field.name]
+            if field.name == 'year':
+                values = np.asarray(values, dtype=np.int16)
+            columns[field.name] = pa.array(values, type=field.type)
+        return pa.table(columns, schema=self.schema)
+
+    def write_batch(self, batch: FinancialBatch):
+        """
+        컬럼 배치를 파티션별 파일로 기록
+
+        Args:
+            batch (FinancialBatch): 재무 데이터 배치
+        """
+        if not len(batch):
+            return
+
+        table = self._to_table(batch)
+        years = np.asarray(batch.columns['year'])
+        fs_divs = np.asarray(batch.columns['fs_div'])
+
+        # 파티션 키별로 행을 골라 파일 하나씩 기록
+        extension = FORMAT_EXTENSIONS[self.file_format]
+        for year, fs_div in sorted(set(zip(years.tolist(), fs_divs.tolist()))):
+            mask = (years == year) & (fs_divs == fs_div)
+            part = table.filter(pa.array(mask)).drop_columns(PARTITION_COLUMNS)
+            directory = os.path.join(self.root, f"year={year}", f"fs_div={fs_div}")
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"part-{self._run_id}-{self._batch_seq:05d}.{extension}")
+
+            if self.file_format == 'parquet':
+                pq.write_table(part, path)
+            else:
+                feather.write_feather(part, path, compression='uncompressed')
+
+        self._batch_seq += 1
+        self.rows_written += len(batch)
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]):
+        """
+        행(dict) 목록을 파티션별 파일로 기록
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): 재무 데이터 행
+        """
+        self.write_batch(FinancialBatch.from_rows(rows))
+
+    def position(self) -> str:
+        """
+        지금까지 기록한 위치 (체크포인트에 함께 남기는 '실행ID:배치 수')
+        """
+        return f"{self._run_id}:{self._batch_seq}"
+
+    def discard_uncommitted(self, positions: List[str]) -> int:
+        """
+        체크포인트에 남은 실행별 마지막 배치 뒤에 기록된 파일 삭제 (기록 후 체크포인트 전에 중단된 배치)
+
+        체크포인트에 없는 실행ID의 파일(병합 결과, 이전 형식 등)은 그대로 둡니다.
+
+        Args:
+            positions (List[str]): 체크포인트에 남은 기록 위치 (기록 순서)
+
+        Returns:
+            int: 삭제한 파일 수
+        """
+        committed: Dict[str, int] = {}
+        for position in positions:
+            run_id, _, count = position.partition(':')
+            committed[run_id] = max(committed.get(run_id, 0), int(count or 0))
+
+        removed = 0
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                stem = name.rsplit('.', 1)[0]
+                parts = stem.split('-')
+                if len(parts) != 3 or parts[0] != 'part' or parts[1] not in committed:
+                    continue
+                if int(parts[2]) >= committed[parts[1]]:
+                    os.remove(os.path.join(directory, name))
+                    removed += 1
+        return removed
+
+    def close(self):
+        """
+        배치마다 파일을 닫으므로 추가 작업 없음
+        """
+
+
+def read_financials(root: str, columns: Optional[List[str]] = None, years: Optional[Iterable[int]] = None,
+                    fs_div: Optional[Iterable[str]] = None, file_format: str = 'parquet'):
+    """
+    파티션된 재무 데이터셋에서 필요한 컬럼과 파티션만 읽기
+
+    Args:
+        root (str): 데이터셋 루트 디렉터리
+        columns (Optional[List[str]]): 읽을 컬럼 (기본값: 전체)
+        years (Optional[Iterable[int]]): 읽을 연도 파티션
+        fs_div (Optional[Iterable[str]]): 읽을 재무제표 구분 파티션 (CFS/OFS)
+        file_format (str): 'parquet' 또는 'arrow'
+
+    Returns:
+        pandas.DataFrame: 조회된 데이터
+    """
+    _require_pyarrow()
+    # 파일마다 스키마를 추론하지 않고 고정 스키마로 읽어 이전 형식 파일(raw_account_id 없음)도 함께 읽음
+    schema = pa.schema(
+        [field for field in financials_schema() if field.name not in PARTITION_COLUMNS]
+        + list(partitioning().schema)
+    )
+    dataset = ds.dataset(
+        root,
+        schema=schema,
+        format='ipc' if file_format == 'arrow' else 'parquet',
+        partitioning=partitioning()
+    )
+
+    expression = None
+    if years is not None:
+        expression = ds.field('year').isin([int(year) for year in years])
+    if fs_div is not None:
+        condition = ds.field('fs_div').isin(list(fs_div))
+        expression = condition if expression is None else expression & condition
+
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    if 'raw_account_id' in df.columns and 'account_id' in df.columns:
+        # 이전 형식 파일의 행은 account_id가 곧 원본 계정 ID
+        df['raw_account_id'] = df['raw_account_id'].astype(object).fillna(df['account_id'].astype(object))
+    return df
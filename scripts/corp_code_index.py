@@ -0,0 +1,250 @@
+import csv
+import os
+import re
+import sys
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from dotenv import load_dotenv
+
+# .env 파일 로드
+load_dotenv()
+
+# 저장 파일 컬럼 순서
+INDEX_COLUMNS = ['corp_code', 'corp_name', 'stock_code', 'modify_date']
+
+# corpCode.xml(zip) 다운로드 시 한 번에 기록할 바이트 수
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# 기업명 비교 시 제거하는 법인 형태 표기
+_CORP_SUFFIXES = re.compile(r'\(주\)|㈜|주식회사|\(유\)|유한회사')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class CorpRecord(NamedTuple):
+    """
+    corpCode.xml의 기업 한 건
+    """
+    corp_code: str
+    corp_name: str
+    stock_code: str
+    modify_date: str
+
+    def to_dict(self) -> Dict[str, str]:
+        return self._asdict()
+
+
+def normalize_name(name: str) -> str:
+    """
+    기업명 검색용 정규화 (법인 형태 표기·공백 제거, 영문 대문자)
+    """
+    return _WHITESPACE.sub('', _CORP_SUFFIXES.sub('', name or '')).upper()
+
+
+def iter_corp_code_xml(source) -> Iterator[CorpRecord]:
+    """
+    corpCode.xml(또는 이를 담은 zip)을 iterparse로 한 건씩 읽기
+
+    처리한 <list> 요소는 바로 비우므로 파일 크기와 무관하게 메모리 사용량이 일정합니다.
+
+    Args:
+        source: zip/xml 파일 경로 또는 바이너리 파일 객체
+
+    Yields:
+        CorpRecord: 기업 정보
+    """
+    if isinstance(source, (str, bytes, os.PathLike)) and zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            name = next(n for n in archive.namelist() if n.lower().endswith('.xml'))
+            with archive.open(name) as stream:
+                yield from iter_corp_code_xml(stream)
+        return
+
+    root = None
+    for event, elem in ET.iterparse(source, events=('start', 'end')):
+        if root is None:
+            root = elem
+            continue
+        if event != 'end' or elem.tag != 'list':
+            continue
+
+        yield CorpRecord(
+            corp_code=(elem.findtext('corp_code') or '').strip(),
+            corp_name=(elem.findtext('corp_name') or '').strip(),
+            # 비상장 기업은 stock_code가 공백
+            stock_code=(elem.findtext('stock_code') or '').strip(),
+            modify_date=(elem.findtext('modify_date') or '').strip(),
+        )
+        root.clear()
+
+
+class CorpCodeIndex:
+    """
+    DART 고유번호(corp_code) ↔ 종목코드(stock_code) ↔ 기업명 로컬 인덱스
+
+    corpCode.xml 전체를 한 번 읽어 만들고, corp_code/stock_code/기업명 조회는
+    모두 dict 조회(O(1))로 처리해 기업별 company.json 호출과 Supabase 조회를 대신합니다.
+    """
+
+    def __init__(self, records: Optional[Iterator[CorpRecord]] = None):
+        """
+        Args:
+            records (Optional[Iterator[CorpRecord]]): 기업 정보
+        """
+        self.by_corp_code: Dict[str, CorpRecord] = {}
+        self.by_stock_code: Dict[str, CorpRecord] = {}
+        self.by_name: Dict[str, List[CorpRecord]] = {}
+
+        for record in records or ():
+            self.add(record)
+
+    def __len__(self) -> int:
+        return len(self.by_corp_code)
+
+    def __contains__(self, corp_code: str) -> bool:
+        return corp_code in self.by_corp_code
+
+    def add(self, record: CorpRecord):
+        """
+        기업 정보 추가 (같은 corp_code는 덮어씀)
+        """
+        intern = sys.intern
+        record = CorpRecord(*(intern(value) for value in record))
+
+        self.by_corp_code[record.corp_code] = record
+        if record.stock_code:
+            self.by_stock_code[record.stock_code] = record
+        self.by_name.setdefault(normalize_name(record.corp_name), []).append(record)
+
+    def get(self, corp_code: str) -> Optional[CorpRecord]:
+        """
+        corp_code로 조회
+        """
+        return self.by_corp_code.get(corp_code)
+
+    def get_by_stock_code(self, stock_code: str) -> Optional[CorpRecord]:
+        """
+        종목코드(ticker)로 조회
+        """
+        return self.by_stock_code.get(stock_code)
+
+    def find_by_name(self, name: str) -> List[CorpRecord]:
+        """
+        기업명으로 조회 (정규화한 이름이 같은 기업 전체)
+        """
+        return list(self.by_name.get(normalize_name(name), ()))
+
+    def corp_code_for(self, stock_code: str) -> Optional[str]:
+        """
+        종목코드의 corp_code (없으면 None)
+        """
+        record = self.by_stock_code.get(stock_code)
+        return record.corp_code if record else None
+
+    @classmethod
+    def from_xml(cls, source) -> 'CorpCodeIndex':
+        """
+        corpCode.xml 또는 zip 파일에서 인덱스 생성
+        """
+        return cls(iter_corp_code_xml(source))
+
+    @classmethod
+    def load(cls, path: str) -> 'CorpCodeIndex':
+        """
+        save로 저장한 인덱스 파일 읽기
+        """
+        with open(path, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f, delimiter='\t')
+            next(reader, None)
+            return cls(CorpRecord(*row) for row in reader)
+
+    def save(self, path: str):
+        """
+        인덱스를 탭 구분 파일로 저장 (임시 파일에 쓴 뒤 교체)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter='\t', lineterminator='\n')
+            writer.writerow(INDEX_COLUMNS)
+            writer.writerows(self.by_corp_code.values())
+        os.replace(tmp_path, path)
+
+
+def download_corp_code_zip(session, api_key: str, path: str,
+                           base_url: str = "https://opendart.fss.or.kr/api") -> str:
+    """
+    DART corpCode.xml(zip) 내려받기
+
+    Args:
+        session: requests 호환 세션
+        api_key (str): DART API 키
+        path (str): 저장할 zip 파일 경로
+        base_url (str): DART API 주소
+
+    Returns:
+        str: 저장한 파일 경로
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # 본문을 메모리에 모으지 않고 임시 파일로 바로 기록
+    tmp_path = f"{path}.tmp"
+    with session.get(f"{base_url}/corpCode.xml", params={'crtfc_key': api_key}, stream=True) as response:
+        response.raise_for_status()
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+
+    # 오류 시 DART는 zip 대신 status/message XML을 돌려줌 (작은 본문)
+    if not zipfile.is_zipfile(tmp_path):
+        with open(tmp_path, 'rb') as f:
+            content = f.read()
+        os.remove(tmp_path)
+        status = ET.fromstring(content)
+        raise ValueError(f"corpCode.xml 다운로드 실패: {status.findtext('message') or '알 수 없는 오류'}")
+
+    os.replace(tmp_path, path)
+    return path
+
+
+def refresh_index(source: str, index_path: str) -> CorpCodeIndex:
+    """
+    로컬 corpCode.xml/zip 파일로 인덱스를 다시 만들어 저장
+    """
+    index = CorpCodeIndex.from_xml(source)
+    index.save(index_path)
+    return index
+
+
+def main():
+    """
+    corpCode.xml로 로컬 인덱스 갱신
+
+    python corp_code_index.py [corpCode.zip 경로]  (경로가 없으면 DART에서 내려받음)
+    """
+    index_path = os.getenv('DART_CORP_INDEX_PATH', 'data/cache/corp_codes.tsv')
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+
+    if args:
+        source = args[0]
+    else:
+        from http_client import create_session
+
+        api_key = os.getenv('DART_API_KEY')
+        if not api_key:
+            raise ValueError("DART API 키가 필요합니다. .env 파일을 확인해주세요.")
+        source = download_corp_code_zip(create_session(), api_key, 'data/cache/corpCode.zip')
+        print(f"corpCode.xml 다운로드 완료: {source}")
+
+    index = refresh_index(source, index_path)
+    print(f"기업 고유번호 인덱스 저장 완료: {index_path} ({len(index)}개 기업, 상장 {len(index.by_stock_code)}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# DART 응답 상태 코드
+DART_STATUS_OK = '000'
+DART_STATUS_NO_DATA = '013'
+
+
+class DartResponseCache:
+    """
+    DART API 응답을 SQLite 파일에 저장하는 영구 캐시
+
+    정상 응답(000)과 '조회된 데이터 없음'(013) 응답만 저장합니다.
+    데이터 없음 응답은 negative_ttl 동안만 유지되는 네거티브 캐시로 취급하고,
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, path: str = "data/cache/dart_cache.sqlite3",
+                 ttl: Optional[float] = None,
+                 negative_ttl: Optional[float] = 7 * 24 * 3600,
+                 max_bytes: int = 512 * 1024 * 1024):
+        """
+        Args:
+            path (str): 캐시 파일 경로
+            ttl (Optional[float]): 정상 응답 유효 기간(초), None이면 만료 없음
+            negative_ttl (Optional[float]): 데이터 없음 응답 유효 기간(초), None이면 만료 없음
+            max_bytes (int): 캐시에 저장할 응답 본문의 최대 총 크기
+        """
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # 샤드 프로세스들이 같은 캐시 파일을 공유할 수 있도록 잠금 대기 시간을 넉넉히 둠
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                negative INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(endpoint: str, corp_code: str, bsns_year: str = '', reprt_code: str = '', fs_div: str = '') -> str:
+        """
+        캐시 키 생성: (endpoint, corp_code, bsns_year, reprt_code, fs_div)
+        """
+        return '|'.join([endpoint, corp_code or '', bsns_year or '', reprt_code or '', fs_div or ''])
+
+    @staticmethod
+    def is_cacheable(data: Dict[str, Any]) -> bool:
+        """
+        캐시에 저장할 수 있는 응답인지 확인 (정상 또는 데이터 없음)
+        """
+        return data.get('status') in (DART_STATUS_OK, DART_STATUS_NO_DATA)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 응답 조회
+
+        Args:
+            key (str): 캐시 키
+
+        Returns:
+            Optional[Dict[str, Any]]: 유효한 캐시 응답, 없거나 만료되면 None
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, negative, size, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            body, negative, size, created_at = row
+            ttl = self.negative_ttl if negative else self.ttl
+            if ttl is not None and now - created_at > ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(body)
+
+    def set(self, key: str, data: Dict[str, Any]):
+        """
+        응답 저장 (캐시 대상이 아닌 응답은 무시)
+
+        Args:
+            key (str): 캐시 키
+            data (Dict[str, Any]): DART 응답 JSON
+        """
+        if not self.is_cacheable(data):
+            return
+
+        body = json.dumps(data, ensure_ascii=False)
+        size = len(body.encode('utf-8'))
+        negative = 1 if data.get('status') == DART_STATUS_NO_DATA else 0
+        now = time.time()
+
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            if previous:
+                self._total_bytes -= previous[0]
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, body, negative, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, body, negative, size, now, now)
+            )
+            self._total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """
+        총 크기가 max_bytes 이하가 될 때까지 LRU 순서로 제거 (잠금 보유 상태에서 호출)
+        """
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                return
+
+            for key, size in rows:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
+
+    def stats(self) -> Dict[str, int]:
+        """
+        저장된 응답 수, 데이터 없음(013) 응답 수, 본문 총 크기
+        """
+        with self._lock:
+            entries, negative = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(negative), 0) FROM responses"
+            ).fetchone()
+        return {'entries': entries, 'negative': negative, 'bytes': self._total_bytes}
+
+    def close(self):
+        """
+        캐시 파일 연결 종료
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,339 @@
+import csv
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# 기본 fixture 파일
+FINANCIALS_FIXTURE = 'data/delisted_financials_all.csv'
+COMPANIES_FIXTURE = 'data/delisted_corp.csv'
+
+# 로컬 데이터에 없는 보고서 요청 시 DART와 같은 응답
+NO_DATA_RESPONSE = {'status': '013', 'message': '조회된 데이타가 없습니다.'}
+
+
+class StubConfig(NamedTuple):
+    """
+    가짜 서버 응답 지연/오류 설정
+
+    latency: 평균 응답 지연(초), jitter: 지연에 더할 무작위 범위(초),
+    error_rate: HTTP 500 응답 비율, throttle_rate: 요청 제한 응답 비율,
+    throttle_code: 요청 제한 응답 형식 ('020'이면 DART 본문 상태 코드, '429'면 HTTP 429),
+    failing: 항상 HTTP 500으로 응답할 재무제표 조회 (corp_code 또는 (corp_code, fs_div), 특정 기업 장애 재현용)
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    throttle_code: str = '020'
+    seed: Optional[int] = None
+    failing: frozenset = frozenset()
+
+
+def _format_amount(value: str) -> str:
+    """
+    CSV 금액(실수 문자열)을 DART 응답 형식(정수 문자열)으로 변환
+    """
+    if value in ('', 'nan'):
+        return ''
+    amount = float(value)
+    return str(int(amount)) if amount.is_integer() else value
+
+
+def load_fixtures(financials_path: str = FINANCIALS_FIXTURE,
+                  companies_path: str = COMPANIES_FIXTURE) -> Tuple[Dict[tuple, List[Dict[str, str]]], List[Dict[str, Any]]]:
+    """
+    CSV 스냅샷에서 DART 재무제표 응답과 기업 목록 fixture 만들기
+
+    Args:
+        financials_path (str): delisted_financials_all 형식 CSV
+        companies_path (str): delisted_corp 형식 CSV (ticker, corp_name, delisting_date, corp_code, listed_company)
+
+    Returns:
+        Tuple: ((corp_code, year, reprt_code, fs_div) → DART list 항목, 기업 목록)
+    """
+    with open(companies_path, newline='', encoding='utf-8-sig') as f:
+        companies = list(csv.DictReader(f))
+    corp_codes = {company['ticker']: company['corp_code'] for company in companies}
+
+    statements: Dict[tuple, List[Dict[str, str]]] = {}
+    with open(financials_path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            corp_code = corp_codes.get(row['ticker'])
+            if not corp_code:
+                continue
+            key = (corp_code, row['year'], row.get('reprt_code') or '11011', row['fs_div'])
+            statements.setdefault(key, []).append({
+                'sj_nm': row['statement_name'],
+                'account_id': row['account_id'],
+                'account_nm': row['account_nm'],
+                'account_detail': row['account_detail'],
+                'thstrm_amount': _format_amount(row['this_term_amount']),
+                'frmtrm_amount': _format_amount(row['prev_term_amount']),
+            })
+
+    return statements, companies
+
+
+def _match_filter(value: Any, condition: str) -> bool:
+    """
+    PostgREST 필터(eq./gt./gte./lt./lte./in./is.null, not. 부정) 하나 비교
+    """
+    if condition.startswith('not.'):
+        return not _match_filter(value, condition[len('not.'):])
+    operator, _, operand = condition.partition('.')
+    if operator == 'is' and operand == 'null':
+        return value is None
+    value = '' if value is None else str(value)
+    if operator == 'eq':
+        return value == operand
+    if operator == 'gt':
+        return value > operand
+    if operator == 'gte':
+        return value >= operand
+    if operator == 'lt':
+        return value < operand
+    if operator == 'lte':
+        return value <= operand
+    if operator == 'in':
+        return value in {item.strip('"') for item in operand.strip('()').split(',')}
+    raise ValueError(f"지원하지 않는 필터입니다: {condition}")
+
+
+class StubState:
+    """
+    가짜 서버가 공유하는 fixture와 요청 통계
+    """
+
+    def __init__(self, statements: Dict[tuple, List[Dict[str, str]]], companies: List[Dict[str, Any]],
+                 config: StubConfig = StubConfig()):
+        self.statements = statements
+        self.companies = {company['corp_code']: company for company in companies}
+        self.tables = {
+            'ticker_info': [
+                {key: company.get(key) for key in ('ticker', 'corp_name', 'corp_code', 'listed_company')}
+                for company in companies
+            ],
+            'delisted_stocks': [
+                {key: company.get(key) for key in ('ticker', 'delisting_date', 'delisting_reason')}
+                for company in companies
+            ],
+        }
+        self.config = config
+
+        self._random = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.errors = 0
+        self.throttles = 0
+
+    def record(self, endpoint: str) -> Optional[str]:
+        """
+        요청 수를 기록하고 주입할 장애 결정 ('error', 'throttle' 또는 None)
+        """
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            draw = self._random.random()
+            delay = self.config.latency + self._random.uniform(0, self.config.jitter)
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if draw < self.config.error_rate:
+            with self._lock:
+                self.errors += 1
+            return 'error'
+        if draw < self.config.error_rate + self.config.throttle_rate:
+            with self._lock:
+                self.throttles += 1
+            return 'throttle'
+        return None
+
+    def filter_rows(self, table: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        PostgREST 필터만 적용한 행
+        """
+        rows = self.tables[table]
+        for column, condition in params.items():
+            if column in ('select', 'order', 'limit', 'offset'):
+                continue
+            rows = [row for row in rows if _match_filter(row.get(column), condition)]
+        return rows
+
+    def query_table(self, table: str, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        PostgREST 조회 흉내 (필터, select, order, limit/offset, select=column,count() 집계)
+        """
+        rows = self.filter_rows(table, params)
+
+        select = params.get('select', '*')
+        if select.endswith(',count()'):
+            column = select[:-len(',count()')]
+            counts: Dict[Any, int] = {}
+            for row in rows:
+                counts[row.get(column)] = counts.get(row.get(column), 0) + 1
+            return [{column: value, 'count': count} for value, count in counts.items()]
+
+        if 'order' in params:
+            column, _, direction = params['order'].partition('.')
+            rows = sorted(rows, key=lambda row: row.get(column) or '', reverse=direction == 'desc')
+
+        offset = int(params.get('offset', 0))
+        limit = int(params['limit']) if 'limit' in params else None
+        rows = rows[offset:offset + limit if limit is not None else None]
+
+        if select != '*':
+            columns = select.split(',')
+            rows = [{column: row.get(column) for column in columns} for row in rows]
+        return rows
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    DART /api/*.json과 Supabase /rest/v1/* 요청 처리
+    """
+    protocol_version = 'HTTP/1.1'
+    state: StubState = None
+
+    def log_message(self, format, *args):
+        # 요청마다 출력하지 않음
+        pass
+
+    def _send_json(self, payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        """
+        Prefer: count=exact 행 수 조회 (본문 없이 Content-Range 헤더만 응답)
+        """
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        endpoint = url.path.rstrip('/')[len('/rest/v1/'):] if url.path.startswith('/rest/v1/') else ''
+
+        if endpoint not in self.state.tables:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        self.state.record(endpoint)
+        try:
+            total = len(self.state.filter_rows(endpoint, params))
+        except ValueError:
+            self.send_response(400)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        limit = int(params.get('limit', total))
+        shown = min(limit, total)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', '0')
+        self.send_header('Content-Range', f"0-{shown - 1}/{total}" if shown else f"*/{total}")
+        self.end_headers()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip('/')
+
+        if path.startswith('/api/'):
+            endpoint = path[len('/api/'):]
+        elif path.startswith('/rest/v1/'):
+            endpoint = path[len('/rest/v1/'):]
+        else:
+            self._send_json({'message': 'not found'}, 404)
+            return
+
+        fault = self.state.record(endpoint)
+        if fault == 'error':
+            self._send_json({'message': 'injected error'}, 500)
+            return
+        if fault == 'throttle':
+            if self.state.config.throttle_code == '429':
+                self._send_json({'message': 'too many requests'}, 429, {'Retry-After': '0'})
+            else:
+                self._send_json({'status': '020', 'message': '요청 제한을 초과하였습니다.'})
+            return
+
+        if endpoint == 'fnlttSinglAcntAll.json':
+            failing = self.state.config.failing
+            if params.get('corp_code') in failing or (params.get('corp_code'), params.get('fs_div')) in failing:
+                with self.state._lock:
+                    self.state.errors += 1
+                self._send_json({'message': 'injected error'}, 500)
+                return
+            key = (params.get('corp_code'), params.get('bsns_year'), params.get('reprt_code'), params.get('fs_div'))
+            items = self.state.statements.get(key)
+            self._send_json({'status': '000', 'message': '정상', 'list': items} if items else NO_DATA_RESPONSE)
+        elif endpoint == 'company.json':
+            company = self.state.companies.get(params.get('corp_code'))
+            if company:
+                self._send_json({
+                    'status': '000', 'message': '정상', 'corp_code': company['corp_code'],
+                    'corp_name': company['corp_name'], 'stock_code': company['ticker'],
+                    'list': [{'corp_code': company['corp_code'], 'corp_name': company['corp_name'],
+                              'stock_code': company['ticker']}]
+                })
+            else:
+                self._send_json(NO_DATA_RESPONSE)
+        elif endpoint in self.state.tables:
+            try:
+                self._send_json(self.state.query_table(endpoint, params))
+            except ValueError as e:
+                self._send_json({'message': str(e)}, 400)
+        else:
+            self._send_json({'message': 'not found'}, 404)
+
+
+def create_server(state: StubState, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """
+    가짜 DART/Supabase 서버 생성 (port=0이면 빈 포트 자동 선택)
+    """
+    handler = type('BoundStubHandler', (StubHandler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    """
+    가짜 서버 단독 실행
+
+    STUB_PORT, STUB_LATENCY, STUB_JITTER, STUB_ERROR_RATE, STUB_THROTTLE_RATE, STUB_THROTTLE_CODE 환경 변수로 설정
+    """
+    config = StubConfig(
+        latency=float(os.getenv('STUB_LATENCY', '0')),
+        jitter=float(os.getenv('STUB_JITTER', '0')),
+        error_rate=float(os.getenv('STUB_ERROR_RATE', '0')),
+        throttle_rate=float(os.getenv('STUB_THROTTLE_RATE', '0')),
+        throttle_code=os.getenv('STUB_THROTTLE_CODE', '020'),
+    )
+    statements, companies = load_fixtures()
+    server = create_server(StubState(statements, companies, config), port=int(os.getenv('STUB_PORT', '8765')))
+
+    host, port = server.server_address[:2]
+    print(f"가짜 DART/Supabase 서버 실행 중: http://{host}:{port} (재무제표 {len(statements)}건, 기업 {len(companies)}개)")
+    print(f"  DART_BASE_URL=http://{host}:{port}/api SUPABASE_URL=http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 import os
-import requests
 from dotenv import load_dotenv
 
+from http_client import create_session
+from supabase_reader import SupabaseReader
+from table_profiler import profile_table
+
 # .env 파일 로드
 load_dotenv()
 
@@ -18,6 +21,9 @@ def debug_supabase_connection():
         print("❌ 환경 변수가 설정되지 않았습니다.")
         return
     
+    # 모든 진단 요청이 공유하는 세션 (연결 재사용, 일시적 오류 재시도)
+    session = create_session()
+    
     # 1. 기본 연결 테스트
     try:
         url = f"{supabase_url}/rest/v1/"
@@ -27,7 +33,7 @@ def debug_supabase_connection():
             'Content-Type': 'application/json'
         }
         
-        response = requests.get(url, headers=headers)
+        response = session.get(url, headers=headers)
         print(f"기본 연결 테스트: {response.status_code}")
         
         if response.status_code == 200:
@@ -50,7 +56,7 @@ def debug_supabase_connection():
             'Content-Type': 'application/json'
         }
         
-        response = requests.post(url, headers=headers, json={})
+        response = session.post(url, headers=headers, json={})
         print(f"테이블 목록 조회: {response.status_code}")
         
         if response.status_code == 200:
@@ -64,30 +70,20 @@ def debug_supabase_connection():
     except Exception as e:
         print(f"테이블 목록 조회 오류: {e}")
     
-    # 3. delisted_stocks 테이블 직접 테스트
+    reader = SupabaseReader(supabase_url, supabase_key, session=session)
+    
+    # 3. delisted_stocks 테이블 직접 테스트 (행 수는 count=exact HEAD, 구조는 1건 표본으로 확인)
     try:
-        url = f"{supabase_url}/rest/v1/delisted_stocks"
-        headers = {
-            'apikey': supabase_key,
-            'Authorization': f'Bearer {supabase_key}',
-            'Content-Type': 'application/json'
-        }
+        profile = profile_table(reader, 'delisted_stocks')
         
-        # 먼저 테이블 존재 여부만 확인
-        response = requests.get(url, headers=headers)
-        print(f"delisted_stocks 테이블 테스트: {response.status_code}")
-        
-        if response.status_code == 200:
+        if profile['exists']:
             print("✅ delisted_stocks 테이블 존재")
-            data = response.json()
-            print(f"데이터 개수: {len(data)}")
-            if data:
+            print(f"데이터 개수: {profile['rows']}")
+            if profile['sample']:
                 print("첫 번째 레코드 예시:")
-                print(data[0])
-        elif response.status_code == 404:
-            print("❌ delisted_stocks 테이블이 존재하지 않습니다.")
+                print(profile['sample'])
         else:
-            print(f"❌ 테이블 접근 오류: {response.text}")
+            print("❌ delisted_stocks 테이블이 존재하지 않습니다.")
             
     except Exception as e:
         print(f"delisted_stocks 테이블 테스트 오류: {e}")
@@ -97,25 +93,14 @@ def debug_supabase_connection():
     
     for table_name in possible_tables:
         try:
-            url = f"{supabase_url}/rest/v1/{table_name}"
-            headers = {
-                'apikey': supabase_key,
-                'Authorization': f'Bearer {supabase_key}',
-                'Content-Type': 'application/json'
-            }
+            profile = profile_table(reader, table_name)
             
-            response = requests.get(url, headers=headers)
-            print(f"{table_name} 테이블 테스트: {response.status_code}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"  ✅ {table_name} 테이블 존재 (데이터 {len(data)}개)")
-                if data:
-                    print(f"  컬럼: {list(data[0].keys())}")
-            elif response.status_code == 404:
-                print(f"  ❌ {table_name} 테이블 없음")
+            if profile['exists']:
+                print(f"  ✅ {table_name} 테이블 존재 (데이터 {profile['rows']}개)")
+                if profile['columns']:
+                    print(f"  컬럼: {profile['columns']}")
             else:
-                print(f"  ❌ {table_name} 접근 오류: {response.text}")
+                print(f"  ❌ {table_name} 테이블 없음")
                 
         except Exception as e:
             print(f"  ❌ {table_name} 테스트 오류: {e}")
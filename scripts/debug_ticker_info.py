@@ -1,7 +1,10 @@
 import os
-import requests
 from dotenv import load_dotenv
 
+from http_client import create_session
+from supabase_reader import SupabaseReader
+from table_profiler import profile_table
+
 # .env 파일 로드
 load_dotenv()
 
@@ -16,66 +19,64 @@ def debug_ticker_info():
         return
     
     try:
-        # ticker_info 테이블 조회 (필터링 없이)
-        url = f"{supabase_url}/rest/v1/ticker_info"
-        headers = {
-            'apikey': supabase_key,
-            'Authorization': f'Bearer {supabase_key}',
-            'Content-Type': 'application/json'
-        }
+        session = create_session()
+        # 표본 조회(GET)와 행 수 조회(HEAD)의 실제 응답 상태 기록 (메서드별 첫 응답)
+        statuses = {}
+        
+        def record_status(response, *args, **kwargs):
+            statuses.setdefault(response.request.method, response.status_code)
+        
+        session.hooks['response'].append(record_status)
+        reader = SupabaseReader(supabase_url, supabase_key, session=session)
         
-        # 먼저 전체 데이터 구조 확인
-        response = requests.get(url, headers=headers)
-        print(f"ticker_info 테이블 조회: {response.status_code}")
+        # 레코드 구조(1건 표본), 전체 행 수(count=exact HEAD), listed_company 분포(서버 집계) 확인
+        profile = profile_table(reader, 'ticker_info', distribution_columns=['listed_company'])
+        print(f"ticker_info 테이블 조회: GET {statuses.get('GET', '-')}, HEAD {statuses.get('HEAD', '-')}")
         
-        if response.status_code == 200:
-            data = response.json()
-            print(f"전체 데이터 개수: {len(data)}")
+        if not profile['exists']:
+            print("❌ ticker_info 테이블이 존재하지 않습니다.")
+        elif profile['sample']:
+            print("첫 번째 레코드 구조:")
+            first_record = profile['sample']
+            for key, value in first_record.items():
+                print(f"  {key}: {value}")
             
-            if data:
-                print("첫 번째 레코드 구조:")
-                first_record = data[0]
-                for key, value in first_record.items():
-                    print(f"  {key}: {value}")
-                
-                # listed_company 값들의 분포 확인
-                listed_values = {}
-                for item in data:
-                    listed_val = item.get('listed_company')
-                    if listed_val not in listed_values:
-                        listed_values[listed_val] = 0
-                    listed_values[listed_val] += 1
-                
-                print(f"\nlisted_company 값 분포:")
-                for value, count in listed_values.items():
-                    print(f"  {value}: {count}개")
-                
-                # listed_company = 0인 기업들 확인
-                delisted_companies = [item for item in data if item.get('listed_company') == 0]
-                print(f"\n상장 폐지 기업 수: {len(delisted_companies)}")
-                
-                if delisted_companies:
-                    print("상장 폐지 기업 예시:")
-                    for i, company in enumerate(delisted_companies[:3]):
-                        print(f"  {i+1}. {company.get('company_name')} ({company.get('ticker')}) - listed_company: {company.get('listed_company')}")
-                
-                # delisting_date 컬럼이 있는지 확인
-                has_delisting_date = any('delisting_date' in item.keys() for item in data)
-                print(f"\ndelisting_date 컬럼 존재: {has_delisting_date}")
+            listed_values = profile['distributions']['listed_company']['counts']
+            print(f"전체 데이터 개수: {profile['rows']}")
+            print(f"\nlisted_company 값 분포:")
+            for value, count in listed_values.items():
+                print(f"  {value}: {count}개")
+            
+            # listed_company = 0인 기업들 확인
+            # 컬럼 타입에 따라 집계 키가 숫자 또는 문자열
+            print(f"\n상장 폐지 기업 수: {listed_values.get(0, listed_values.get('0', 0))}")
+            
+            delisted_examples = reader.fetch_page(
+                'ticker_info', {'select': 'ticker,corp_name,listed_company', 'listed_company': 'eq.0', 'limit': 3}
+            )
+            if delisted_examples:
+                print("상장 폐지 기업 예시:")
+                for i, company in enumerate(delisted_examples):
+                    print(f"  {i+1}. {company.get('corp_name')} ({company.get('ticker')}) - listed_company: {company.get('listed_company')}")
+            
+            # delisting_date 컬럼이 있는지 확인
+            has_delisting_date = 'delisting_date' in first_record
+            print(f"\ndelisting_date 컬럼 존재: {has_delisting_date}")
+            
+            if has_delisting_date:
+                # delisting_date가 있는 기업 수와 예시 3건만 서버에서 조회
+                with_delisting_filter = {'delisting_date': 'not.is.null'}
+                print(f"delisting_date가 있는 기업 수: {reader.count('ticker_info', with_delisting_filter)}")
                 
-                if has_delisting_date:
-                    # delisting_date가 있는 기업들 확인
-                    with_delisting_date = [item for item in data if item.get('delisting_date')]
-                    print(f"delisting_date가 있는 기업 수: {len(with_delisting_date)}")
-                    
-                    if with_delisting_date:
-                        print("delisting_date 예시:")
-                        for i, company in enumerate(with_delisting_date[:3]):
-                            print(f"  {i+1}. {company.get('company_name')} - {company.get('delisting_date')}")
-            else:
-                print("❌ ticker_info 테이블에 데이터가 없습니다.")
+                with_delisting_date = reader.fetch_page(
+                    'ticker_info', {**with_delisting_filter, 'select': 'ticker,corp_name,delisting_date', 'limit': 3}
+                )
+                if with_delisting_date:
+                    print("delisting_date 예시:")
+                    for i, company in enumerate(with_delisting_date):
+                        print(f"  {i+1}. {company.get('corp_name')} - {company.get('delisting_date')}")
         else:
-            print(f"❌ ticker_info 테이블 조회 실패: {response.text}")
+            print("❌ ticker_info 테이블에 데이터가 없습니다.")
             
     except Exception as e:
         print(f"ticker_info 테이블 조회 오류: {e}")
@@ -0,0 +1,409 @@
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+# 무거운 의존성(pandas, pyarrow, requests)은 각 서브커맨드 안에서 불러옴
+# → diagnose 같은 가벼운 명령은 표준 라이브러리만으로 바로 시작
+
+INPUT_FORMATS = ('csv', 'parquet', 'arrow', 'sqlite', 'duckdb')
+
+
+def _mask(value: Optional[str], visible: int = 6) -> str:
+    """
+    API 키 등 민감한 값은 앞부분만 표시
+    """
+    if not value:
+        return '(없음)'
+    return f"{value[:visible]}...({len(value)}자)"
+
+
+def _default_input_path(input_format: str) -> str:
+    if input_format in ('sqlite', 'duckdb'):
+        from_env = os.getenv('DELIST_STORE_PATH')
+        return from_env or f"data/delisted_financials.{'sqlite3' if input_format == 'sqlite' else 'duckdb'}"
+    return os.getenv('DELIST_OUTPUT_PATH', f"data/delisted_financials_all.{input_format}")
+
+
+def _load_financials(path: Optional[str], input_format: str, years: Optional[List[int]] = None):
+    """
+    로더 출력(CSV, Parquet/Arrow 데이터셋, 분석 저장소)을 long 형식 DataFrame으로 읽기
+    """
+    path = path or _default_input_path(input_format)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"입력 데이터가 없습니다: {path}")
+
+    if input_format in ('sqlite', 'duckdb'):
+        from financial_store import FinancialStore
+
+        store = FinancialStore(path, input_format)
+        try:
+            df = store.query(years=years)
+        finally:
+            store.close()
+    elif input_format in ('parquet', 'arrow'):
+        from columnar_output import read_financials
+
+        df = read_financials(path, years=years, file_format=input_format)
+    else:
+        import pandas as pd
+
+        df = pd.read_csv(path, dtype={'ticker': str, 'reprt_code': str})
+        if years:
+            df = df[df['year'].isin(years)]
+
+    if df.empty:
+        raise ValueError(f"입력 데이터에 행이 없습니다: {path}")
+    return df
+
+
+def cmd_fetch(args) -> int:
+    """
+    상장 폐지 기업 재무 데이터 수집
+    """
+    if args.output:
+        os.environ['DELIST_OUTPUT_PATH'] = args.output
+
+    from backfill_planner import BackfillPlanner
+    from delist_data_loader import DelistDataLoader
+    from sharding import parse_shard
+
+    planner = BackfillPlanner(years_back=args.years, reprt_codes=args.report_codes.split(','),
+                              skip_covered_years=args.skip_covered_years)
+    loader = DelistDataLoader(
+        max_workers=args.workers,
+        requests_per_second=args.rps,
+        output_format=args.format,
+        planner=planner,
+        shard=parse_shard(args.shard) if args.shard else None,
+    )
+    summary = loader.process_all_delisted_companies(args.limit, resume=args.resume, incremental=args.incremental)
+
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False))
+    return 0
+
+
+def cmd_pivot(args) -> int:
+    """
+    long 형식 재무 데이터를 (기업 × 계정) 피처 행렬로 변환해 CSV로 저장
+    """
+    from feature_matrix import build_feature_matrix
+
+    df = _load_financials(args.input, args.input_format, args.year)
+    if args.canonicalize:
+        # 정규화 이전에 저장된 데이터의 계정 ID 통일
+        from account_taxonomy import load_taxonomy
+
+        df = load_taxonomy(os.getenv('DELIST_ACCOUNT_TAXONOMY', 'data/account_taxonomy.tsv')).canonicalize_frame(df)
+    matrix = build_feature_matrix(df, value=args.value, backend=args.backend, min_density=args.min_density)
+
+    output = args.output or 'data/pivot_financials.csv'
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    matrix.to_csv(output, encoding='utf-8-sig')
+    print(f"피처 행렬 저장 완료: {output} ({matrix.shape[0]}개 기업 × {matrix.shape[1]}개 계정)")
+    return 0
+
+
+def cmd_panel(args) -> int:
+    """
+    계정별 전년 대비/다년 추세 패널 피처 생성 (바뀐 공시만 다시 계산)
+    """
+    from account_taxonomy import load_taxonomy
+    from panel_features import DEFAULT_CACHE_PATH, PanelFeatureCache, build_panel_features
+
+    df = _load_financials(args.input, args.input_format)
+    taxonomy = load_taxonomy(os.getenv('DELIST_ACCOUNT_TAXONOMY', 'data/account_taxonomy.tsv'))
+    cache_path = os.getenv('DELIST_PANEL_CACHE', DEFAULT_CACHE_PATH)
+    cache = None if args.no_cache or not cache_path else PanelFeatureCache(cache_path, args.window)
+
+    features = build_panel_features(df, cache, taxonomy, args.window)
+    if args.year:
+        features = features[features['year'].isin(args.year)]
+
+    output = args.output or 'data/panel_features.csv'
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    features.to_csv(output, index=False, encoding='utf-8-sig')
+    print(f"패널 피처 저장 완료: {output} ({len(features)}개 행)")
+    if cache is not None:
+        stats = cache.last_stats
+        print(f"공시 {stats['filings']}건 중 {stats['recomputed_filings']}건 다시 계산, "
+              f"{stats['reused_filings']}건 캐시 사용")
+    return 0
+
+
+def _graded_ratios(args):
+    from ratio_engine import compute_ratios, grade_risk
+
+    df = _load_financials(args.input, args.input_format)
+    return grade_risk(compute_ratios(df))
+
+
+def cmd_ratios(args) -> int:
+    """
+    재무비율과 위험도 계산
+    """
+    graded = _graded_ratios(args)
+    if args.year:
+        graded = graded[graded['year'].isin(args.year)]
+
+    print(f"재무비율 계산 완료: {len(graded)}개 (ticker, year)")
+    if len(graded):
+        print(graded['risk_level'].value_counts().to_string())
+
+    if args.output:
+        graded.to_csv(args.output, index=False, encoding='utf-8-sig')
+        print(f"파일 위치: {args.output}")
+    return 0
+
+
+def cmd_upload(args) -> int:
+    """
+    재무비율과 위험도를 계산해 Supabase에 일괄 저장
+    """
+    from ratio_engine import upload_ratios
+
+    graded = _graded_ratios(args)
+    for table, saved in upload_ratios(graded, args.ratio_year).items():
+        print(f"{table} 저장 완료 ({saved}개)")
+    return 0
+
+
+def cmd_diagnose(args) -> int:
+    """
+    설정, 캐시, 상태 저장소, 출력 파일 상태 점검 (--remote: Supabase/DART 연결 확인)
+    """
+    from dart_cache import DartResponseCache
+    from fs_router import ROUTING_CALL_COST
+    from output_writer import CheckpointManifest
+    from state_store import LoaderStateStore
+
+    output_format = os.getenv('DELIST_OUTPUT_FORMAT', 'csv').lower()
+    output_path = os.getenv('DELIST_OUTPUT_PATH', f"data/delisted_financials_all.{output_format}")
+    cache_path = os.getenv('DART_CACHE_PATH', 'data/cache/dart_cache.sqlite3')
+    state_path = os.getenv('DELIST_STATE_PATH', 'data/cache/loader_state.sqlite3')
+    index_path = os.getenv('DART_CORP_INDEX_PATH', 'data/cache/corp_codes.tsv')
+    store_engine = os.getenv('DELIST_STORE', '').lower()
+    routing = os.getenv('DART_FS_ROUTING', 'off').lower()
+
+    report = {
+        'config': {
+            'SUPABASE_URL': os.getenv('SUPABASE_URL') or '(없음)',
+            'SUPABASE_ANON_KEY': _mask(os.getenv('SUPABASE_ANON_KEY')),
+            'DART_API_KEY': _mask(os.getenv('DART_API_KEY')),
+            'DART_BASE_URL': os.getenv('DART_BASE_URL', 'https://opendart.fss.or.kr/api'),
+            'DART_MAX_WORKERS': os.getenv('DART_MAX_WORKERS', '1'),
+            'DELIST_PARSE_WORKERS': os.getenv('DELIST_PARSE_WORKERS', '1'),
+            'DELIST_MAX_IN_FLIGHT': os.getenv('DELIST_MAX_IN_FLIGHT') or '(자동)',
+            'DART_REQUESTS_PER_SECOND': os.getenv('DART_REQUESTS_PER_SECOND', '0'),
+            'DART_FS_ROUTING': f"{routing} ({ROUTING_CALL_COST.get(routing, '알 수 없는 방식')})",
+            'DELIST_OUTPUT_FORMAT': output_format,
+            'DELIST_YEARS_BACK': os.getenv('DELIST_YEARS_BACK', '1'),
+            'DELIST_REPORT_CODES': os.getenv('DELIST_REPORT_CODES', '11011'),
+            'DELIST_SKIP_COVERED_YEARS': os.getenv('DELIST_SKIP_COVERED_YEARS', '0'),
+            'DELIST_SHARD': os.getenv('DELIST_SHARD') or '(전체)',
+            'DELIST_DB_SINK': os.getenv('DELIST_DB_SINK') or '(없음)',
+            'DELIST_STORE': store_engine or '(없음)',
+        },
+        'output': {
+            'path': output_path,
+            'exists': os.path.exists(output_path),
+            'checkpoint_done': 0,
+        },
+    }
+
+    checkpoint_path = f"{output_path}.done"
+    if os.path.exists(checkpoint_path):
+        report['output']['checkpoint_done'] = len(CheckpointManifest(checkpoint_path).load())
+
+    # 파일이 없으면 새로 만들지 않도록 존재할 때만 연다
+    if cache_path and os.path.exists(cache_path):
+        cache = DartResponseCache(cache_path)
+        report['cache'] = {'path': cache_path, **cache.stats()}
+        cache.close()
+    else:
+        report['cache'] = {'path': cache_path or '(사용 안 함)', 'entries': 0}
+
+    if state_path and os.path.exists(state_path):
+        state = LoaderStateStore(state_path)
+        report['state'] = {'path': state_path, **state.stats()}
+        state.close()
+    else:
+        report['state'] = {'path': state_path or '(사용 안 함)', 'fetched': 0}
+
+    if index_path and os.path.exists(index_path):
+        with open(index_path, encoding='utf-8') as f:
+            report['corp_index'] = {'path': index_path, 'companies': max(sum(1 for _ in f) - 1, 0)}
+    else:
+        report['corp_index'] = {'path': index_path or '(사용 안 함)', 'companies': 0}
+
+    store_path = _default_input_path(store_engine) if store_engine in ('sqlite', 'duckdb') else ''
+    report['store'] = {
+        'path': store_path or '(사용 안 함)',
+        'bytes': os.path.getsize(store_path) if store_path and os.path.exists(store_path) else 0,
+    }
+
+    status = 0
+    if args.remote:
+        report['remote'] = _check_remote()
+        status = 0 if all(check['ok'] for check in report['remote'].values()) else 1
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return status
+
+    for section, values in report.items():
+        print(f"[{section}]")
+        for key, value in values.items():
+            print(f"  {key}: {value}")
+    return status
+
+
+def _check_remote() -> dict:
+    """
+    Supabase REST 엔드포인트와 DART API 연결 확인
+    """
+    from http_client import create_session
+
+    session = create_session(max_retries=1)
+    checks = {}
+
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_ANON_KEY')
+    if supabase_url and supabase_key:
+        try:
+            response = session.get(
+                f"{supabase_url}/rest/v1/ticker_info",
+                headers={'apikey': supabase_key, 'Authorization': f'Bearer {supabase_key}'},
+                params={'select': 'ticker', 'limit': '1'},
+                timeout=10
+            )
+            checks['supabase'] = {'ok': response.ok, 'status_code': response.status_code}
+        except Exception as e:
+            checks['supabase'] = {'ok': False, 'error': str(e)}
+    else:
+        checks['supabase'] = {'ok': False, 'error': 'SUPABASE_URL/SUPABASE_ANON_KEY 없음'}
+
+    dart_api_key = os.getenv('DART_API_KEY')
+    dart_base_url = os.getenv('DART_BASE_URL', 'https://opendart.fss.or.kr/api').rstrip('/')
+    if dart_api_key:
+        try:
+            response = session.get(
+                f"{dart_base_url}/company.json",
+                params={'crtfc_key': dart_api_key, 'corp_code': '00126380'},
+                timeout=10
+            )
+            status = response.json().get('status') if response.ok else None
+            checks['dart'] = {'ok': status == '000', 'status_code': response.status_code, 'dart_status': status}
+        except Exception as e:
+            checks['dart'] = {'ok': False, 'error': str(e)}
+    else:
+        checks['dart'] = {'ok': False, 'error': 'DART_API_KEY 없음'}
+
+    return checks
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='delist_cli.py',
+        description='상장 폐지 기업 재무 데이터 수집/변환/업로드 (비대화형)'
+    )
+    # 모든 서브커맨드 공통 옵션 (서브커맨드 뒤에 지정)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help='출력 수준 (기본값: DELIST_LOG_LEVEL 또는 INFO)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fetch = subparsers.add_parser('fetch', parents=[common], help='DART에서 재무 데이터 수집')
+    fetch.add_argument('--limit', type=int, default=None, help='처리할 기업 수 제한')
+    fetch.add_argument('--years', type=int, default=int(os.getenv('DELIST_YEARS_BACK', '1')),
+                       help='폐지 직전년도를 포함해 조회할 연도 수')
+    fetch.add_argument('--skip-covered-years', action='store_true',
+                       default=os.getenv('DELIST_SKIP_COVERED_YEARS', '0') == '1',
+                       help='사업보고서를 두 해에 한 번만 조회 (호출 수 절반, 건너뛴 연도는 출력에 행이 없음)')
+    fetch.add_argument('--report-codes', default=os.getenv('DELIST_REPORT_CODES', '11011'),
+                       help='조회할 보고서 코드 (쉼표 구분, 예: 11011,11012)')
+    fetch.add_argument('--workers', type=int, default=None, help='동시 조회 워커 수 (기본값: DART_MAX_WORKERS)')
+    fetch.add_argument('--rps', type=float, default=None, help='DART 초당 호출 제한 (기본값: DART_REQUESTS_PER_SECOND)')
+    fetch.add_argument('--format', choices=['csv', 'parquet', 'arrow'], default=None,
+                       help='출력 형식 (기본값: DELIST_OUTPUT_FORMAT 또는 csv)')
+    fetch.add_argument('--output', default=None, help='출력 경로 (기본값: DELIST_OUTPUT_PATH)')
+    fetch.add_argument('--resume', action='store_true', help='체크포인트 이후부터 이어서 처리')
+    fetch.add_argument('--incremental', action='store_true', help='새로 폐지됐거나 바뀐 기업만 처리')
+    fetch.add_argument('--shard', default=None, help="처리할 샤드 'i/N'")
+    fetch.add_argument('--json', action='store_true', help='실행 요약을 JSON으로 출력')
+    fetch.set_defaults(func=cmd_fetch)
+
+    for name, func, help_text in (('pivot', cmd_pivot, '(기업 × 계정) 피처 행렬 생성'),
+                                  ('panel', cmd_panel, '계정별 전년 대비/추세 패널 피처 생성'),
+                                  ('ratios', cmd_ratios, '재무비율/위험도 계산'),
+                                  ('upload', cmd_upload, '재무비율/위험도를 Supabase에 저장')):
+        sub = subparsers.add_parser(name, parents=[common], help=help_text)
+        sub.add_argument('--input', default=None, help='입력 경로 (기본값: 형식별 로더 출력 경로)')
+        sub.add_argument('--input-format', choices=INPUT_FORMATS,
+                         default=os.getenv('DELIST_OUTPUT_FORMAT', 'csv').lower(), help='입력 형식')
+        sub.set_defaults(func=func)
+
+        if name == 'upload':
+            sub.add_argument('--ratio-year', type=int, default=int(os.getenv('RATIO_YEAR', '2024')),
+                             help='저장할 기준 연도')
+            continue
+
+        sub.add_argument('--year', type=int, action='append', default=None, help='사용할 연도 (여러 번 지정 가능)')
+        sub.add_argument('--output', default=None, help='결과 CSV 경로')
+        if name == 'pivot':
+            sub.add_argument('--value', choices=['this_term_amount', 'prev_term_amount'], default='this_term_amount')
+            sub.add_argument('--backend', choices=['dense', 'sparse'], default='sparse')
+            sub.add_argument('--min-density', type=float, default=0.0, help='유지할 계정의 최소 채움 비율 (0~1)')
+            sub.add_argument('--canonicalize', action='store_true', help='계정 ID를 표준 계정 ID로 통일한 뒤 변환')
+        if name == 'panel':
+            sub.add_argument('--window', type=int, default=3, help='추세 계산 연도 수')
+            sub.add_argument('--no-cache', action='store_true', help='캐시 없이 전체 다시 계산')
+
+    diagnose = subparsers.add_parser('diagnose', parents=[common], help='설정과 로컬 상태 점검')
+    diagnose.add_argument('--remote', action='store_true', help='Supabase/DART 연결도 확인')
+    diagnose.add_argument('--json', action='store_true', help='JSON으로 출력')
+    diagnose.set_defaults(func=cmd_diagnose)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    python delist_cli.py fetch --limit 100 --years 3 --workers 4 --format parquet --resume --log-level WARNING
+    python delist_cli.py pivot --input-format parquet --min-density 0.1
+    python delist_cli.py panel --window 3 --output data/panel_features.csv
+    python delist_cli.py ratios --year 2023 --output data/ratios.csv
+    python delist_cli.py upload --ratio-year 2024
+    python delist_cli.py diagnose --remote
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.log_level:
+        from run_metrics import set_log_level
+
+        set_log_level(args.log_level)
+
+    try:
+        return args.func(args)
+    except (ValueError, FileNotFoundError) as e:
+        # 잘못된 인자/입력
+        print(f"오류: {e}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        print(f"실행 중 오류 발생: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
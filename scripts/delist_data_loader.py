@@ -1,98 +1,213 @@
 import os
-import requests
-import pandas as pd
+import sys
+import csv
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, NamedTuple, Optional, Sequence, Tuple
 from dotenv import load_dotenv
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from account_taxonomy import AccountTaxonomy, load_taxonomy
+from backfill_planner import ANNUAL_REPORT, BackfillPlanner, FetchTask
+from corp_code_index import CorpCodeIndex
+from dart_cache import DART_STATUS_NO_DATA, DART_STATUS_OK, DartResponseCache
+from db_writer import PostgresCopyWriter, PostgrestUpsertWriter
+from financial_ingest import FinancialBatch, ingest_statement_list
+from fs_router import CFS, OFS, FsDivRouter
+from http_client import create_session
+from output_writer import CheckpointManifest, CsvBatchWriter
+from pipeline import BatchSink, PipelineStage, StagePipeline
+from rate_limiter import TokenBucket
+from run_metrics import RunMetrics, get_logger
+from sharding import parse_shard, select_shard, shard_output_path
+from state_store import LoaderStateStore
+from supabase_reader import SupabaseReader
 
 # .env 파일 로드
 load_dotenv()
 
+# DELIST_LOG_LEVEL로 출력 수준 조절 (DEBUG: 기업/작업별 상세, INFO: 실행 요약)
+logger = get_logger('delist_data_loader')
+
+# 출력 형식별 기본 파일 확장자
+OUTPUT_EXTENSIONS = {'csv': 'csv', 'parquet': 'parquet', 'arrow': 'arrow'}
+
+# 요청 자체가 실패한 조회의 상태 (네트워크 오류, 재시도 소진 등 DART status가 없는 경우)
+FETCH_ERROR = 'error'
+
+
+class FinancialFetch(NamedTuple):
+    """
+    조회 작업 하나의 재무제표 조회 결과
+    """
+    data: List[Dict[str, Any]]
+    fs_div: str
+    definitive: bool  # False면 일시적 오류로 결과를 확정하지 못함 (처리 완료로 기록하지 않고 다음 실행에서 다시 조회)
+
+
 class DelistDataLoader:
-    def __init__(self):
+    def iter_delisted_companies(self) -> Iterator[Dict[str, Any]]:
         """
-        상장 폐지 기업 재무 데이터 로더 초기화
+        ticker_info의 상장 폐지 기업을 페이지 단위로 읽고, 각 페이지의 폐지일을
+        delisted_stocks에서 ticker=in.(...) 필터로 조회해 붙여서 스트리밍
+        
+        Yields:
+            Dict[str, Any]: 폐지일(delisting_date)이 추가된 상장 폐지 기업 정보
         """
-        self.supabase_url = os.getenv('SUPABASE_URL')
-        self.supabase_key = os.getenv('SUPABASE_ANON_KEY')
-        self.dart_api_key = os.getenv('DART_API_KEY')
+        page_size = self.supabase_reader.page_size
+        page = []
         
-        if not self.supabase_url or not self.supabase_key:
-            raise ValueError("Supabase URL과 API 키가 필요합니다. .env 파일을 확인해주세요.")
+        # listed_company = 0인 기업들만 조회 (상장 폐지된 기업), ticker 기준 keyset 페이지네이션
+        rows = self.supabase_reader.iter_rows(
+            'ticker_info',
+            select='ticker,corp_name,corp_code,listed_company',
+            filters={'listed_company': 'eq.0'},
+            key='ticker'
+        )
         
-        if not self.dart_api_key:
-            raise ValueError("DART API 키가 필요합니다. .env 파일을 확인해주세요.")
+        for company in rows:
+            page.append(company)
+            if len(page) >= page_size:
+                yield from self._attach_delisting_dates(page)
+                page = []
         
-        self.dart_base_url = "https://opendart.fss.or.kr/api"
+        if page:
+            yield from self._attach_delisting_dates(page)
+    
+    def iter_delisted_companies_since(self, since: str) -> Iterator[Dict[str, Any]]:
+        """
+        폐지일이 since 이후(포함)인 기업만 delisted_stocks에서 먼저 찾고,
+        해당 ticker의 ticker_info만 조회해서 스트리밍 (증분 실행용)
         
-    def get_delisted_companies(self) -> List[Dict[str, Any]]:
+        Args:
+            since (str): 폐지일 워터마크
+            
+        Yields:
+            Dict[str, Any]: 폐지일(delisting_date)이 추가된 상장 폐지 기업 정보
+        """
+        delisting_dates = {}
+        rows = self.supabase_reader.iter_rows(
+            'delisted_stocks',
+            select='ticker,delisting_date',
+            filters={'delisting_date': f'gte.{since}'},
+            key='ticker'
+        )
+        for item in rows:
+            if item.get('ticker') and item.get('delisting_date'):
+                delisting_dates[item['ticker']] = item['delisting_date']
+        
+        if not delisting_dates:
+            return
+        
+        rows = self.supabase_reader.iter_rows_in(
+            'ticker_info', 'ticker', list(delisting_dates), select='ticker,corp_name,corp_code,listed_company'
+        )
+        for company in rows:
+            if str(company.get('listed_company')) != '0':
+                continue
+            company['delisting_date'] = delisting_dates[company['ticker']]
+            if not company.get('corp_code') and self.corp_index:
+                company['corp_code'] = self.corp_index.corp_code_for(company['ticker'])
+            yield company
+    
+    def _attach_delisting_dates(self, companies: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        기업 목록에 delisted_stocks의 폐지일 정보 추가
+        
+        Args:
+            companies (List[Dict[str, Any]]): 기업 목록
+            
+        Returns:
+            List[Dict[str, Any]]: 폐지일 정보가 추가된 기업 목록
+        """
+        delisting_dates = {}
+        try:
+            rows = self.supabase_reader.iter_rows_in(
+                'delisted_stocks', 'ticker', [c.get('ticker') for c in companies],
+                select='ticker,delisting_date'
+            )
+            for item in rows:
+                if item.get('ticker') and item.get('delisting_date'):
+                    delisting_dates[item['ticker']] = item['delisting_date']
+        except Exception as e:
+            logger.warning(f"⚠️ delisted_stocks 테이블 조회 실패: {e}")
+        
+        for company in companies:
+            ticker = company.get('ticker')
+            company['delisting_date'] = delisting_dates.get(ticker)
+            if not company.get('corp_code') and self.corp_index:
+                company['corp_code'] = self.corp_index.corp_code_for(ticker)
+            if ticker not in delisting_dates:
+                logger.warning(f"⚠️ {ticker}의 폐지일 정보를 찾을 수 없습니다.")
+        
+        return companies
+    
+    def get_delisted_companies(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Supabase의 ticker_info와 delisted_stocks 테이블에서 상장 폐지된 기업 목록 가져오기
         
+        Args:
+            since (Optional[str]): 폐지일 워터마크 (지정하면 폐지일이 이 값 이후인 기업만)
+            
         Returns:
             List[Dict[str, Any]]: 상장 폐지 기업 목록
         """
+        if self.companies_path:
+            companies = self.load_delisted_companies(self.companies_path)
+            if since:
+                companies = [c for c in companies if c.get('delisting_date') and c['delisting_date'] >= since]
+            return companies
+        
         try:
-            # 1. ticker_info에서 상장 폐지 기업 목록 가져오기
-            url = f"{self.supabase_url}/rest/v1/ticker_info"
-            headers = {
-                'apikey': self.supabase_key,
-                'Authorization': f'Bearer {self.supabase_key}',
-                'Content-Type': 'application/json'
-            }
-            
-            # listed_company = 0인 기업들만 조회 (상장 폐지된 기업)
-            params = {
-                'select': 'ticker,corp_name,corp_code,listed_company',
-                'listed_company': 'eq.0'
-            }
-            
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            companies = response.json()
-            print(f"ticker_info에서 상장 폐지 기업 {len(companies)}개 발견")
+            with self.metrics.stage('supabase_read'):
+                if since:
+                    companies = list(self.iter_delisted_companies_since(since))
+                else:
+                    companies = list(self.iter_delisted_companies())
+            logger.info(f"ticker_info에서 상장 폐지 기업 {len(companies)}개 발견")
             
             if not companies:
-                print("⚠️ ticker_info 테이블에서 상장 폐지 기업을 찾을 수 없습니다.")
-                return []
-            
-            # 2. delisted_stocks에서 폐지일 정보 가져오기
-            delisted_stocks_url = f"{self.supabase_url}/rest/v1/delisted_stocks"
-            delisted_response = requests.get(delisted_stocks_url, headers=headers)
-            
-            if delisted_response.status_code == 200:
-                delisted_data = delisted_response.json()
-                print(f"delisted_stocks에서 {len(delisted_data)}개 레코드 발견")
-                
-                # ticker를 키로 하는 딕셔너리 생성
-                delisting_dates = {}
-                for item in delisted_data:
-                    ticker = item.get('ticker')
-                    delisting_date = item.get('delisting_date')
-                    if ticker and delisting_date:
-                        delisting_dates[ticker] = delisting_date
-                
-                # 각 기업에 폐지일 정보 추가
-                for company in companies:
-                    ticker = company.get('ticker')
-                    if ticker in delisting_dates:
-                        company['delisting_date'] = delisting_dates[ticker]
-                    else:
-                        print(f"⚠️ {ticker}의 폐지일 정보를 찾을 수 없습니다.")
-                        company['delisting_date'] = None
-            else:
-                print(f"⚠️ delisted_stocks 테이블 조회 실패: {delisted_response.status_code}")
-                
+                logger.warning("⚠️ ticker_info 테이블에서 상장 폐지 기업을 찾을 수 없습니다.")
             
             return companies
             
         except Exception as e:
-            print(f"상장 폐지 기업 목록 조회 중 오류 발생: {e}")
+            logger.error(f"상장 폐지 기업 목록 조회 중 오류 발생: {e}")
             return []
     
+    def load_delisted_companies(self, path: str) -> List[Dict[str, Any]]:
+        """
+        로컬 CSV(data/delisted_corp.csv 형식)에서 상장 폐지 기업 목록 읽기
+        
+        corp_code가 비어 있으면 로컬 기업 고유번호 인덱스에서 종목코드로 채웁니다.
+        
+        Args:
+            path (str): ticker, corp_name, corp_code, delisting_date 컬럼을 가진 CSV 경로
+            
+        Returns:
+            List[Dict[str, Any]]: 상장 폐지 기업 목록
+        """
+        companies = []
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                if row.get('listed_company', '0') != '0':
+                    continue
+                company = {
+                    'ticker': row.get('ticker'),
+                    'corp_name': row.get('corp_name'),
+                    'corp_code': row.get('corp_code') or None,
+                    'listed_company': 0,
+                    'delisting_date': row.get('delisting_date') or None,
+                }
+                if not company['corp_code'] and self.corp_index:
+                    company['corp_code'] = self.corp_index.corp_code_for(company['ticker'])
+                companies.append(company)
+        
+        logger.info(f"{path}에서 상장 폐지 기업 {len(companies)}개 발견")
+        return companies
+    
     def calculate_target_year(self, delisting_date: str) -> str:
         """
         폐지 직전년도 계산
@@ -105,52 +220,57 @@ class DelistDataLoader:
         """
         try:
             if not delisting_date:
-                print("⚠️ 폐지일 정보가 없습니다. 기본값 2022년을 사용합니다.")
+                logger.warning("⚠️ 폐지일 정보가 없습니다. 기본값 2022년을 사용합니다.")
                 return "2022"
             
             # 폐지일에서 연도만 추출하고 -1
             year = int(delisting_date[:4])
             target_year = str(year - 1)
             
-            print(f"폐지일: {delisting_date} → 대상연도: {target_year}")
+            logger.debug(f"폐지일: {delisting_date} → 대상연도: {target_year}")
             return target_year
             
         except Exception as e:
-            print(f"연도 계산 중 오류 발생: {e}")
+            logger.error(f"연도 계산 중 오류 발생: {e}")
             return None
     
-    def search_company_by_corp_code(self, corp_code: str) -> Optional[Dict[str, Any]]:
+    def search_company_by_corp_code(self, corp_code: str, use_index: bool = True) -> Optional[Dict[str, Any]]:
         """
         기업 코드로 기업 정보 검색
         
         Args:
             corp_code (str): 기업 코드
+            use_index (bool): 로컬 기업 고유번호 인덱스를 먼저 조회할지 여부
             
         Returns:
-            Optional[Dict[str, Any]]: 기업 정보
+            Optional[Dict[str, Any]]: 기업 정보 (로컬 인덱스에 있으면 corp_code, corp_name, stock_code, modify_date만 포함)
         """
-        url = f"{self.dart_base_url}/company.json"
+        if use_index and self.corp_index:
+            record = self.corp_index.get(corp_code)
+            if record:
+                return record.to_dict()
+        
         params = {
             'crtfc_key': self.dart_api_key,
             'corp_code': corp_code
         }
         
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            cache_key = DartResponseCache.make_key('company.json', corp_code)
+            data = self._request_dart('company.json', params, cache_key)
             
             if data.get('status') == '000' and data.get('list'):
                 return data['list'][0]
             else:
-                print(f"기업 코드 {corp_code} 검색 실패: {data.get('message', '알 수 없는 오류')}")
+                logger.debug(f"기업 코드 {corp_code} 검색 실패: {data.get('message', '알 수 없는 오류')}")
                 return None
                 
         except Exception as e:
-            print(f"기업 검색 중 오류 발생: {e}")
+            logger.error(f"기업 검색 중 오류 발생: {e}")
             return None
     
-    def get_financial_statements(self, corp_code: str, year: str, fs_div: str = "CFS") -> List[Dict[str, Any]]:
+    def get_financial_statements(self, corp_code: str, year: str, fs_div: str = "CFS",
+                                 reprt_code: str = ANNUAL_REPORT) -> List[Dict[str, Any]]:
         """
         재무제표 데이터 조회
         
@@ -158,69 +278,167 @@ class DelistDataLoader:
             corp_code (str): 기업 코드
             year (str): 연도
             fs_div (str): 재무제표 구분 (CFS: 연결재무제표, OFS: 개별재무제표)
+            reprt_code (str): 보고서 코드 (11011: 사업보고서, 11012: 반기, 11013: 1분기, 11014: 3분기)
             
         Returns:
             List[Dict[str, Any]]: 재무제표 데이터 목록
         """
-        url = f"{self.dart_base_url}/fnlttSinglAcntAll.json"
+        return self.fetch_statements(corp_code, year, fs_div, reprt_code)[0]
+    
+    def fetch_statements(self, corp_code: str, year: str, fs_div: str = "CFS",
+                         reprt_code: str = ANNUAL_REPORT) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        재무제표 데이터와 응답 상태 조회
+        
+        Returns:
+            Tuple[List[Dict[str, Any]], str]: (재무제표 데이터 목록, DART status 또는 FETCH_ERROR)
+        """
         params = {
             'crtfc_key': self.dart_api_key,
             'corp_code': corp_code,
             'bsns_year': year,
-            'reprt_code': '11011',  # 사업보고서
+            'reprt_code': reprt_code,
             'fs_div': fs_div
         }
         
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            cache_key = DartResponseCache.make_key(
+                'fnlttSinglAcntAll.json', corp_code, year, params['reprt_code'], fs_div
+            )
+            data = self._request_dart('fnlttSinglAcntAll.json', params, cache_key)
             
-            if data.get('status') == '000':
-                return data.get('list', [])
+            status = data.get('status') or FETCH_ERROR
+            if status == DART_STATUS_OK:
+                return data.get('list', []), status
             else:
-                print(f"재무제표 조회 실패 ({fs_div}): {data.get('message', '알 수 없는 오류')}")
-                return []
+                logger.debug(f"재무제표 조회 실패 ({fs_div}): {data.get('message', '알 수 없는 오류')}")
+                return [], status
                 
         except Exception as e:
-            print(f"재무제표 조회 중 오류 발생 ({fs_div}): {e}")
-            return []
+            logger.error(f"재무제표 조회 중 오류 발생 ({fs_div}): {e}")
+            return [], FETCH_ERROR
     
-    def get_financial_data_with_priority(self, corp_code: str, year: str) -> Tuple[List[Dict[str, Any]], str]:
+    def get_financial_data_with_priority(self, corp_code: str, year: str,
+                                         reprt_code: str = ANNUAL_REPORT) -> Tuple[List[Dict[str, Any]], str]:
         """
         재무제표 우선순위 적용하여 데이터 조회
         
+        CFS가 있으면 CFS, 없으면 OFS를 사용하며, 조회 순서와 동시 조회 여부는
+        기업별 라우팅 기록(FsDivRouter)에 따라 정합니다.
+        
         Args:
             corp_code (str): 기업 코드
             year (str): 연도
+            reprt_code (str): 보고서 코드
             
         Returns:
             Tuple[List[Dict[str, Any]], str]: (재무제표 데이터, 사용된 재무제표 구분)
         """
-        print(f"재무제표 데이터 조회 시작: {year}년")
+        result = self.fetch_financial_data(corp_code, year, reprt_code)
+        return result.data, result.fs_div
+    
+    def fetch_financial_data(self, corp_code: str, year: str, reprt_code: str = ANNUAL_REPORT) -> FinancialFetch:
+        """
+        재무제표 우선순위(CFS → OFS)를 적용한 조회 결과와 결과 확정 여부
+        
+        조회 순서와 관계없이 CFS가 '데이터 없음'(013)으로 확인된 경우에만 OFS 데이터를 사용하고,
+        일시적 오류로 CFS를 확인하지 못하면 데이터 없이 미확정(definitive=False)으로 반환합니다.
+        """
+        logger.debug(f"재무제표 데이터 조회 시작: {year}년 ({reprt_code})")
         
-        # 1차 시도: 연결재무제표(CFS)
-        print("1차 시도: 연결재무제표(CFS) 조회")
-        cfs_data = self.get_financial_statements(corp_code, year, "CFS")
+        # 기업별로 학습한 순서대로 조회 (처음 보는 기업은 CFS/OFS 동시 조회)
+        route = self.fs_router.route(corp_code)
+        if self.fs_router.is_known(corp_code):
+            self.metrics.increment('fs_route_known')
         
-        if cfs_data and len(cfs_data) > 0:
-            print(f"✅ 연결재무제표 데이터 {len(cfs_data)}개 항목 발견")
-            return cfs_data, "CFS"
+        results = {}
+        if route.parallel:
+            # 2차 조회를 미리 시작하고 1차(CFS) 결과가 있으면 2차 결과는 쓰지 않음 (응답 캐시에는 저장됨)
+            self.metrics.increment('fs_speculative')
+            second = self._speculative_executor().submit(
+                self._fetch_fs_div, corp_code, year, route.second, reprt_code
+            )
+            results[route.first] = self._fetch_fs_div(corp_code, year, route.first, reprt_code)
+            if route.first == CFS and results[CFS][0]:
+                if not second.cancel():
+                    self.metrics.increment('fs_speculative_unused')
+            else:
+                results[route.second] = second.result()
+        else:
+            results[route.first] = self._fetch_fs_div(corp_code, year, route.first, reprt_code)
+            # OFS부터 조회했으면 OFS 데이터가 있어도 CFS가 없는지 확인해야 하므로 CFS도 조회
+            if not (route.first == CFS and results[CFS][0]):
+                results[route.second] = self._fetch_fs_div(corp_code, year, route.second, reprt_code)
         
-        # 2차 시도: 개별재무제표(OFS)
-        print("2차 시도: 개별재무제표(OFS) 조회")
-        ofs_data = self.get_financial_statements(corp_code, year, "OFS")
+        # 우선순위대로 보면서 데이터가 없는 구분이 모두 '데이터 없음'으로 확인됐는지 확인
+        definitive = True
+        for fs_div in (CFS, OFS):
+            data, status = results[fs_div]
+            if data:
+                break
+            if status not in (DART_STATUS_OK, DART_STATUS_NO_DATA):
+                definitive = False
+        else:
+            data, fs_div = [], ""
         
-        if ofs_data and len(ofs_data) > 0:
-            print(f"✅ 개별재무제표 데이터 {len(ofs_data)}개 항목 발견")
-            return ofs_data, "OFS"
+        if data and not definitive:
+            logger.warning(f"{corp_code} {year}년 ({reprt_code}): 우선 조회한 재무제표 확인 실패로 {fs_div} 결과를 보류합니다.")
+            data, fs_div = [], ""
         
-        print("❌ 재무제표 데이터를 찾을 수 없습니다.")
-        return [], ""
+        if data:
+            label = '연결재무제표' if fs_div == CFS else '개별재무제표'
+            logger.debug(f"✅ {label} 데이터 {len(data)}개 항목 발견")
+            self.metrics.increment(f'fs_div_{fs_div.lower()}')
+            # OFS는 CFS가 '데이터 없음'으로 확인된 경우에만 학습
+            if fs_div == CFS or results[CFS][1] == DART_STATUS_NO_DATA:
+                self.fs_router.record(corp_code, fs_div)
+        elif definitive:
+            logger.debug("❌ 재무제표 데이터를 찾을 수 없습니다.")
+            self.metrics.increment('fs_div_none')
+        else:
+            self.metrics.increment('fs_div_failed')
+        return FinancialFetch(data, fs_div, definitive)
     
-    def __init__(self):
+    def _fetch_fs_div(self, corp_code: str, year: str, fs_div: str, reprt_code: str) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        재무제표 구분 하나 조회 (단계별 소요 시간 기록)
+        """
+        logger.debug(f"{fs_div} 조회")
+        with self.metrics.stage(f'dart_{fs_div.lower()}'):
+            return self.fetch_statements(corp_code, year, fs_div, reprt_code)
+    
+    def _speculative_executor(self) -> ThreadPoolExecutor:
+        """
+        CFS/OFS 동시 조회용 스레드 풀 (조회 워커 풀과 분리해 서로 기다리다 멈추지 않도록 함)
+        """
+        with self._speculative_lock:
+            if self._speculative_pool is None:
+                self._speculative_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='fs-speculative'
+                )
+            return self._speculative_pool
+    
+    def __init__(self, max_workers: Optional[int] = None, requests_per_second: Optional[float] = None,
+                 cache: Optional[DartResponseCache] = None, output_format: Optional[str] = None,
+                 db_sink: Optional[str] = None, planner: Optional[BackfillPlanner] = None,
+                 corp_index: Optional[CorpCodeIndex] = None, shard: Optional[Tuple[int, int]] = None,
+                 state: Optional[LoaderStateStore] = None, taxonomy: Optional[AccountTaxonomy] = None,
+                 sinks: Optional[Sequence[BatchSink]] = None):
         """
         상장 폐지 기업 재무 데이터 로더 초기화
+        
+        Args:
+            max_workers (Optional[int]): 동시 조회 워커 수 (기본값: DART_MAX_WORKERS 또는 1)
+            requests_per_second (Optional[float]): DART API 초당 호출 제한 (기본값: DART_REQUESTS_PER_SECOND)
+            cache (Optional[DartResponseCache]): DART 응답 캐시 (기본값: DART_CACHE_PATH 설정 사용)
+            output_format (Optional[str]): 출력 형식 csv/parquet/arrow (기본값: DELIST_OUTPUT_FORMAT 또는 csv)
+            db_sink (Optional[str]): DB 저장 방식 postgres/postgrest (기본값: DELIST_DB_SINK, 비어 있으면 저장 안 함)
+            planner (Optional[BackfillPlanner]): 조회 작업 planner (기본값: DELIST_YEARS_BACK, DELIST_REPORT_CODES 설정 사용)
+            corp_index (Optional[CorpCodeIndex]): 기업 고유번호 인덱스 (기본값: DART_CORP_INDEX_PATH 파일이 있으면 사용)
+            shard (Optional[Tuple[int, int]]): 처리할 샤드 (i, N) (기본값: DELIST_SHARD 'i/N', 비어 있으면 전체)
+            state (Optional[LoaderStateStore]): 증분 실행 상태 저장소 (기본값: DELIST_STATE_PATH 설정 사용)
+            taxonomy (Optional[AccountTaxonomy]): 계정 ID 정규화 색인 (기본값: DELIST_ACCOUNT_TAXONOMY 설정 사용)
+            sinks (Optional[Sequence[BatchSink]]): 기본 출력 외에 배치를 함께 기록할 출력 (write_batch/close/rows_written)
         """
         self.supabase_url = os.getenv('SUPABASE_URL')
         self.supabase_key = os.getenv('SUPABASE_ANON_KEY')
@@ -232,61 +450,297 @@ class DelistDataLoader:
         if not self.dart_api_key:
             raise ValueError("DART API 키가 필요합니다. .env 파일을 확인해주세요.")
         
-        self.dart_base_url = "https://opendart.fss.or.kr/api"
+        self.dart_base_url = os.getenv('DART_BASE_URL', "https://opendart.fss.or.kr/api").rstrip('/')
+        
+        # 출력 설정: 행은 batch_size 단위로 디스크에 기록하고 완료된 조회 작업은 체크포인트에 남김
+        # 형식은 csv(기본), parquet, arrow 중 선택 (parquet/arrow는 year/fs_div 파티션 디렉터리)
+        self.output_format = (output_format or os.getenv('DELIST_OUTPUT_FORMAT', 'csv')).lower()
+        if self.output_format not in OUTPUT_EXTENSIONS:
+            raise ValueError(f"지원하지 않는 출력 형식입니다: {self.output_format}")
+        self.output_path = os.getenv(
+            'DELIST_OUTPUT_PATH', f"data/delisted_financials_all.{OUTPUT_EXTENSIONS[self.output_format]}"
+        )
+        
+        # 샤드 실행: ticker 해시로 나눈 N개 중 i번째만 처리하고 샤드별 경로에 기록 (sharding.py로 병합)
+        if shard is None and os.getenv('DELIST_SHARD'):
+            shard = parse_shard(os.getenv('DELIST_SHARD'))
+        self.shard = shard
+        if self.shard:
+            self.output_path = shard_output_path(self.output_path, *self.shard)
+        self.checkpoint = CheckpointManifest(f"{self.output_path}.done")
+        self.batch_size = int(os.getenv('DELIST_BATCH_SIZE', '5000'))
+        self.csv_writer = None
+        
+        # DB 일괄 저장 설정 (postgres: COPY, postgrest: 청크 업서트, 빈 값: 저장 안 함)
+        self.db_sink = (db_sink if db_sink is not None else os.getenv('DELIST_DB_SINK', '')).lower()
+        self.db_table = os.getenv('DELIST_DB_TABLE', 'delisted_financials')
+        self.db_writer = None
         
-        # CSV 데이터를 저장할 리스트
+        # 인덱스가 있는 임베디드 분석 저장소 (DELIST_STORE=sqlite|duckdb로 켤 때만 저장, 기본값은 저장 안 함)
+        # 샤드 실행은 경로를 따로 지정하지 않으면 샤드별 파일에 저장 (샤드 프로세스끼리 같은 파일에 쓰지 않도록)
+        self.store_engine = os.getenv('DELIST_STORE', '').lower()
+        self.store_path = os.getenv('DELIST_STORE_PATH') or None
+        if self.store_engine and self.shard and not self.store_path:
+            from financial_store import DEFAULT_STORE_PATHS
+            self.store_path = shard_output_path(DEFAULT_STORE_PATHS.get(self.store_engine, ''), *self.shard)
+        self.store = None
+        
+        # 호출하는 쪽에서 연결한 추가 출력 (기본 출력과 같은 배치를 같은 시점에 기록)
+        self.extra_sinks = list(sinks or [])
+        
+        # 아직 디스크에 기록되지 않은 컬럼 배치와 조회 작업
         self.all_csv_data = []
+        self._buffered_rows = 0
+        self._pending_tasks = []
+        
+        # 조회 → 변환 → 기록 파이프라인 설정
+        # - 조회 워커: DART 동시 호출 수, 변환 워커: DART list → 컬럼 배치 변환 스레드 수
+        # - 처리 중 작업 수 제한: 기록이 밀리면 조회를 멈춰 메모리에 쌓이는 응답 수를 제한
+        self.max_workers = max_workers or int(os.getenv('DART_MAX_WORKERS', '1'))
+        self.parse_workers = int(os.getenv('DELIST_PARSE_WORKERS', '1'))
+        self.max_in_flight = int(os.getenv('DELIST_MAX_IN_FLIGHT', '0'))
+        
+        # DART/Supabase 공용 HTTP 세션 (연결 풀, keep-alive, 재시도)
+        self.http = create_session(pool_maxsize=max(10, self.max_workers))
+        
+        # 단계별 소요 시간/요청 지연/카운터 (실행 후 JSON 보고서와 Prometheus 텍스트로 저장, 빈 값이면 저장 안 함)
+        self.metrics = RunMetrics()
+        self.http.hooks['response'].append(self._record_response)
+        self.report_path = os.getenv('DELIST_REPORT_PATH', f"{self.output_path}.report.json")
+        self.prometheus_path = os.getenv('DELIST_PROMETHEUS_PATH', f"{self.output_path}.prom")
+        self.supabase_reader = SupabaseReader(self.supabase_url, self.supabase_key, session=self.http)
+        
+        # 모든 워커가 공유하는 DART 호출 속도 제한기
+        rps = requests_per_second or float(os.getenv('DART_REQUESTS_PER_SECOND', '0'))
+        self.rate_limiter = TokenBucket(rps) if rps > 0 else None
+        
+        # 조회 계획: 폐지 직전년도부터 DELIST_YEARS_BACK개 연도, DELIST_REPORT_CODES 보고서
+        # (DELIST_SKIP_COVERED_YEARS=1이면 전기 금액으로 채워지는 연도의 사업보고서 조회 생략)
+        if planner is None:
+            planner = BackfillPlanner(
+                years_back=int(os.getenv('DELIST_YEARS_BACK', '1')),
+                reprt_codes=os.getenv('DELIST_REPORT_CODES', ANNUAL_REPORT).split(','),
+                skip_covered_years=os.getenv('DELIST_SKIP_COVERED_YEARS', '0') == '1'
+            )
+        self.planner = planner
+        
+        # DART 응답 영구 캐시 (DART_CACHE_PATH를 빈 값으로 설정하면 비활성화)
+        if cache is None:
+            cache_path = os.getenv('DART_CACHE_PATH', 'data/cache/dart_cache.sqlite3')
+            if cache_path:
+                cache_ttl = os.getenv('DART_CACHE_TTL')
+                cache = DartResponseCache(cache_path, ttl=float(cache_ttl) if cache_ttl else None)
+        self.cache = cache
+        
+        # corpCode.xml 기반 로컬 기업 고유번호 인덱스 (corp_code_index.py로 갱신)
+        if corp_index is None:
+            index_path = os.getenv('DART_CORP_INDEX_PATH', 'data/cache/corp_codes.tsv')
+            if index_path and os.path.exists(index_path):
+                corp_index = CorpCodeIndex.load(index_path)
+        self.corp_index = corp_index
+        
+        # 상장 폐지 기업 목록 CSV (설정하면 Supabase 대신 사용, 예: data/delisted_corp.csv)
+        self.companies_path = os.getenv('DELIST_COMPANIES_PATH', '')
+        
+        # 조회 완료 작업/처리한 기업/폐지일 워터마크 상태 (DELIST_STATE_PATH를 빈 값으로 설정하면 비활성화)
+        if state is None:
+            state_path = os.getenv('DELIST_STATE_PATH', 'data/cache/loader_state.sqlite3')
+            if state_path:
+                state = LoaderStateStore(state_path)
+        self.state = state
+        
+        # 계정 ID 정규화 (ifrs_ → ifrs-full_, 표준계정코드 미사용 행은 계정명으로 매핑)
+        # DELIST_ACCOUNT_TAXONOMY를 빈 값으로 설정하면 DART account_id를 그대로 저장
+        if taxonomy is None:
+            taxonomy_path = os.getenv('DELIST_ACCOUNT_TAXONOMY', 'data/account_taxonomy.tsv')
+            if taxonomy_path:
+                taxonomy = load_taxonomy(taxonomy_path)
+        self.taxonomy = taxonomy
+        
+        # 기업별 CFS/OFS 조회 순서 (DART_FS_ROUTING=off|strict|learned, 상태 저장소가 있으면 실행 간 유지)
+        # strict/learned는 CFS/OFS 동시 조회로 지연 시간을 줄이지만 DART 호출 수가 늘어나므로 기본값은 off
+        self.fs_router = FsDivRouter(
+            self.state.fs_routes() if self.state else None, os.getenv('DART_FS_ROUTING', 'off').lower()
+        )
+        self._speculative_pool: Optional[ThreadPoolExecutor] = None
+        self._speculative_lock = threading.Lock()
     
-    def process_delisted_company(self, company: Dict[str, Any]) -> bool:
+    def _record_response(self, response, *args, **kwargs):
         """
-        상장 폐지 기업 데이터 처리
+        HTTP 응답마다 요청 지연과 상태 코드 기록 (재시도 요청 포함)
+        """
+        target = 'supabase' if '/rest/v1/' in response.url else 'dart'
+        self.metrics.observe(f'{target}_request', response.elapsed.total_seconds())
+        self.metrics.increment(f'{target}_requests')
+        if response.status_code >= 400:
+            self.metrics.increment(f'{target}_http_errors')
+    
+    def _log_progress(self, done: int, total: int):
+        """
+        진행률 출력 (INFO는 약 5% 단위, DEBUG는 작업마다)
+        """
+        message = f"진행률: {done}/{total} ({done/total*100:.1f}%)"
+        if done == total or done % max(1, total // 20) == 0:
+            logger.info(message)
+        else:
+            logger.debug(message)
+    
+    def save_run_report(self, summary: Dict[str, Any]):
+        """
+        재시도/캐시 통계를 반영해 실행 보고서 저장
+        """
+        self.metrics.set('http_retries', self.http.retry_count)
+        self.metrics.set('http_throttled', self.http.throttle_count)
+        if self.cache:
+            self.metrics.set('cache_hits', self.cache.hits)
+            self.metrics.set('cache_misses', self.cache.misses)
+        
+        try:
+            self.metrics.save(self.report_path, self.prometheus_path, extra={'summary': summary})
+            if self.report_path:
+                logger.info(f"실행 보고서: {self.report_path}")
+        except OSError as e:
+            logger.error(f"실행 보고서 저장 중 오류 발생: {e}")
+    
+    def _request_dart(self, endpoint: str, params: Dict[str, Any], cache_key: str) -> Dict[str, Any]:
+        """
+        DART API 호출 (응답 캐시 우선 조회)
+        
+        Args:
+            endpoint (str): API 엔드포인트 (예: fnlttSinglAcntAll.json)
+            params (Dict[str, Any]): 요청 파라미터
+            cache_key (str): 응답 캐시 키
+            
+        Returns:
+            Dict[str, Any]: DART 응답 JSON
+        """
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
+        # 속도 제한 토큰은 세션이 재시도를 포함한 시도마다 확보
+        response = self.http.get(f"{self.dart_base_url}/{endpoint}", params=params, limiter=self.rate_limiter)
+        response.raise_for_status()
+        data = response.json()
+        
+        if self.cache:
+            self.cache.set(cache_key, data)
+        
+        return data
+    
+    def resolve_target_year(self, company: Dict[str, Any]) -> str:
+        """
+        기업의 폐지 직전년도 결정 (폐지일이 없으면 기본값 2022년)
         
         Args:
             company (Dict[str, Any]): 기업 정보
             
         Returns:
-            bool: 처리 성공 여부
+            str: 대상 연도
         """
         ticker = company.get('ticker')
-        corp_code = company.get('corp_code')
         company_name = company.get('company_name')
         delisting_date = company.get('delisting_date')
         
-        print(f"\n처리 중: {company_name} ({ticker})")
-        print(f"폐지일: {delisting_date}")
+        logger.debug(f"\n처리 중: {company_name} ({ticker})")
+        logger.debug(f"폐지일: {delisting_date}")
         
-        if not corp_code:
-            print(f"기업 코드가 없습니다: {ticker}")
-            return False
+        if not company.get('corp_code'):
+            logger.warning(f"기업 코드가 없습니다: {ticker}")
+            return ""
         
         if not delisting_date:
-            print(f"폐지일이 없습니다: {ticker}")
-            print("기본값 2022년을 사용합니다.")
-            target_year = "2022"
-        else:
-            # 폐지 직전년도 계산
-            target_year = self.calculate_target_year(delisting_date)
+            logger.debug(f"폐지일이 없습니다: {ticker}")
+            logger.debug("기본값 2022년을 사용합니다.")
+            return "2022"
         
-
+        # 폐지 직전년도 계산
+        return self.calculate_target_year(delisting_date)
+    
+    def fetch_task(self, task: FetchTask) -> FinancialFetch:
+        """
+        조회 작업 하나의 재무제표 조회 (네트워크 구간만 수행, 워커 스레드에서 호출 가능)
+        
+        Args:
+            task (FetchTask): 조회 작업
+            
+        Returns:
+            FinancialFetch: (재무제표 데이터, 사용된 재무제표 구분, 결과 확정 여부)
+        """
+        return self.fetch_financial_data(task.corp_code, task.year, task.reprt_code)
+    
+    def complete_task(self, task: FetchTask, financial_data: List[Dict[str, Any]], fs_div: str) -> bool:
+        """
+        조회된 재무제표를 CSV용 데이터로 수집하고 완료된 작업으로 기록
         
-        # 재무제표 데이터 조회 (우선순위 적용)
-        financial_data, fs_div = self.get_financial_data_with_priority(corp_code, target_year)
+        Args:
+            task (FetchTask): 조회 작업
+            financial_data (List[Dict[str, Any]]): 재무제표 데이터
+            fs_div (str): 재무제표 구분
+            
+        Returns:
+            bool: 처리 성공 여부
+        """
+        return self.commit_task(task, self.parse_task(task, financial_data, fs_div))
+    
+    def parse_task(self, task: FetchTask, financial_data: List[Dict[str, Any]], fs_div: str) -> Optional[FinancialBatch]:
+        """
+        조회된 재무제표를 컬럼 배치로 변환 (변환 워커 스레드에서 호출 가능)
         
+        Returns:
+            Optional[FinancialBatch]: 변환된 배치 (데이터가 없거나 변환에 실패하면 None)
+        """
         if not financial_data:
-            print(f"재무제표 데이터가 없습니다: {ticker}")
+            logger.debug(f"재무제표 데이터가 없습니다: {task.ticker} {task.year}년 ({task.reprt_code})")
+            return None
+        
+        try:
+            return self.transform_statement(task.ticker, task.year, financial_data, fs_div, task.reprt_code)
+        except Exception as e:
+            logger.error(f"데이터 수집 중 오류 발생: {e}")
+            logger.warning(f"❌ {task.ticker} {task.year}년 ({task.reprt_code}) 데이터 처리 실패")
+            return None
+    
+    def commit_task(self, task: FetchTask, batch: Optional[FinancialBatch]) -> bool:
+        """
+        변환된 배치를 기록 버퍼에 넣고 완료된 작업으로 기록 (기록 단계 스레드 하나에서만 호출)
+        
+        Returns:
+            bool: 처리 성공 여부
+        """
+        if batch is None:
             return False
         
-        # CSV 데이터 수집
-        success = self.collect_financial_data_for_csv(ticker, target_year, financial_data, fs_div)
+        self.buffer_batch(batch)
+        logger.debug(f"✅ {task.ticker} {task.year}년 ({task.reprt_code}) 데이터 처리 완료 ({len(batch)}개 항목)")
+        self._pending_tasks.append(task.checkpoint_key)
+        if self._buffered_rows >= self.batch_size:
+            self.flush_csv_batch()
+        return True
+    
+    def process_delisted_company(self, company: Dict[str, Any]) -> bool:
+        """
+        상장 폐지 기업 데이터 처리
         
-        if success:
-            print(f"✅ {company_name} ({ticker}) 데이터 처리 완료")
-        else:
-            print(f"❌ {company_name} ({ticker}) 데이터 처리 실패")
+        Args:
+            company (Dict[str, Any]): 기업 정보
+            
+        Returns:
+            bool: 처리 성공 여부 (조회 작업 중 하나라도 성공하면 True)
+        """
+        tasks = self.planner.expand(company, self.resolve_target_year(company))
+        
+        success = False
+        for task in tasks:
+            result = self.fetch_task(task)
+            if self.complete_task(task, result.data, result.fs_div):
+                success = True
         
         return success
     
-    def collect_financial_data_for_csv(self, ticker: str, year: str, financial_data: List[Dict[str, Any]], fs_div: str) -> bool:
+    def collect_financial_data_for_csv(self, ticker: str, year: str, financial_data: List[Dict[str, Any]], fs_div: str,
+                                       reprt_code: str = ANNUAL_REPORT) -> bool:
         """
         재무 데이터를 CSV용으로 수집
         
@@ -295,128 +749,298 @@ class DelistDataLoader:
             year (str): 연도
             financial_data (List[Dict[str, Any]]): 재무 데이터
             fs_div (str): 재무제표 구분
+            reprt_code (str): 보고서 코드
             
         Returns:
             bool: 수집 성공 여부
         """
         try:
-            # 데이터 변환
-            for item in financial_data:
-                # 금액 데이터 숫자형 변환
-                this_term_amount = item.get('thstrm_amount', '0')
-                prev_term_amount = item.get('frmtrm_amount', '0')
-                
-                try:
-                    this_term_amount = float(this_term_amount.replace(',', '')) if this_term_amount and this_term_amount != '-' else 0
-                except:
-                    this_term_amount = 0
-                    
-                try:
-                    prev_term_amount = float(prev_term_amount.replace(',', '')) if prev_term_amount and prev_term_amount != '-' else 0
-                except:
-                    prev_term_amount = 0
-                
-                csv_row = {
-                    'ticker': ticker,
-                    'year': year,
-                    'account_id': item.get('account_id', ''),
-                    'account_nm': item.get('account_nm', '').strip(),
-                    'account_detail': item.get('account_detail', ''),
-                    'this_term_amount': this_term_amount,
-                    'prev_term_amount': prev_term_amount,
-                    'statement_name': item.get('sj_nm', ''),
-                    'fs_div': fs_div
-                }
-                self.all_csv_data.append(csv_row)
-            
-            print(f"{ticker} {year}년 데이터 수집 완료 ({len(financial_data)}개 항목, {fs_div})")
-            return True
-            
+            batch = self.transform_statement(ticker, year, financial_data, fs_div, reprt_code)
         except Exception as e:
-            print(f"데이터 수집 중 오류 발생: {e}")
+            logger.error(f"데이터 수집 중 오류 발생: {e}")
             return False
+        
+        self.buffer_batch(batch)
+        logger.debug(f"{ticker} {year}년 데이터 수집 완료 ({len(financial_data)}개 항목, {fs_div})")
+        return True
+    
+    def transform_statement(self, ticker: str, year: str, financial_data: List[Dict[str, Any]], fs_div: str,
+                            reprt_code: str = ANNUAL_REPORT) -> FinancialBatch:
+        """
+        DART list를 컬럼 배치로 일괄 변환하고 계정 ID를 표준 계정 ID로 통일 (변환 워커 스레드에서 호출 가능)
+        """
+        with self.metrics.stage('transform'):
+            batch = ingest_statement_list(ticker, year, financial_data, fs_div, reprt_code)
+            if self.taxonomy is not None:
+                batch = self.taxonomy.canonicalize_batch(batch)
+        return batch
+    
+    def buffer_batch(self, batch: FinancialBatch):
+        """
+        변환된 배치를 기록 버퍼에 추가 (기록 단계 스레드 하나에서만 호출)
+        """
+        self.all_csv_data.append(batch)
+        self._buffered_rows += len(batch)
+    
+    def open_output(self, resume: bool = False):
+        """
+        출력 파일(CSV 또는 Parquet/Arrow 데이터셋)과 체크포인트 열기
+        
+        Args:
+            resume (bool): 기존 출력에 이어서 기록할지 여부 (False면 새로 시작)
+        """
+        if not resume:
+            self.checkpoint.reset()
+        
+        # pyarrow/pandas는 해당 출력을 쓸 때만 불러옴 (CSV 전용 실행의 시작 시간 단축)
+        if self.output_format == 'csv':
+            self.csv_writer = CsvBatchWriter(self.output_path, append=resume)
+        else:
+            from columnar_output import ColumnarBatchWriter
+            self.csv_writer = ColumnarBatchWriter(self.output_path, self.output_format, append=resume)
+        
+        # 이전 실행이 출력에 기록한 뒤 체크포인트를 남기기 전에 중단됐다면 그 행을 지우고 다시 조회
+        if resume:
+            discarded = self.csv_writer.discard_uncommitted(self.checkpoint.positions())
+            if discarded:
+                logger.info(f"체크포인트 이후 기록된 출력 {discarded}개 정리 (다시 조회)")
+        self.checkpoint.mark_completed([], self.csv_writer.position())
+        
+        if self.db_sink == 'postgres':
+            dsn = os.getenv('DATABASE_URL')
+            if not dsn:
+                raise ValueError("postgres 저장에는 DATABASE_URL이 필요합니다. .env 파일을 확인해주세요.")
+            self.db_writer = PostgresCopyWriter(dsn, self.db_table)
+        elif self.db_sink == 'postgrest':
+            self.db_writer = PostgrestUpsertWriter(self.http, self.supabase_url, self.supabase_key, self.db_table)
+        elif self.db_sink:
+            raise ValueError(f"지원하지 않는 DB 저장 방식입니다: {self.db_sink}")
+        
+        if self.store_engine:
+            from financial_store import FinancialStore
+            self.store = FinancialStore(self.store_path, self.store_engine)
+    
+    def active_sinks(self) -> List[Tuple[str, BatchSink]]:
+        """
+        배치를 기록할 출력 목록 (실행 보고서 단계명, 출력)
+        
+        파일 출력(CSV/Parquet/Arrow), DB, 분석 저장소, 추가 출력 순서로 같은 배치를 기록합니다.
+        """
+        sinks = [('write', self.csv_writer), ('db_write', self.db_writer), ('store_write', self.store)]
+        sinks += [('sink_write', sink) for sink in self.extra_sinks]
+        return [(stage, sink) for stage, sink in sinks if sink is not None]
+    
+    def flush_csv_batch(self):
+        """
+        버퍼에 쌓인 행을 모든 출력에 기록한 뒤 해당 조회 작업들을 체크포인트에 완료로 표시
+        """
+        if self.csv_writer is None:
+            self.open_output()
+        
+        if self.all_csv_data:
+            batch = FinancialBatch.concat(self.all_csv_data)
+            for stage, sink in self.active_sinks():
+                with self.metrics.stage(stage):
+                    sink.write_batch(batch)
+            self.all_csv_data = []
+            self._buffered_rows = 0
+        
+        self.checkpoint.mark_completed(self._pending_tasks, self.csv_writer.position())
+        if self.state:
+            self.state.record_fetched(self._pending_tasks)
+            self.state.record_fs_routes(self.fs_router.drain())
+        self._pending_tasks = []
     
     def save_all_data_to_csv(self):
         """
-        수집된 모든 데이터를 하나의 CSV 파일로 저장
+        남은 배치를 CSV 파일에 기록하고 파일 닫기
         """
         try:
-            if not self.all_csv_data:
-                print("저장할 데이터가 없습니다.")
-                return
+            self.flush_csv_batch()
             
-            # CSV 파일명 생성
-            csv_filename = "data/delisted_financials_all.csv"
+            if not self.csv_writer.rows_written:
+                logger.info("저장할 데이터가 없습니다.")
+            else:
+                logger.info(f"{self.output_format.upper()} 저장 완료 (이번 실행 {self.csv_writer.rows_written}개 항목)")
+                logger.info(f"파일 위치: {self.output_path}")
             
-            # data 폴더가 없으면 생성
-            os.makedirs("data", exist_ok=True)
+            self.csv_writer.close()
+            self.csv_writer = None
             
-            # DataFrame으로 변환하여 CSV 저장
-            df = pd.DataFrame(self.all_csv_data)
-            df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
+            if self.db_writer:
+                logger.info(f"DB 저장 완료 ({self.db_table}, {self.db_writer.rows_written}개 항목)")
+                self.db_writer.close()
+                self.db_writer = None
             
-            print(f"전체 데이터 CSV 저장 완료 ({len(self.all_csv_data)}개 항목)")
-            print(f"파일 위치: {csv_filename}")
+            if self.store:
+                logger.info(f"분석 저장소 저장 완료 ({self.store.path}, {self.store.rows_written}개 항목)")
+                self.store.close()
+                self.store = None
+            
+            for sink in self.extra_sinks:
+                logger.info(f"추가 출력 저장 완료 ({type(sink).__name__}, {sink.rows_written}개 항목)")
+                sink.close()
             
         except Exception as e:
-            print(f"CSV 저장 중 오류 발생: {e}")
+            logger.error(f"CSV 저장 중 오류 발생: {e}")
     
-    def process_all_delisted_companies(self, limit: Optional[int] = None):
+    def process_all_delisted_companies(self, limit: Optional[int] = None, max_workers: Optional[int] = None,
+                                       resume: bool = False, incremental: bool = False):
         """
         모든 상장 폐지 기업 데이터 처리
         
         Args:
             limit (Optional[int]): 처리할 기업 수 제한 (테스트용)
+            max_workers (Optional[int]): 동시 조회 워커 수 (기본값: 로더 설정값)
+            resume (bool): 체크포인트에 완료로 기록된 조회 작업을 건너뛰고 기존 출력에 이어서 기록
+            incremental (bool): 워터마크 이후 폐지됐거나 정보가 바뀐 기업만 처리하고 기존 출력에 이어서 기록
+            
+        Returns:
+            Dict[str, int]: 처리 결과 (companies: 대상 기업 수, succeeded: 성공 기업 수,
+                failed: 실패한 작업이 있는 기업 수, tasks: 조회 작업 수)
         """
-        print("상장 폐지 기업 재무 데이터 수집 시작")
-        print("전략: 폐지 직전년도 사업보고서 → 연결재무제표(CFS) → 개별재무제표(OFS)")
+        logger.info("상장 폐지 기업 재무 데이터 수집 시작")
+        logger.info("전략: 폐지 직전년도 사업보고서 → 연결재무제표(CFS) → 개별재무제표(OFS)")
+        logger.info(f"조회 범위: {self.planner.years_back}개 연도, 보고서 {', '.join(self.planner.reprt_codes)}")
+        
+        if incremental and not self.state:
+            raise ValueError("증분 실행에는 상태 저장소가 필요합니다. DELIST_STATE_PATH를 확인해주세요.")
+        
+        # 워터마크는 샤드별로 따로 관리 (샤드 하나가 실패해도 다른 샤드 워터마크가 앞서 나가지 않도록)
+        scope = f":{self.shard[0]}/{self.shard[1]}" if self.shard else ''
+        since = self.state.get_watermark(scope) if incremental else None
+        if incremental:
+            logger.info(f"증분 실행: 폐지일 워터마크 {since or '없음'}")
         
         # 상장 폐지 기업 목록 가져오기
-        companies = self.get_delisted_companies()
+        companies = self.get_delisted_companies(since)
         
         if not companies:
-            print("상장 폐지 기업이 없습니다.")
-            return
+            logger.warning("상장 폐지 기업이 없습니다.")
+            return {'companies': 0, 'succeeded': 0, 'failed': 0, 'tasks': 0}
         
         if limit:
             companies = companies[:limit]
-            print(f"테스트 모드: {limit}개 기업만 처리")
+            logger.info(f"테스트 모드: {limit}개 기업만 처리")
         
-        success_count = 0
-        total_count = len(companies)
+        if self.shard:
+            companies = select_shard(companies, *self.shard)
+            logger.info(f"샤드 {self.shard[0]}/{self.shard[1]}: {len(companies)}개 기업 처리")
         
-        for i, company in enumerate(companies, 1):
-            print(f"\n진행률: {i}/{total_count} ({i/total_count*100:.1f}%)")
-            
-            success = self.process_delisted_company(company)
-            if success:
-                success_count += 1
-            
-            # API 호출 제한 방지를 위한 딜레이
-            time.sleep(0.3)
+        if incremental:
+            companies = self.state.changed_companies(companies)
+            logger.info(f"새로 폐지되었거나 정보가 바뀐 기업 {len(companies)}개")
+            if not companies:
+                return {'companies': 0, 'succeeded': 0, 'failed': 0, 'tasks': 0}
+        
+        # 기업별 폐지 직전년도 → (corp_code, 연도, 보고서) 조회 작업으로 펼치기
+        target_years = {company.get('ticker'): self.resolve_target_year(company) for company in companies}
+        completed = self.checkpoint.load() if resume else set()
+        if incremental:
+            completed |= self.state.fetched_keys()
+        tasks = self.planner.plan(companies, target_years, completed)
+        
+        if completed:
+            logger.info(f"완료된 조회 작업 {len(completed)}개 건너뜀")
+        logger.info(f"\n조회 작업 {len(tasks)}개 (기업 {len(companies)}개)")
+        
+        self.open_output(resume or incremental)
+        
+        succeeded = set()
+        total_tasks = len(tasks)
+        workers = max_workers or self.max_workers
+        
+        if workers > 1:
+            logger.info(f"동시 조회 모드: 워커 {workers}개")
+        
+        # 일시적 오류나 변환 실패로 끝나지 않은 작업이 있는 기업 (처리 완료로 기록하지 않음)
+        failed = set()
+        
+        def fetch(task: FetchTask):
+            result = self.fetch_task(task)
+            # API 호출 제한 방지를 위한 딜레이 (순차 조회이고 속도 제한기가 없을 때만)
+            if workers == 1 and not self.rate_limiter:
+                time.sleep(0.3)
+            return task, result
+        
+        def parse(fetched):
+            task, result = fetched
+            batch = self.parse_task(task, result.data, result.fs_div)
+            return task, batch, (batch is None and bool(result.data)) or not result.definitive
         
-        print(f"\n처리 완료: {success_count}/{total_count} 성공")
+        done = 0
         
-        # 모든 데이터를 하나의 CSV 파일로 저장
+        def sink(parsed):
+            # 버퍼/체크포인트/출력은 이 단계(호출 스레드)에서만 다루고, 작업 순서대로 기록
+            nonlocal done
+            task, batch, task_failed = parsed
+            done += 1
+            self._log_progress(done, total_tasks)
+            if self.commit_task(task, batch):
+                succeeded.add(task.ticker)
+            if task_failed:
+                failed.add(task.ticker)
+        
+        # 조회 → 변환 → 기록을 단계별 스레드로 겹쳐 실행 (기록이 밀리면 조회도 멈춤)
+        stages = [PipelineStage('fetch', fetch, workers), PipelineStage('parse', parse, self.parse_workers)]
+        max_in_flight = self.max_in_flight or max(16, 4 * workers)
+        pipeline = StagePipeline(stages, sink, max_in_flight)
+        pipeline.run(tasks)
+        
+        stats = pipeline.stats()
+        busy = ', '.join(f"{name} {stage['busy_sec']:.1f}초" for name, stage in stats['stages'].items())
+        logger.info(f"단계별 작업 시간(워커 합계): {busy}, 입력 대기 {stats['backpressure_sec']:.1f}초")
+        
+        success_count = len(succeeded)
+        total_count = len(companies)
+        logger.info(f"\n처리 완료: {success_count}/{total_count} 성공")
+        if failed:
+            logger.warning(f"조회/변환에 실패한 작업이 있는 기업 {len(failed)}개 (처리 완료로 기록하지 않고 다음 실행에서 다시 조회)")
+        if self.http.retry_count:
+            logger.info(f"HTTP 재시도 {self.http.retry_count}회 (요청 제한 {self.http.throttle_count}회)")
+        if self.cache:
+            logger.info(f"DART 응답 캐시: 적중 {self.cache.hits}회, 미적중 {self.cache.misses}회")
+        
+        if self._speculative_pool is not None:
+            self._speculative_pool.shutdown(wait=True)
+            self._speculative_pool = None
+        
+        # 남은 데이터를 CSV 파일에 기록
         self.save_all_data_to_csv()
+        
+        # 처리한 기업과 폐지일 워터마크 갱신 (다음 증분 실행 기준)
+        # - 모든 작업이 저장됐거나 '데이터 없음'으로 확인된 기업만 처리 완료로 기록
+        # - 워터마크는 실패한 기업의 가장 이른 폐지일을 넘지 않음 (다음 증분 실행의 조회 범위에 남도록)
+        # - limit으로 일부만 처리한 실행은 워터마크를 올리지 않음 (처리하지 않은 기업을 건너뛰지 않도록)
+        if self.state:
+            processed = [c for c in companies if c.get('ticker') not in failed]
+            self.state.record_companies(processed)
+            if not limit:
+                ceiling = min(
+                    (c['delisting_date'] for c in companies if c.get('ticker') in failed and c.get('delisting_date')),
+                    default=None
+                )
+                watermark = self.state.advance_watermark(
+                    (c.get('delisting_date') for c in processed), scope, ceiling=ceiling
+                )
+                logger.info(f"폐지일 워터마크: {watermark}")
+        
+        summary = {'companies': total_count, 'succeeded': success_count, 'failed': len(failed), 'tasks': total_tasks}
+        rates = self.metrics.hit_rates()
+        logger.info(f"재무제표 구분: CFS {rates['cfs']:.1%}, OFS {rates['ofs']:.1%}, 없음 {rates['none']:.1%}")
+        self.save_run_report(summary)
+        
+        return summary
 
 def main():
     """
-    메인 실행 함수
+    메인 실행 함수 (delist_cli.py fetch와 같은 인자 사용)
+
+    python delist_data_loader.py --limit 100 --resume
     """
-    try:
-        # 데이터 로더 초기화
-        loader = DelistDataLoader()
-        
-        # 처리할 기업 수 제한 (테스트용)
-        limit_input = input("처리할 기업 수를 제한하시겠습니까? (숫자 입력 또는 엔터): ").strip()
-        limit = int(limit_input) if limit_input.isdigit() else None
-        
-        # 모든 상장 폐지 기업 처리
-        loader.process_all_delisted_companies(limit)
-        
-    except Exception as e:
-        print(f"프로그램 실행 중 오류 발생: {e}")
+    from delist_cli import main as cli_main
+
+    sys.exit(cli_main(['fetch'] + sys.argv[1:]))
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,157 @@
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# 피벗 대상 금액 컬럼
+VALUE_COLUMNS = ('this_term_amount', 'prev_term_amount')
+
+# 기본 제외 재무제표 (노트북 분석과 동일하게 현금흐름표 제외)
+DEFAULT_EXCLUDED_STATEMENTS = ('현금흐름표',)
+
+BACKENDS = ('dense', 'sparse', 'csr')
+
+
+class SparseFeatureMatrix:
+    """
+    CSR 행렬과 행/열 라벨을 묶은 희소 피처 행렬
+
+    저장되지 않은 칸은 값이 없는 계정(NaN)이며, 금액 0은 명시적으로 저장됩니다.
+    """
+
+    def __init__(self, matrix, index: pd.Index, columns: pd.Index):
+        """
+        Args:
+            matrix (scipy.sparse.csr_matrix): (기업 × 계정) 희소 행렬
+            index (pd.Index): 행 라벨
+            columns (pd.Index): 열 라벨 (account_id)
+        """
+        self.matrix = matrix
+        self.index = index
+        self.columns = columns
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    @property
+    def density(self) -> float:
+        rows, cols = self.matrix.shape
+        return self.matrix.nnz / (rows * cols) if rows and cols else 0.0
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        NaN을 채움 값으로 하는 pandas 희소 DataFrame으로 변환
+        """
+        matrix = self.matrix.tocsc()
+        return _sparse_frame(
+            matrix.indptr, matrix.indices, matrix.data, self.index, self.columns
+        )
+
+
+def _sparse_frame(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray,
+                  index: pd.Index, columns: pd.Index) -> pd.DataFrame:
+    """
+    열 단위 압축 배열(CSC)에서 NaN 채움 pandas 희소 DataFrame 생성
+
+    공개 API인 pd.arrays.SparseArray만 사용하므로 한 열 크기의 버퍼 하나를 열마다 다시 채워 넘깁니다.
+    (전체 dense 행렬은 만들지 않으며, 금액 0은 NaN이 아니므로 그대로 저장됨)
+    """
+    buffer = np.empty(len(index), dtype=np.float64)
+    arrays = {}
+    for j, column in enumerate(columns):
+        start, end = indptr[j], indptr[j + 1]
+        buffer.fill(np.nan)
+        buffer[indices[start:end]] = data[start:end]
+        arrays[column] = pd.arrays.SparseArray(buffer, fill_value=np.nan)
+    return pd.DataFrame(arrays, index=index)
+
+
+def build_feature_matrix(df: pd.DataFrame, value: str = 'this_term_amount', backend: str = 'dense',
+                         index: Union[str, List[str]] = 'ticker', columns: str = 'account_id',
+                         min_density: float = 0.0, min_count: int = 1,
+                         exclude_statements: Optional[Iterable[str]] = DEFAULT_EXCLUDED_STATEMENTS,
+                         reprt_code: Optional[str] = '11011'):
+    """
+    long 형식 재무 데이터를 (기업 × 계정) 피처 행렬로 변환
+
+    pivot_table(aggfunc='first')와 같은 값을 만들되, 값이 있는 칸만 다루므로
+    메모리와 시간이 기업 수 × 계정 수가 아니라 데이터 행 수에 비례합니다.
+
+    Args:
+        df (pd.DataFrame): delisted_financials_all 형식의 long 데이터
+        value (str): 값 컬럼 (this_term_amount 또는 prev_term_amount)
+        backend (str): 'dense'(DataFrame), 'sparse'(pandas 희소 DataFrame), 'csr'(SparseFeatureMatrix)
+        index (Union[str, List[str]]): 행 키 컬럼 (예: 'ticker' 또는 ['ticker', 'year'])
+        columns (str): 열 키 컬럼
+        min_density (float): 유지할 계정의 최소 채움 비율 (0~1)
+        min_count (int): 유지할 계정의 최소 기업 수
+        exclude_statements (Optional[Iterable[str]]): 제외할 statement_name 목록
+        reprt_code (Optional[str]): 사용할 보고서 코드 (reprt_code 컬럼이 있을 때만 적용, None이면 전체)
+
+    Returns:
+        pd.DataFrame 또는 SparseFeatureMatrix: 피처 행렬
+    """
+    if value not in VALUE_COLUMNS:
+        raise ValueError(f"value는 {VALUE_COLUMNS} 중 하나여야 합니다: {value}")
+    if backend not in BACKENDS:
+        raise ValueError(f"backend는 {BACKENDS} 중 하나여야 합니다: {backend}")
+
+    keys = [index] if isinstance(index, str) else list(index)
+
+    data = df
+    if reprt_code is not None and 'reprt_code' in data.columns:
+        data = data[data['reprt_code'].astype(str) == reprt_code]
+    if exclude_statements:
+        data = data[~data['statement_name'].isin(list(exclude_statements))]
+
+    # pivot_table의 'first'와 같이 NaN이 아닌 첫 번째 값만 사용
+    data = data[keys + [columns, value]].dropna(subset=[value])
+    data = data.drop_duplicates(subset=keys + [columns], keep='first')
+
+    # 행/열 키를 정수 코드로 변환 (정렬된 라벨 순서)
+    if len(keys) == 1:
+        row_codes, row_labels = pd.factorize(data[keys[0]], sort=True)
+        row_index = pd.Index(row_labels, name=keys[0])
+    else:
+        grouped = data.groupby(keys, sort=True)
+        row_codes = grouped.ngroup().to_numpy()
+        row_index = pd.MultiIndex.from_frame(
+            data[keys].drop_duplicates().sort_values(keys).reset_index(drop=True)
+        )
+    col_codes, col_labels = pd.factorize(data[columns], sort=True)
+    values = data[value].to_numpy(dtype=np.float64)
+
+    # 채움 비율 기준으로 계정 필터링
+    n_rows = len(row_index)
+    counts = np.bincount(col_codes, minlength=len(col_labels))
+    keep = (counts >= min_count) & (counts >= min_density * n_rows)
+    remap = np.full(len(col_labels), -1, dtype=np.int64)
+    remap[keep] = np.arange(int(keep.sum()))
+
+    col_codes = remap[col_codes]
+    selected = col_codes >= 0
+    row_codes, col_codes, values = row_codes[selected], col_codes[selected], values[selected]
+    column_index = pd.Index(np.asarray(col_labels)[keep], name=columns)
+
+    if backend == 'dense':
+        matrix = np.full((n_rows, len(column_index)), np.nan)
+        matrix[row_codes, col_codes] = values
+        return pd.DataFrame(matrix, index=row_index, columns=column_index)
+
+    # 열 기준으로 정렬해 CSC 구조(indptr, indices, data) 생성
+    order = np.lexsort((row_codes, col_codes))
+    indices = row_codes[order]
+    sorted_values = values[order]
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(col_codes, minlength=len(column_index)))])
+
+    if backend == 'sparse':
+        return _sparse_frame(indptr, indices, sorted_values, row_index, column_index)
+
+    try:
+        from scipy import sparse
+    except ImportError:
+        raise ImportError("csr backend에는 scipy가 필요합니다. pip install scipy")
+
+    matrix = sparse.csc_matrix((sorted_values, indices, indptr), shape=(n_rows, len(column_index))).tocsr()
+    return SparseFeatureMatrix(matrix, row_index, column_index)
@@ -0,0 +1,160 @@
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+# 재무 데이터 컬럼 순서 (CSV/Parquet 출력과 동일)
+# account_id는 표준 계정 ID(DELIST_ACCOUNT_TAXONOMY 사용 시), raw_account_id는 DART가 준 원본 계정 ID
+FINANCIAL_COLUMNS = [
+    'ticker', 'year', 'account_id', 'account_nm', 'account_detail',
+    'this_term_amount', 'prev_term_amount', 'statement_name', 'fs_div', 'reprt_code', 'raw_account_id'
+]
+
+# 보고서 코드가 없는 행(이전 형식 데이터)에 사용할 기본값 (사업보고서)
+DEFAULT_REPRT_CODE = '11011'
+
+# 금액 컬럼 (float64 배열로 보관)
+AMOUNT_COLUMNS = ('this_term_amount', 'prev_term_amount')
+
+
+def _parse_amount(value: Optional[str]) -> float:
+    """
+    금액 문자열 하나를 숫자로 변환 (일괄 변환 실패 시 사용하는 기존 규칙)
+    """
+    try:
+        return float(value.replace(',', '')) if value and value != '-' else 0
+    except Exception:
+        return 0
+
+
+def parse_amounts(values: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    DART 금액 문자열 목록을 float64 배열로 일괄 변환
+
+    쉼표는 제거하고, 빈 값·None·'-'는 0으로 처리합니다.
+    변환할 수 없는 값이 섞여 있으면 해당 목록만 한 항목씩 기존 규칙으로 변환합니다.
+
+    Args:
+        values (Sequence[Optional[str]]): 금액 문자열 목록
+
+    Returns:
+        np.ndarray: float64 금액 배열
+    """
+    if not values:
+        return np.zeros(0, dtype=np.float64)
+
+    cleaned = np.char.replace(np.array([v or '' for v in values], dtype=np.str_), ',', '')
+    cleaned[(cleaned == '') | (cleaned == '-')] = '0'
+
+    try:
+        return cleaned.astype(np.float64)
+    except ValueError:
+        return np.array([_parse_amount(v) for v in values], dtype=np.float64)
+
+
+class FinancialBatch:
+    """
+    재무 데이터 행 묶음을 컬럼 단위로 보관하는 배치
+
+    금액은 float64 배열, 문자열은 리스트로 보관하며
+    ticker/year/fs_div처럼 배치 안에서 같은 값은 같은 문자열 객체를 공유합니다.
+    """
+
+    def __init__(self, columns: Dict[str, Any]):
+        """
+        Args:
+            columns (Dict[str, Any]): 컬럼명 → 값 목록(리스트 또는 배열)
+        """
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns['ticker'])
+
+    @classmethod
+    def concat(cls, batches: Iterable['FinancialBatch']) -> 'FinancialBatch':
+        """
+        여러 배치를 하나로 합치기
+        """
+        batches = [batch for batch in batches if len(batch)]
+        columns = {}
+        for column in FINANCIAL_COLUMNS:
+            if column in AMOUNT_COLUMNS:
+                parts = [batch.columns[column] for batch in batches]
+                columns[column] = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float64)
+            else:
+                columns[column] = [value for batch in batches for value in batch.columns[column]]
+        return cls(columns)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> 'FinancialBatch':
+        """
+        행(dict) 목록을 배치로 변환
+        """
+        rows = list(rows)
+        columns = {}
+        for column in FINANCIAL_COLUMNS:
+            default = DEFAULT_REPRT_CODE if column == 'reprt_code' else ''
+            if column == 'raw_account_id':
+                # 원본 계정 ID가 없는 행(이전 형식 데이터)은 account_id를 그대로 사용
+                values = [row.get(column) or row.get('account_id', '') for row in rows]
+            else:
+                values = [row.get(column, default) for row in rows]
+            if column in AMOUNT_COLUMNS:
+                values = np.array(values, dtype=np.float64)
+            columns[column] = values
+        return cls(columns)
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        행(dict) 단위로 순회
+        """
+        values = [self.columns[column] for column in FINANCIAL_COLUMNS]
+        for row in zip(*values):
+            yield dict(zip(FINANCIAL_COLUMNS, row))
+
+    def to_pandas(self):
+        """
+        pandas DataFrame으로 변환 (반복 문자열 컬럼은 category)
+        """
+        import pandas as pd
+
+        df = pd.DataFrame({column: self.columns[column] for column in FINANCIAL_COLUMNS})
+        for column in ('account_id', 'statement_name', 'fs_div', 'reprt_code', 'raw_account_id'):
+            df[column] = df[column].astype('category')
+        return df
+
+
+def ingest_statement_list(ticker: str, year: str, financial_data: List[Dict[str, Any]], fs_div: str,
+                          reprt_code: str = DEFAULT_REPRT_CODE) -> FinancialBatch:
+    """
+    DART 재무제표 list 응답을 컬럼 배치로 변환
+
+    Args:
+        ticker (str): 종목 코드
+        year (str): 연도
+        financial_data (List[Dict[str, Any]]): DART fnlttSinglAcntAll list 항목
+        fs_div (str): 재무제표 구분
+        reprt_code (str): 보고서 코드
+
+    Returns:
+        FinancialBatch: 변환된 배치 (기존 행 변환 결과와 동일한 값)
+    """
+    n = len(financial_data)
+    # 기업 간에 반복되는 계정/재무제표 문자열은 intern으로 같은 객체 공유
+    intern = sys.intern
+    account_ids = [intern(item.get('account_id', '')) for item in financial_data]
+
+    return FinancialBatch({
+        'ticker': [ticker] * n,
+        'year': [year] * n,
+        'account_id': account_ids,
+        'account_nm': [item.get('account_nm', '').strip() for item in financial_data],
+        'account_detail': [intern(item.get('account_detail', '')) for item in financial_data],
+        'this_term_amount': parse_amounts([item.get('thstrm_amount', '0') for item in financial_data]),
+        'prev_term_amount': parse_amounts([item.get('frmtrm_amount', '0') for item in financial_data]),
+        'statement_name': [intern(item.get('sj_nm', '')) for item in financial_data],
+        'fs_div': [fs_div] * n,
+        'reprt_code': [reprt_code] * n,
+        # 표준 계정 ID로 바꿔도 DART가 준 account_id를 남겨 둠
+        'raw_account_id': account_ids,
+    })
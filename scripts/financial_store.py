@@ -0,0 +1,272 @@
+import os
+import sqlite3
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from financial_ingest import AMOUNT_COLUMNS, DEFAULT_REPRT_CODE, FINANCIAL_COLUMNS, FinancialBatch
+
+try:
+    import duckdb
+except ImportError:  # SQLite만 사용할 때는 필요 없음
+    duckdb = None
+
+# 저장소 엔진별 기본 파일 경로
+DEFAULT_STORE_PATHS = {
+    'sqlite': 'data/delisted_financials.sqlite3',
+    'duckdb': 'data/delisted_financials.duckdb',
+}
+
+# 조회 패턴별 인덱스: (이름, 컬럼)
+STORE_INDEXES = [
+    ('idx_financials_ticker_year', ('ticker', 'year')),
+    ('idx_financials_account_year', ('account_id', 'year')),
+    ('idx_financials_statement', ('statement_name',)),
+]
+
+# 보고서(filing) 단위 교체 키
+FILING_COLUMNS = ('ticker', 'year', 'reprt_code', 'fs_div')
+
+
+def _require_duckdb():
+    if duckdb is None:
+        raise ImportError("duckdb 저장소에는 duckdb가 필요합니다. pip install duckdb")
+
+
+class FinancialStore:
+    """
+    long 형식 재무 데이터를 인덱스와 함께 보관하는 임베디드 분석 저장소 (SQLite 또는 DuckDB)
+
+    (ticker, year), (account_id, year), statement_name 인덱스로 기업별/계정별 조회가
+    전체 스캔 없이 처리되며, 데이터는 파일에 있으므로 메모리보다 커져도 됩니다.
+    CsvBatchWriter와 같은 write_batch/write_rows/close/rows_written 인터페이스를 제공하고,
+    같은 보고서(ticker, year, reprt_code, fs_div)를 다시 저장하면 기존 행을 교체합니다.
+    """
+
+    def __init__(self, path: Optional[str] = None, engine: str = 'sqlite'):
+        """
+        Args:
+            path (Optional[str]): 저장소 파일 경로 (기본값: 엔진별 DEFAULT_STORE_PATHS)
+            engine (str): 'sqlite' 또는 'duckdb'
+        """
+        if engine not in DEFAULT_STORE_PATHS:
+            raise ValueError(f"지원하지 않는 저장소 엔진입니다: {engine}")
+
+        self.engine = engine
+        self.path = path or DEFAULT_STORE_PATHS[engine]
+        self.rows_written = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        if engine == 'duckdb':
+            _require_duckdb()
+            self._conn = duckdb.connect(self.path)
+        else:
+            self._conn = sqlite3.connect(self.path, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS financials (
+                ticker TEXT NOT NULL,
+                year INTEGER NOT NULL,
+                account_id TEXT,
+                account_nm TEXT,
+                account_detail TEXT,
+                this_term_amount DOUBLE,
+                prev_term_amount DOUBLE,
+                statement_name TEXT,
+                fs_div TEXT NOT NULL,
+                reprt_code TEXT NOT NULL,
+                raw_account_id TEXT
+            )
+            """
+        )
+        # raw_account_id 컬럼 이전에 만든 저장소는 컬럼을 추가하고 account_id로 채움
+        existing = [column[0] for column in self._conn.execute("SELECT * FROM financials LIMIT 0").description]
+        if 'raw_account_id' not in existing:
+            self._conn.execute("ALTER TABLE financials ADD COLUMN raw_account_id TEXT")
+            self._conn.execute("UPDATE financials SET raw_account_id = account_id")
+        for name, columns in STORE_INDEXES:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON financials ({', '.join(columns)})")
+        self._conn.commit()
+
+    def write_batch(self, batch: FinancialBatch):
+        """
+        배치에 포함된 보고서의 기존 행을 지우고 새 행을 한 트랜잭션으로 저장
+
+        Args:
+            batch (FinancialBatch): 재무 데이터 배치
+        """
+        self._write_batch(batch)
+
+    def _write_batch(self, batch: FinancialBatch, cleared: Optional[Set[tuple]] = None):
+        """
+        배치 저장 (cleared를 넘기면 그 안에 없는 보고서만 지우고, 지운 보고서를 cleared에 추가)
+
+        한 보고서의 행이 여러 배치로 나뉘어 들어오는 경우(CSV 청크 경계 등) 뒤 배치가
+        앞 배치에서 넣은 행을 지우지 않도록 보고서마다 한 번만 지웁니다.
+        """
+        if not len(batch):
+            return
+
+        columns = dict(batch.columns)
+        columns['year'] = [int(year) for year in columns['year']]
+        filings = sorted(set(zip(*(columns[column] for column in FILING_COLUMNS))))
+        if cleared is not None:
+            filings = [filing for filing in filings if filing not in cleared]
+            cleared.update(filings)
+        delete_sql = f"DELETE FROM financials WHERE {' AND '.join(f'{c} = ?' for c in FILING_COLUMNS)}"
+
+        if self.engine == 'duckdb':
+            frame = pd.DataFrame({column: columns[column] for column in FINANCIAL_COLUMNS})
+            self._conn.begin()
+            self._conn.executemany(delete_sql, filings)
+            self._conn.register('incoming_batch', frame)
+            column_list = ', '.join(FINANCIAL_COLUMNS)
+            self._conn.execute(f"INSERT INTO financials ({column_list}) SELECT {column_list} FROM incoming_batch")
+            self._conn.unregister('incoming_batch')
+        else:
+            values = [
+                columns[column].tolist() if column in AMOUNT_COLUMNS else columns[column]
+                for column in FINANCIAL_COLUMNS
+            ]
+            placeholders = ', '.join('?' for _ in FINANCIAL_COLUMNS)
+            self._conn.executemany(delete_sql, filings)
+            self._conn.executemany(
+                f"INSERT INTO financials ({', '.join(FINANCIAL_COLUMNS)}) VALUES ({placeholders})", zip(*values)
+            )
+
+        self._conn.commit()
+        self.rows_written += len(batch)
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]):
+        """
+        행(dict) 목록을 저장
+        """
+        self.write_batch(FinancialBatch.from_rows(rows))
+
+    def import_csv(self, path: str, chunksize: int = 50000) -> int:
+        """
+        delisted_financials_all 형식 CSV를 청크 단위로 읽어 저장 (파일 전체를 메모리에 올리지 않음)
+
+        파일에 있는 보고서의 기존 행은 교체하며, 청크 경계에 걸친 보고서도 모든 행을 저장합니다.
+
+        Args:
+            path (str): CSV 경로
+            chunksize (int): 한 번에 읽을 행 수
+
+        Returns:
+            int: 저장한 행 수
+        """
+        total = 0
+        cleared: Set[tuple] = set()
+        for chunk in pd.read_csv(path, dtype={'ticker': str, 'year': str, 'reprt_code': str}, chunksize=chunksize):
+            if 'reprt_code' not in chunk.columns:
+                chunk['reprt_code'] = DEFAULT_REPRT_CODE
+            if 'raw_account_id' not in chunk.columns:
+                chunk['raw_account_id'] = chunk['account_id']
+            chunk = chunk.fillna({c: '' for c in FINANCIAL_COLUMNS if c not in AMOUNT_COLUMNS})
+            self._write_batch(FinancialBatch({
+                column: chunk[column].to_numpy(dtype=np.float64) if column in AMOUNT_COLUMNS
+                else chunk[column].tolist()
+                for column in FINANCIAL_COLUMNS
+            }), cleared)
+            total += len(chunk)
+        return total
+
+    def _read(self, sql: str, params: List[Any]) -> pd.DataFrame:
+        if self.engine == 'duckdb':
+            return self._conn.execute(sql, params).df()
+        return pd.read_sql_query(sql, self._conn, params=params)
+
+    def query(self, tickers: Optional[Iterable[str]] = None, years: Optional[Iterable[int]] = None,
+              account_ids: Optional[Iterable[str]] = None, statement_names: Optional[Iterable[str]] = None,
+              fs_div: Optional[str] = None, reprt_code: Optional[str] = None,
+              columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        조건에 맞는 행만 DataFrame으로 조회 (지정하지 않은 조건은 적용하지 않음)
+
+        Args:
+            tickers (Optional[Iterable[str]]): 종목 코드
+            years (Optional[Iterable[int]]): 연도
+            account_ids (Optional[Iterable[str]]): 계정 ID
+            statement_names (Optional[Iterable[str]]): 재무제표명
+            fs_div (Optional[str]): 재무제표 구분 (CFS/OFS)
+            reprt_code (Optional[str]): 보고서 코드
+            columns (Optional[List[str]]): 조회할 컬럼 (기본값: 전체)
+
+        Returns:
+            pd.DataFrame: 조회 결과
+        """
+        columns = columns or FINANCIAL_COLUMNS
+        unknown = [column for column in columns if column not in FINANCIAL_COLUMNS]
+        if unknown:
+            raise ValueError(f"알 수 없는 컬럼입니다: {unknown}")
+
+        conditions, params = [], []
+        for column, values in (('ticker', tickers), ('year', years), ('account_id', account_ids),
+                               ('statement_name', statement_names)):
+            if values is None:
+                continue
+            values = [int(v) for v in values] if column == 'year' else list(values)
+            if not values:
+                return pd.DataFrame(columns=columns)
+            conditions.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        for column, value in (('fs_div', fs_div), ('reprt_code', reprt_code)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+
+        sql = f"SELECT {', '.join(columns)} FROM financials"
+        if conditions:
+            sql += f" WHERE {' AND '.join(conditions)}"
+        return self._read(sql, params)
+
+    def get_company(self, ticker: str, year: Optional[int] = None) -> pd.DataFrame:
+        """
+        기업 하나의 재무 데이터 ((ticker, year) 인덱스 사용)
+        """
+        return self.query(tickers=[ticker], years=None if year is None else [year])
+
+    def get_account(self, account_id: str, years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """
+        계정 하나의 전체 기업 값 ((account_id, year) 인덱스 사용)
+        """
+        return self.query(account_ids=[account_id], years=years)
+
+    def count(self) -> int:
+        """
+        저장된 행 수
+        """
+        return self._conn.execute("SELECT COUNT(*) FROM financials").fetchone()[0]
+
+    def close(self):
+        """
+        저장소 연결 종료
+        """
+        self._conn.close()
+
+
+def main():
+    """
+    기존 CSV로 분석 저장소 만들기
+
+    python financial_store.py [CSV 경로]  (DELIST_STORE=sqlite|duckdb, DELIST_STORE_PATH로 저장소 지정)
+    """
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else 'data/delisted_financials_all.csv'
+    engine = os.getenv('DELIST_STORE', 'sqlite') or 'sqlite'
+
+    store = FinancialStore(os.getenv('DELIST_STORE_PATH') or None, engine)
+    rows = store.import_csv(csv_path)
+    print(f"분석 저장소 저장 완료: {store.path} ({rows}개 항목, 전체 {store.count()}개)")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
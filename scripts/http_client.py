@@ -0,0 +1,132 @@
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# 재시도할 HTTP 상태 코드 (429: 요청 과다, 5xx: 일시적 서버 오류)
+RETRYABLE_HTTP_STATUS = {429, 500, 502, 503, 504}
+
+# DART 응답 본문의 상태 코드
+# 020: 요청 제한 초과, 800: 시스템 점검, 900: 정의되지 않은 오류
+DART_THROTTLE_STATUS = {'020'}
+DART_RETRYABLE_STATUS = {'020', '800', '900'}
+
+# (연결, 읽기) 기본 타임아웃(초)
+DEFAULT_TIMEOUT = (10, 60)
+
+
+class RetryingSession(requests.Session):
+    """
+    연결 풀과 keep-alive를 사용하고, 일시적 오류를 지수 백오프(full jitter)로 재시도하는 세션
+
+    네트워크 오류, 재시도 대상 HTTP 상태 코드, DART 응답 본문의
+    요청 제한/점검 상태 코드를 모두 재시도 대상으로 취급합니다.
+    요청에 limiter(TokenBucket)를 넘기면 재시도를 포함한 모든 시도 전에 토큰을 확보합니다.
+    """
+
+    def __init__(self, max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 pool_maxsize: int = 10):
+        """
+        Args:
+            max_retries (int): 최대 재시도 횟수 (최초 요청 제외)
+            backoff_base (float): 첫 재시도 대기 시간 상한(초), 재시도마다 두 배로 증가
+            backoff_max (float): 대기 시간 최대값(초)
+            pool_maxsize (int): 호스트별 연결 풀 크기 (동시 워커 수 이상 권장)
+        """
+        super().__init__()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+        # 재시도 통계
+        self._stats_lock = threading.Lock()
+        self.retry_count = 0
+        self.throttle_count = 0
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        재시도 대기 시간 계산 (Retry-After 헤더 우선)
+        """
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _dart_status(response: requests.Response) -> Optional[str]:
+        """
+        DART 형식 응답이면 본문의 status 값 반환
+
+        파싱한 본문은 응답 객체의 json()이 그대로 돌려주도록 저장해 호출한 쪽에서 다시 파싱하지 않게 합니다.
+        """
+        if 'json' not in response.headers.get('Content-Type', ''):
+            return None
+        try:
+            data = response.json()
+        except ValueError:
+            return None
+        response.json = lambda **kwargs: data
+        return data.get('status') if isinstance(data, dict) else None
+
+    def _record(self, throttled: bool):
+        with self._stats_lock:
+            self.retry_count += 1
+            if throttled:
+                self.throttle_count += 1
+
+    def request(self, method, url, limiter=None, **kwargs):
+        kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+        attempt = 0
+
+        while True:
+            # 재시도도 같은 속도 제한을 따르도록 시도마다 토큰 확보 (요청 제한 중 재시도 폭주 방지)
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                self._record(throttled=False)
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            dart_status = self._dart_status(response) if response.status_code == 200 else None
+            retryable = response.status_code in RETRYABLE_HTTP_STATUS or dart_status in DART_RETRYABLE_STATUS
+
+            if not retryable or attempt >= self.max_retries:
+                return response
+
+            throttled = response.status_code == 429 or dart_status in DART_THROTTLE_STATUS
+            self._record(throttled)
+            time.sleep(self._backoff(attempt, response.headers.get('Retry-After')))
+            attempt += 1
+
+
+def create_session(pool_maxsize: int = 10, max_retries: Optional[int] = None,
+                   backoff_base: Optional[float] = None) -> RetryingSession:
+    """
+    환경 변수 설정(HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE)을 반영한 공용 세션 생성
+
+    Args:
+        pool_maxsize (int): 호스트별 연결 풀 크기
+        max_retries (Optional[int]): 최대 재시도 횟수
+        backoff_base (Optional[float]): 첫 재시도 대기 시간 상한(초)
+
+    Returns:
+        RetryingSession: 재시도 세션
+    """
+    if max_retries is None:
+        max_retries = int(os.getenv('HTTP_MAX_RETRIES', '3'))
+    if backoff_base is None:
+        backoff_base = float(os.getenv('HTTP_BACKOFF_BASE', '0.5'))
+
+    return RetryingSession(max_retries=max_retries, backoff_base=backoff_base, pool_maxsize=pool_maxsize)
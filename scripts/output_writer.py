@@ -0,0 +1,207 @@
+import csv
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from financial_ingest import AMOUNT_COLUMNS, FINANCIAL_COLUMNS, FinancialBatch
+
+# 재무 데이터 CSV 컬럼 순서
+CSV_COLUMNS = FINANCIAL_COLUMNS
+
+
+class CsvBatchWriter:
+    """
+    재무 데이터 행을 배치 단위로 CSV 파일에 이어서 기록하는 writer
+
+    새 파일은 utf-8-sig(BOM 포함)와 헤더로 시작하고,
+    이어쓰기 모드에서는 기존 파일 뒤에 행만 추가합니다.
+    """
+
+    def __init__(self, path: str, columns: List[str] = CSV_COLUMNS, append: bool = False):
+        """
+        Args:
+            path (str): CSV 파일 경로
+            columns (List[str]): 컬럼 순서
+            append (bool): 기존 파일에 이어서 기록할지 여부
+        """
+        self.path = path
+        self.columns = columns
+        self.rows_written = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        is_new = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        if not is_new:
+            # 이전 형식 파일(raw_account_id 컬럼 없음 등)에 이어 쓸 때는 기존 헤더의 컬럼 순서를 따름
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                header = next(csv.reader(f), None) or []
+            unknown = [column for column in header if column not in columns]
+            if unknown:
+                raise ValueError(f"기존 CSV에 알 수 없는 컬럼이 있습니다: {', '.join(unknown)}")
+            self.columns = header or columns
+        self._file = open(path, 'w' if is_new else 'a', newline='', encoding='utf-8-sig' if is_new else 'utf-8')
+        self._writer = csv.writer(self._file, lineterminator='\n')
+
+        if is_new:
+            self._writer.writerow(self.columns)
+            self._file.flush()
+
+    def write_batch(self, batch: FinancialBatch):
+        """
+        컬럼 배치를 기록하고 디스크까지 반영
+
+        Args:
+            batch (FinancialBatch): 재무 데이터 배치
+        """
+        values = [
+            batch.columns[column].tolist() if column in AMOUNT_COLUMNS else batch.columns[column]
+            for column in self.columns
+        ]
+        self._writer.writerows(zip(*values))
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.rows_written += len(batch)
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]):
+        """
+        행(dict) 목록을 기록
+
+        Args:
+            rows (Iterable[Dict[str, Any]]): 재무 데이터 행
+        """
+        self.write_batch(FinancialBatch.from_rows(rows))
+
+    def position(self) -> str:
+        """
+        지금까지 기록한 위치 (체크포인트에 함께 남기는 파일 크기)
+        """
+        self._file.flush()
+        return str(os.path.getsize(self.path))
+
+    def discard_uncommitted(self, positions: List[str]) -> int:
+        """
+        마지막 체크포인트 위치 뒤에 기록된 행 삭제 (기록 후 체크포인트 전에 중단된 배치)
+
+        Args:
+            positions (List[str]): 체크포인트에 남은 기록 위치 (기록 순서)
+
+        Returns:
+            int: 삭제한 행 수
+        """
+        if not positions:
+            return 0
+
+        committed = int(positions[-1])
+        self._file.flush()
+        if os.path.getsize(self.path) <= committed:
+            return 0
+
+        with open(self.path, 'rb') as f:
+            f.seek(committed)
+            dropped = f.read().count(b'\n')
+        os.truncate(self.path, committed)
+        return dropped
+
+    def close(self):
+        """
+        파일 닫기
+        """
+        if not self._file.closed:
+            self._file.close()
+
+
+# 체크포인트 파일에서 출력 기록 위치를 남기는 줄의 접두어 (조회 작업 식별자에는 쓰이지 않음)
+POSITION_PREFIX = '@'
+
+
+class CheckpointManifest:
+    """
+    처리가 끝난 조회 작업 식별자(ticker|year|reprt_code)를 한 줄에 하나씩 기록하는 체크포인트 파일
+
+    행이 출력에 기록된 뒤에만 식별자를 추가하고, 식별자 묶음 끝에 그때의 출력 기록 위치('@위치')를 남깁니다.
+    재시작 시 manifest에 있는 작업은 건너뛰고, 마지막 위치 뒤에 기록된 행(기록 후 체크포인트 전에 중단)은
+    출력에서 지워 같은 행이 두 번 기록되지 않도록 합니다.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): manifest 파일 경로
+        """
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _read(self):
+        """
+        (완료된 작업 식별자 집합, 기록 위치 목록) 읽기
+
+        위치 줄로 끝나지 않은 마지막 식별자 묶음(기록 도중 중단)은 완료로 보지 않습니다.
+        위치 줄이 하나도 없는 이전 형식 파일은 모든 식별자를 완료로 봅니다.
+        """
+        if not os.path.exists(self.path):
+            return set(), []
+
+        completed, pending, positions = set(), [], []
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith(POSITION_PREFIX):
+                    positions.append(line[len(POSITION_PREFIX):])
+                    completed.update(pending)
+                    pending = []
+                else:
+                    pending.append(line)
+
+        if not positions:
+            completed.update(pending)
+        return completed, positions
+
+    def load(self) -> Set[str]:
+        """
+        완료된 조회 작업 식별자 읽기
+
+        Returns:
+            Set[str]: 완료된 작업 식별자(ticker|year|reprt_code) 집합
+        """
+        return self._read()[0]
+
+    def positions(self) -> List[str]:
+        """
+        체크포인트에 남은 출력 기록 위치 (기록 순서)
+        """
+        return self._read()[1]
+
+    def mark_completed(self, keys: Iterable[str], position: Optional[str] = None):
+        """
+        완료된 조회 작업 식별자와 그때의 출력 기록 위치를 한 번에 추가 기록
+
+        Args:
+            keys (Iterable[str]): 완료된 작업 식별자 목록
+            position (Optional[str]): 식별자에 해당하는 행까지 기록한 출력 위치 (writer.position())
+        """
+        lines = [f"{key}\n" for key in keys]
+        if position is not None:
+            lines.append(f"{POSITION_PREFIX}{position}\n")
+        if not lines:
+            return
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def reset(self):
+        """
+        체크포인트 초기화 (새 실행 시작)
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
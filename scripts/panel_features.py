@@ -0,0 +1,325 @@
+import argparse
+import os
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from account_taxonomy import NON_STANDARD_ACCOUNT_ID, AccountTaxonomy
+from backfill_planner import ANNUAL_REPORT
+
+# 추세 피처를 계산할 연도 수 (당해 연도 포함)
+TREND_WINDOW = 3
+
+# 기본 캐시 경로
+DEFAULT_CACHE_PATH = 'data/cache/panel_features.parquet'
+
+# (ticker, year, account_id)별 피처 컬럼
+# - amount: 당기 금액 (thstrm)
+# - prior_amount: 전기 금액 (해당 연도 보고서의 frmtrm, 없으면 전년도 보고서의 thstrm)
+# - delta / yoy_growth: 전기 대비 증감액 / 증감률 (전기 금액 절댓값 기준)
+# - trend_slope: 최근 TREND_WINDOW년 금액의 연간 기울기 (최소제곱)
+# - trend_pct: 기울기 / 기간 평균 금액 절댓값
+# - cagr: 기간 첫 해 대비 연평균 성장률 (양수 금액끼리만)
+# - trend_years: 추세 계산에 사용한 연도 수
+FEATURE_COLUMNS = [
+    'amount', 'prior_amount', 'delta', 'yoy_growth', 'trend_slope', 'trend_pct', 'cagr', 'trend_years'
+]
+
+KEY_COLUMNS = ['ticker', 'year', 'account_id']
+
+
+def prepare_panel(df: pd.DataFrame, taxonomy: Optional[AccountTaxonomy] = None) -> pd.DataFrame:
+    """
+    long 데이터를 (ticker, year, account_id)당 한 행인 패널 입력으로 정리
+
+    사업보고서만 사용하고 계정 ID를 표준 계정 ID로 통일한 뒤,
+    pivot_table(aggfunc='first')처럼 같은 키의 첫 행만 남깁니다.
+    표준 계정으로 매핑되지 않은 행은 서로 다른 계정이 한 ID로 묶여 있으므로 제외합니다.
+    """
+    if 'reprt_code' in df.columns:
+        df = df[df['reprt_code'].astype(str) == ANNUAL_REPORT]
+
+    df = (taxonomy or AccountTaxonomy()).canonicalize_frame(
+        df[['ticker', 'year', 'account_id', 'account_nm', 'statement_name', 'this_term_amount', 'prev_term_amount']]
+    )
+    df = df[df['account_id'] != NON_STANDARD_ACCOUNT_ID]
+    panel = df[KEY_COLUMNS + ['this_term_amount', 'prev_term_amount']].dropna(
+        subset=['this_term_amount', 'prev_term_amount'], how='all'
+    )
+    panel = panel.drop_duplicates(subset=KEY_COLUMNS, keep='first')
+    return panel.astype({'ticker': str, 'year': np.int64}).reset_index(drop=True)
+
+
+def filing_fingerprints(panel: pd.DataFrame) -> pd.Series:
+    """
+    (ticker, year) 공시별 내용 지문 (행 순서와 무관, 금액/계정이 바뀌면 달라짐)
+    """
+    hashes = pd.util.hash_pandas_object(
+        panel[['account_id', 'this_term_amount', 'prev_term_amount']], index=False
+    )
+    # uint64 합은 2^64를 넘으면 순환하므로 순서와 관계없는 지문으로 사용 가능
+    return hashes.groupby([panel['ticker'], panel['year']]).sum().rename('fingerprint')
+
+
+def _lag_lookup(keys: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    정렬된 키 배열에서 targets 위치 (없으면 -1)
+    """
+    positions = np.searchsorted(keys, targets)
+    positions = np.minimum(positions, len(keys) - 1)
+    return np.where(keys[positions] == targets, positions, -1)
+
+
+def compute_panel_features(panel: pd.DataFrame, window: int = TREND_WINDOW) -> pd.DataFrame:
+    """
+    (ticker, account_id) 시계열 피처를 그룹 루프 없이 한 번에 계산
+
+    (기업, 계정) 쌍과 연도를 정수 키 하나로 인코딩해 정렬해 두고, k년 전 값은
+    키 - k를 searchsorted로 찾아 가져옵니다. 빠진 연도가 있어도 연도 기준으로 정확히
+    맞춰지며, 전년도 보고서가 없으면 해당 연도 보고서의 전기 금액(frmtrm)으로 채웁니다.
+
+    Args:
+        panel (pd.DataFrame): prepare_panel 결과
+        window (int): 추세 계산 연도 수 (2 이상)
+
+    Returns:
+        pd.DataFrame: ticker, year, account_id, FEATURE_COLUMNS
+    """
+    if window < 2:
+        raise ValueError(f"추세 계산 연도 수는 2 이상이어야 합니다: {window}")
+    if panel.empty:
+        return pd.DataFrame(columns=KEY_COLUMNS + FEATURE_COLUMNS)
+
+    ticker_codes, _ = pd.factorize(panel['ticker'])
+    account_codes, account_labels = pd.factorize(panel['account_id'])
+    years = panel['year'].to_numpy(dtype=np.int64)
+    min_year = years.min()
+    span = int(years.max() - min_year) + window
+
+    # 키 = (기업, 계정) 쌍 번호 × 연도 폭 + 연도 오프셋 (쌍 안에서 연도 순 정렬)
+    keys = (ticker_codes.astype(np.int64) * len(account_labels) + account_codes) * span + (years - min_year)
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    current = panel['this_term_amount'].to_numpy(dtype=np.float64)[order]
+    reported_prior = panel['prev_term_amount'].to_numpy(dtype=np.float64)[order]
+    offsets = years[order] - min_year
+
+    # lags[:, k] = k년 전 금액 (그 해 보고서의 thstrm, 없으면 다음 해 보고서의 frmtrm)
+    lags = np.full((len(keys), window), np.nan)
+    lags[:, 0] = current
+    previous_reported = reported_prior
+    for k in range(1, window):
+        positions = _lag_lookup(keys, keys - k)
+        positions[offsets < k] = -1
+        found = positions >= 0
+        lag = np.where(found, current[np.maximum(positions, 0)], np.nan)
+        lags[:, k] = np.where(np.isnan(lag), previous_reported, lag)
+
+        # 다음 단계의 대체값: (k)년 전 보고서의 frmtrm
+        previous_reported = np.where(found, reported_prior[np.maximum(positions, 0)], np.nan)
+
+    # 전기 금액은 같은 해 보고서의 frmtrm(재작성 반영)을 우선 사용
+    prior = np.where(np.isnan(reported_prior), lags[:, 1], reported_prior)
+    delta = current - prior
+    with np.errstate(divide='ignore', invalid='ignore'):
+        yoy_growth = np.where(prior != 0, delta / np.abs(prior), np.nan)
+
+    # 최소제곱 기울기: x = 0(당해), -1, -2, ... 중 값이 있는 점만 사용
+    x = -np.arange(window, dtype=np.float64)
+    present = ~np.isnan(lags)
+    counts = present.sum(axis=1)
+    filled = np.where(present, lags, 0.0)
+    x_present = np.where(present, x, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_mean = x_present.sum(axis=1) / counts
+        y_mean = filled.sum(axis=1) / counts
+        dx = np.where(present, x - x_mean[:, np.newaxis], 0.0)
+        dy = np.where(present, lags - y_mean[:, np.newaxis], 0.0)
+        slope = (dx * dy).sum(axis=1) / (dx * dx).sum(axis=1)
+        slope = np.where(counts >= 2, slope, np.nan)
+        scale = np.where(present, np.abs(lags), 0.0).sum(axis=1) / counts
+        trend_pct = np.where(scale > 0, slope / scale, np.nan)
+
+        # 기간 안에서 가장 오래된 값과 당해 값의 연평균 성장률
+        oldest = window - 1 - np.argmax(present[:, ::-1], axis=1)
+        start = lags[np.arange(len(lags)), oldest]
+        cagr = np.where((oldest > 0) & (start > 0) & (current > 0),
+                        np.power(current / start, 1.0 / np.maximum(oldest, 1)) - 1, np.nan)
+
+    features = panel[KEY_COLUMNS].iloc[order].reset_index(drop=True)
+    features['amount'] = current
+    features['prior_amount'] = prior
+    features['delta'] = delta
+    features['yoy_growth'] = yoy_growth
+    features['trend_slope'] = slope
+    features['trend_pct'] = trend_pct
+    features['cagr'] = cagr
+    features['trend_years'] = counts.astype(np.int64)
+    return features
+
+
+def _shift_keys(keys: pd.DataFrame, shifts: Iterable[int]) -> pd.DataFrame:
+    """
+    (ticker, year) 키를 여러 연도만큼 옮긴 합집합
+    """
+    shifted = [keys.assign(year=keys['year'] + shift) for shift in shifts]
+    return pd.concat(shifted, ignore_index=True).drop_duplicates()
+
+
+class PanelFeatureCache:
+    """
+    (ticker, year)별 패널 피처 캐시 (Parquet)
+
+    공시 지문이 그대로인 (ticker, year)는 캐시를 재사용하고, 새로 들어오거나 바뀐
+    공시와 그 공시를 추세 기간에 포함하는 이후 연도만 다시 계산합니다.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, window: int = TREND_WINDOW):
+        """
+        Args:
+            path (str): 캐시 파일 경로
+            window (int): 추세 계산 연도 수 (캐시와 다르면 전체 재계산)
+        """
+        self.path = path
+        self.window = window
+        self.last_stats: Dict[str, int] = {}
+
+    def load(self) -> pd.DataFrame:
+        """
+        캐시된 피처 (없거나 추세 기간이 다르면 빈 DataFrame)
+        """
+        if not self.path or not os.path.exists(self.path):
+            return pd.DataFrame()
+        cached = pd.read_parquet(self.path)
+        if cached.empty or int(cached['trend_window'].iloc[0]) != self.window:
+            return pd.DataFrame()
+        return cached
+
+    def save(self, features: pd.DataFrame):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        features.assign(trend_window=np.int8(self.window)).to_parquet(temp_path, index=False)
+        os.replace(temp_path, self.path)
+
+    def update(self, panel: pd.DataFrame) -> pd.DataFrame:
+        """
+        패널 입력 전체에 대한 피처 (바뀐 공시 부분만 다시 계산해 캐시 갱신)
+
+        Args:
+            panel (pd.DataFrame): prepare_panel 결과
+
+        Returns:
+            pd.DataFrame: ticker, year, account_id, FEATURE_COLUMNS, fingerprint
+        """
+        fingerprints = filing_fingerprints(panel).reset_index()
+        cached = self.load()
+
+        removed = 0
+        if cached.empty:
+            affected = fingerprints[['ticker', 'year']]
+            reused = cached
+        else:
+            cached_prints = cached.drop_duplicates(['ticker', 'year'])[['ticker', 'year', 'fingerprint']]
+            joined = fingerprints.merge(cached_prints, on=['ticker', 'year'], how='outer',
+                                        suffixes=('', '_cached'), indicator=True)
+            changed = joined[(joined['_merge'] != 'both') | (joined['fingerprint'] != joined['fingerprint_cached'])]
+            removed = int((changed['_merge'] == 'right_only').sum())
+
+            # 바뀐(추가/수정/삭제) 공시를 추세 기간에 포함하는 연도까지 다시 계산
+            affected = _shift_keys(changed[['ticker', 'year']], range(self.window))
+            affected = affected.merge(fingerprints[['ticker', 'year']], on=['ticker', 'year'])
+
+            current_keys = fingerprints[['ticker', 'year']].assign(_current=True)
+            reused = cached.merge(current_keys, on=['ticker', 'year'])
+            reused = reused.merge(affected.assign(_affected=True), on=['ticker', 'year'], how='left')
+            reused = reused[reused['_affected'].isna()].drop(columns=['_current', '_affected'])
+
+        # 다시 계산할 연도의 추세 기간에 해당하는 입력만 사용
+        needed = _shift_keys(affected, range(0, -self.window, -1))
+        subset = panel.merge(needed, on=['ticker', 'year'])
+        recomputed = compute_panel_features(subset, self.window).merge(affected, on=['ticker', 'year'])
+        recomputed = recomputed.merge(fingerprints, on=['ticker', 'year'])
+
+        columns = KEY_COLUMNS + FEATURE_COLUMNS + ['fingerprint']
+        parts = [frame[columns] for frame in (reused, recomputed) if not frame.empty]
+        features = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=columns)
+        features = features.sort_values(KEY_COLUMNS, kind='stable').reset_index(drop=True)
+
+        self.last_stats = {
+            'filings': len(fingerprints),
+            'recomputed_filings': len(affected),
+            'reused_filings': len(fingerprints) - len(affected),
+            'removed_filings': removed,
+            'rows': len(features),
+        }
+        # 바뀐 공시가 없으면 캐시 파일을 다시 쓰지 않음
+        if self.path and (len(affected) or removed or cached.empty):
+            self.save(features)
+        return features
+
+
+def build_panel_features(df: pd.DataFrame, cache: Optional[PanelFeatureCache] = None,
+                         taxonomy: Optional[AccountTaxonomy] = None,
+                         window: int = TREND_WINDOW) -> pd.DataFrame:
+    """
+    long 재무 데이터 → (ticker, year, account_id)별 패널 피처
+
+    Args:
+        df (pd.DataFrame): delisted_financials_all 형식의 long 데이터
+        cache (Optional[PanelFeatureCache]): 캐시 (없으면 전체 계산)
+        taxonomy (Optional[AccountTaxonomy]): 계정 ID 정규화 색인 (기본값: 기본 계정명 매핑)
+        window (int): 추세 계산 연도 수 (cache가 있으면 cache 설정 사용)
+
+    Returns:
+        pd.DataFrame: ticker, year, account_id, FEATURE_COLUMNS
+    """
+    panel = prepare_panel(df, taxonomy)
+    if cache is None:
+        return compute_panel_features(panel, window)
+    return cache.update(panel).drop(columns=['fingerprint'])
+
+
+def to_wide(features: pd.DataFrame, feature_columns: Iterable[str] = ('yoy_growth', 'trend_pct'),
+            accounts: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    패널 피처를 (ticker, year) × '계정__피처' 행렬로 변환 (모델 입력용)
+    """
+    if accounts is not None:
+        features = features[features['account_id'].isin(list(accounts))]
+    wide = features.pivot(index=['ticker', 'year'], columns='account_id', values=list(feature_columns))
+    wide.columns = [f"{account}__{feature}" for feature, account in wide.columns]
+    return wide
+
+
+def main():
+    """
+    패널 피처 생성
+
+    python panel_features.py data/delisted_financials_all.csv --output data/panel_features.csv
+    (DELIST_PANEL_CACHE로 캐시 경로 지정, 빈 값이면 캐시 없이 전체 계산)
+    """
+    parser = argparse.ArgumentParser(description='계정별 전년 대비/다년 추세 패널 피처 생성')
+    parser.add_argument('input', nargs='?', default='data/delisted_financials_all.csv', help='long 형식 재무 데이터 CSV')
+    parser.add_argument('--output', default='data/panel_features.csv', help='결과 CSV 경로')
+    parser.add_argument('--window', type=int, default=TREND_WINDOW, help='추세 계산 연도 수')
+    args = parser.parse_args()
+
+    from account_taxonomy import load_taxonomy
+
+    df = pd.read_csv(args.input, dtype={'ticker': str, 'reprt_code': str})
+    taxonomy = load_taxonomy(os.getenv('DELIST_ACCOUNT_TAXONOMY', 'data/account_taxonomy.tsv'))
+    cache_path = os.getenv('DELIST_PANEL_CACHE', DEFAULT_CACHE_PATH)
+    cache = PanelFeatureCache(cache_path, args.window) if cache_path else None
+
+    features = build_panel_features(df, cache, taxonomy, args.window)
+    features.to_csv(args.output, index=False, encoding='utf-8-sig')
+    print(f"패널 피처 저장 완료: {args.output} ({len(features)}개 행)")
+    if cache is not None:
+        print(f"캐시: {cache.last_stats}")
+
+
+if __name__ == "__main__":
+    main()
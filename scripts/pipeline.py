@@ -0,0 +1,242 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Protocol, Sequence
+
+# 큐 대기 중 중단 여부를 확인하는 간격(초)
+POLL_INTERVAL = 0.1
+
+# 스테이지 입력이 끝났음을 알리는 표시
+_DONE = object()
+
+
+class BatchSink(Protocol):
+    """
+    파이프라인 마지막 단계에 연결하는 출력 인터페이스
+
+    CsvBatchWriter, ColumnarBatchWriter(Parquet/Arrow), PostgresCopyWriter, PostgrestUpsertWriter,
+    FinancialStore가 모두 같은 인터페이스를 제공하므로 그대로 연결할 수 있습니다.
+    """
+
+    rows_written: int
+
+    def write_batch(self, batch) -> None:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class PipelineStage(NamedTuple):
+    """
+    파이프라인 중간 단계 하나
+    """
+    name: str
+    func: Callable[[Any], Any]  # 앞 단계 결과 하나 → 다음 단계 입력 하나
+    workers: int = 1
+
+
+class StagePipeline:
+    """
+    제한된 큐로 연결한 다단계 처리 파이프라인
+
+    - 단계마다 워커 스레드 수를 따로 정하고, 단계 사이는 크기가 제한된 큐로 연결합니다.
+    - 동시에 처리 중인 항목 수(max_in_flight)를 넘으면 입력을 멈추므로(backpressure)
+      느린 단계가 있어도 메모리에 쌓이는 항목 수가 일정합니다.
+    - 마지막 sink는 run을 호출한 스레드 하나에서 실행되며, ordered=True면 입력 순서대로 받습니다.
+    - 한 단계에서 예외가 나면 모든 단계를 멈추고 run에서 같은 예외를 다시 발생시킵니다.
+    """
+
+    def __init__(self, stages: Sequence[PipelineStage], sink: Callable[[Any], None],
+                 max_in_flight: int = 64, ordered: bool = True):
+        """
+        Args:
+            stages (Sequence[PipelineStage]): 중간 단계 목록 (실행 순서)
+            sink (Callable[[Any], None]): 마지막 단계 결과를 받는 함수 (단일 스레드)
+            max_in_flight (int): 입력 후 sink까지 끝나지 않은 최대 항목 수
+            ordered (bool): sink에 입력 순서대로 전달할지 여부
+        """
+        if not stages:
+            raise ValueError("파이프라인 단계가 없습니다.")
+        if any(stage.workers < 1 for stage in stages):
+            raise ValueError("단계 워커 수는 1 이상이어야 합니다.")
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight는 1 이상이어야 합니다: {max_in_flight}")
+
+        self.stages = list(stages)
+        self.sink = sink
+        self.max_in_flight = max_in_flight
+        self.ordered = ordered
+
+        # 큐 크기를 max_in_flight로 두면 입력 제한만으로 put이 막히지 않아
+        # 순서 맞추기 중인 sink와 앞 단계가 서로 기다리는 교착이 생기지 않음
+        self._queues = [queue.Queue(maxsize=max_in_flight) for _ in range(len(self.stages) + 1)]
+        self._slots = threading.Semaphore(max_in_flight)
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+        self._remaining = [stage.workers for stage in self.stages]
+        self._busy = {stage.name: 0.0 for stage in self.stages}
+        self._items = {stage.name: 0 for stage in self.stages}
+        self._backpressure = 0.0
+        self._sink_busy = 0.0
+
+    def _fail(self, error: BaseException):
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._stop.set()
+
+    def _put(self, target: queue.Queue, item: Any) -> bool:
+        """
+        중단되지 않는 동안 큐에 넣기 (중단되면 False)
+        """
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue) -> Any:
+        """
+        중단되지 않는 동안 큐에서 꺼내기 (중단되면 _DONE)
+        """
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, items: Iterable[Any]):
+        """
+        입력 항목을 (순번, 값)으로 첫 단계에 넣기 (처리 중 항목이 가득 차면 대기)
+        """
+        try:
+            for seq, item in enumerate(items):
+                start = time.perf_counter()
+                while not self._slots.acquire(timeout=POLL_INTERVAL):
+                    if self._stop.is_set():
+                        return
+                self._backpressure += time.perf_counter() - start
+                if not self._put(self._queues[0], (seq, item)):
+                    return
+        except BaseException as e:
+            self._fail(e)
+            return
+
+        for _ in range(self.stages[0].workers):
+            self._put(self._queues[0], _DONE)
+
+    def _work(self, index: int):
+        """
+        단계 워커: 입력 큐에서 꺼내 처리하고 다음 큐로 넘기기
+        """
+        stage = self.stages[index]
+        source, target = self._queues[index], self._queues[index + 1]
+
+        while True:
+            item = self._get(source)
+            if item is _DONE:
+                break
+            seq, value = item
+            start = time.perf_counter()
+            try:
+                result = stage.func(value)
+            except BaseException as e:
+                self._fail(e)
+                return
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._busy[stage.name] += elapsed
+                self._items[stage.name] += 1
+            if not self._put(target, (seq, result)):
+                return
+
+        # 이 단계의 마지막 워커가 다음 단계에 종료 표시 전달
+        with self._lock:
+            self._remaining[index] -= 1
+            last = self._remaining[index] == 0
+        if last and not self._stop.is_set():
+            following = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            for _ in range(following):
+                self._put(target, _DONE)
+
+    def _deliver(self, value: Any):
+        start = time.perf_counter()
+        self.sink(value)
+        self._sink_busy += time.perf_counter() - start
+        self._slots.release()
+
+    def run(self, items: Iterable[Any]) -> int:
+        """
+        모든 입력을 처리하고 sink에 전달한 항목 수 반환
+        """
+        threads = [threading.Thread(target=self._feed, args=(items,), name='pipeline-feed', daemon=True)]
+        for index, stage in enumerate(self.stages):
+            threads.extend(
+                threading.Thread(target=self._work, args=(index,), name=f'pipeline-{stage.name}-{i}', daemon=True)
+                for i in range(stage.workers)
+            )
+        for thread in threads:
+            thread.start()
+
+        delivered = 0
+        pending: Dict[int, Any] = {}
+        next_seq = 0
+        try:
+            while True:
+                item = self._get(self._queues[-1])
+                if item is _DONE:
+                    break
+                seq, value = item
+                if not self.ordered:
+                    self._deliver(value)
+                    delivered += 1
+                    continue
+
+                # 앞선 항목이 아직 처리 중이면 보관했다가 순서대로 전달 (최대 max_in_flight개)
+                pending[seq] = value
+                while next_seq in pending:
+                    self._deliver(pending.pop(next_seq))
+                    delivered += 1
+                    next_seq += 1
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            raise self._error
+        return delivered
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        단계별 처리 항목 수/작업 시간(워커 합계)과 입력 대기(backpressure) 시간
+        """
+        with self._lock:
+            stages = {
+                stage.name: {
+                    'workers': stage.workers,
+                    'items': self._items[stage.name],
+                    'busy_sec': round(self._busy[stage.name], 3),
+                }
+                for stage in self.stages
+            }
+        stages['sink'] = {'workers': 1, 'busy_sec': round(self._sink_busy, 3)}
+        return {'stages': stages, 'backpressure_sec': round(self._backpressure, 3)}
+
+
+def run_pipeline(items: Iterable[Any], stages: Sequence[PipelineStage], sink: Callable[[Any], None],
+                 max_in_flight: int = 64, ordered: bool = True) -> Dict[str, Any]:
+    """
+    StagePipeline을 만들어 한 번 실행하고 처리 통계 반환
+    """
+    pipeline = StagePipeline(stages, sink, max_in_flight, ordered)
+    delivered = pipeline.run(items)
+    return {'delivered': delivered, **pipeline.stats()}
+
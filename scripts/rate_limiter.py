@@ -0,0 +1,56 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    초당 요청 수 기준의 스레드 안전 토큰 버킷
+
+    여러 워커 스레드가 하나의 버킷을 공유하면 전체 호출 속도가
+    rate(요청/초)를 넘지 않습니다. capacity만큼의 순간 버스트를 허용합니다.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate (float): 초당 허용 요청 수
+            capacity (Optional[float]): 최대 버스트 크기 (기본값: max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다.")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        토큰을 확보할 때까지 대기
+
+        Args:
+            tokens (float): 소비할 토큰 수
+
+        Returns:
+            float: 대기한 시간(초)
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                wait_time = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait_time)
+            waited += wait_time
@@ -0,0 +1,234 @@
+import os
+import sys
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from account_taxonomy import BALANCE_SHEET, CASH_FLOW, INCOME_STATEMENT, AccountTaxonomy
+from backfill_planner import ANNUAL_REPORT
+from db_writer import upsert_rows
+from http_client import create_session
+
+# .env 파일 로드
+load_dotenv()
+
+# 비율 계산 입력 항목: (표준 계정 ID, 허용 재무제표)
+# ifrs_/ifrs-full_ 표기 차이와 표준계정코드 미사용 행은 AccountTaxonomy에서 미리 통일됨
+RATIO_INPUTS = {
+    'assets': ('ifrs-full_Assets', BALANCE_SHEET),
+    'liabilities': ('ifrs-full_Liabilities', BALANCE_SHEET),
+    'equity': ('ifrs-full_Equity', BALANCE_SHEET),
+    'current_assets': ('ifrs-full_CurrentAssets', BALANCE_SHEET),
+    'current_liabilities': ('ifrs-full_CurrentLiabilities', BALANCE_SHEET),
+    'pretax_income': ('ifrs-full_ProfitLossBeforeTax', INCOME_STATEMENT),
+    'net_income': ('ifrs-full_ProfitLoss', INCOME_STATEMENT),
+    'operating_income': ('dart_OperatingIncomeLoss', INCOME_STATEMENT),
+    'operating_cash_flow': ('ifrs-full_CashFlowsFromUsedInOperatingActivities', CASH_FLOW),
+}
+
+# 앱(FinancialRatios)에서 사용하는 비율 컬럼
+RATIO_COLUMNS = [
+    'debt_ratio', 'current_ratio', 'equity_ratio',
+    'pretax_income_to_total_assets', 'roe', 'operating_margin_on_total_assets'
+]
+
+def extract_inputs(df: pd.DataFrame, value: str = 'this_term_amount',
+                   taxonomy: Optional[AccountTaxonomy] = None) -> pd.DataFrame:
+    """
+    long 데이터에서 (ticker, year)별 비율 계산 입력 항목을 한 번에 추출
+
+    계정 ID를 먼저 표준 계정 ID로 통일하므로 항목마다 표준 계정 ID 하나만 찾습니다.
+    (정규화 이전에 저장된 데이터도 같은 결과가 나오도록 여기서 한 번 더 적용)
+
+    Args:
+        df (pd.DataFrame): delisted_financials_all 형식의 long 데이터
+        value (str): 사용할 금액 컬럼
+        taxonomy (Optional[AccountTaxonomy]): 계정 ID 정규화 색인 (기본값: 기본 계정명 매핑)
+
+    Returns:
+        pd.DataFrame: (ticker, year) 인덱스, 입력 항목 컬럼
+    """
+    lookup = pd.DataFrame([
+        {'account_id': account_id, 'statement_name': statement, 'item': item}
+        for item, (account_id, statements) in RATIO_INPUTS.items()
+        for statement in statements
+    ])
+
+    # 분기/반기 보고서가 섞여 있으면 사업보고서만 사용
+    if 'reprt_code' in df.columns:
+        df = df[df['reprt_code'].astype(str) == ANNUAL_REPORT]
+
+    df = (taxonomy or AccountTaxonomy()).canonicalize_frame(
+        df[['ticker', 'year', 'account_id', 'account_nm', 'statement_name', value]]
+    )
+    matched = df.merge(lookup, on=['account_id', 'statement_name'], how='inner')
+    matched = matched.drop_duplicates(subset=['ticker', 'year', 'item'], keep='first')
+
+    inputs = matched.pivot(index=['ticker', 'year'], columns='item', values=value)
+    return inputs.reindex(columns=list(RATIO_INPUTS))
+
+
+def _safe_divide(numerator: pd.Series, denominator: pd.Series, scale: float = 1.0) -> pd.Series:
+    result = numerator / denominator.where(denominator != 0) * scale
+    return result.replace([np.inf, -np.inf], np.nan)
+
+
+def compute_ratios(df: pd.DataFrame, value: str = 'this_term_amount') -> pd.DataFrame:
+    """
+    모든 (ticker, year)의 재무비율을 벡터 연산으로 계산
+
+    - debt_ratio: 부채총계 / 자산총계 × 100
+    - current_ratio: 유동자산 / 유동부채 (배수)
+    - equity_ratio: 자본총계 / 자산총계 × 100
+    - pretax_income_to_total_assets: 법인세차감전순이익 / 자산총계 × 100
+    - roe: 당기순이익 / 자본총계 × 100
+    - operating_margin_on_total_assets: 영업이익 / 자산총계 × 100
+
+    Args:
+        df (pd.DataFrame): delisted_financials_all 형식의 long 데이터
+        value (str): 사용할 금액 컬럼
+
+    Returns:
+        pd.DataFrame: ticker, year, 비율 컬럼, operating_cash_flow
+    """
+    inputs = extract_inputs(df, value)
+
+    ratios = pd.DataFrame(index=inputs.index)
+    ratios['debt_ratio'] = _safe_divide(inputs['liabilities'], inputs['assets'], 100)
+    ratios['current_ratio'] = _safe_divide(inputs['current_assets'], inputs['current_liabilities'])
+    ratios['equity_ratio'] = _safe_divide(inputs['equity'], inputs['assets'], 100)
+    ratios['pretax_income_to_total_assets'] = _safe_divide(inputs['pretax_income'], inputs['assets'], 100)
+    ratios['roe'] = _safe_divide(inputs['net_income'], inputs['equity'], 100)
+    ratios['operating_margin_on_total_assets'] = _safe_divide(inputs['operating_income'], inputs['assets'], 100)
+    ratios['operating_cash_flow'] = inputs['operating_cash_flow']
+
+    return ratios.reset_index()
+
+
+def grade_risk(ratios: pd.DataFrame) -> pd.DataFrame:
+    """
+    src/utils/financialAnalysis.ts의 assessRisk와 같은 기준으로 위험 점수와 등급을 일괄 계산
+
+    assessRisk처럼 debt/current/equity 비율은 0 또는 값 없음이면 평가하지 않고,
+    ROA(pretax_income_to_total_assets)는 값이 있을 때만 평가합니다.
+
+    Args:
+        ratios (pd.DataFrame): compute_ratios 결과
+
+    Returns:
+        pd.DataFrame: risk_score, risk_level 컬럼이 추가된 데이터
+    """
+    result = ratios.copy()
+    debt = result['debt_ratio'].fillna(0)
+    current = result['current_ratio'].fillna(0)
+    equity = result['equity_ratio'].fillna(0)
+    roa = result['pretax_income_to_total_assets']
+    cash_flow = result['operating_cash_flow']
+
+    score = np.zeros(len(result), dtype=np.int64)
+    score += np.select([debt > 70, debt > 50], [30, 15], 0)
+    score += np.select([(current != 0) & (current < 1.0), (current != 0) & (current < 1.5)], [25, 10], 0)
+    score += np.select([(equity != 0) & (equity < 30), (equity != 0) & (equity < 50)], [20, 10], 0)
+    score += np.select([roa.notna() & (roa < 0), roa.notna() & (roa < 3)], [20, 5], 0)
+    score += np.where(cash_flow.notna() & (cash_flow < 0), 15, 0)
+
+    result['risk_score'] = score
+    result['risk_level'] = np.select([score >= 60, score >= 30], ['danger', 'caution'], 'safe')
+    return result
+
+
+def _to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    DataFrame을 JSON 직렬화 가능한 레코드로 변환 (NaN → None)
+    """
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+
+def build_ratio_rows(graded: pd.DataFrame, year: int) -> List[Dict[str, Any]]:
+    """
+    {year}_ratio 테이블 행 생성 (ticker별 해당 연도 비율)
+    """
+    rows = graded[graded['year'] == year][['ticker'] + RATIO_COLUMNS]
+    return _to_records(rows)
+
+
+def build_company_risk_rows(graded: pd.DataFrame, year: int,
+                            company_names: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    company_risks 테이블 행 생성 (CompanyRiskData 형식)
+    """
+    company_names = company_names or {}
+    rows = graded[graded['year'] == year]
+    analysis_date = date.today().isoformat()
+
+    financial_data = _to_records(rows[RATIO_COLUMNS + ['operating_cash_flow']])
+    return [
+        {
+            'company_name': company_names.get(ticker, ticker),
+            'company_code': ticker,
+            'risk_score': int(score),
+            'risk_level': level,
+            'analysis_date': analysis_date,
+            'financial_data': {'year': year, **data},
+        }
+        for ticker, score, level, data in zip(rows['ticker'], rows['risk_score'], rows['risk_level'], financial_data)
+    ]
+
+
+def upload_ratios(graded: pd.DataFrame, year: int, ticker_info_path: str = 'data/ticker_info_rows.csv') -> Dict[str, int]:
+    """
+    계산된 비율/위험도를 {year}_ratio, company_risks 테이블에 일괄 저장
+
+    Args:
+        graded (pd.DataFrame): grade_risk 결과
+        year (int): 저장할 기준 연도
+        ticker_info_path (str): 기업명 조회용 ticker_info 스냅샷 CSV (없으면 기업명 생략)
+
+    Returns:
+        Dict[str, int]: 테이블별 저장 행 수
+    """
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_ANON_KEY')
+    if not supabase_url or not supabase_key:
+        raise ValueError("Supabase URL과 API 키가 필요합니다. .env 파일을 확인해주세요.")
+
+    # ticker → 기업명 (ticker_info 스냅샷이 있으면 사용)
+    company_names = {}
+    if os.path.exists(ticker_info_path):
+        ticker_info = pd.read_csv(ticker_info_path, dtype={'ticker': str})
+        company_names = dict(zip(ticker_info['ticker'], ticker_info['corp_name']))
+
+    session = create_session()
+    return {
+        f"{year}_ratio": upsert_rows(session, supabase_url, supabase_key, f"{year}_ratio",
+                                     build_ratio_rows(graded, year), on_conflict='ticker'),
+        'company_risks': upsert_rows(session, supabase_url, supabase_key, 'company_risks',
+                                     build_company_risk_rows(graded, year, company_names),
+                                     on_conflict='company_code'),
+    }
+
+
+def main():
+    """
+    CSV에서 전체 비율/위험도를 계산하고, --upload 지정 시 Supabase에 일괄 저장
+    """
+    csv_path = os.getenv('DELIST_OUTPUT_PATH', 'data/delisted_financials_all.csv')
+    year = int(os.getenv('RATIO_YEAR', '2024'))
+
+    df = pd.read_csv(csv_path, dtype={'ticker': str})
+    graded = grade_risk(compute_ratios(df))
+    print(f"재무비율 계산 완료: {len(graded)}개 (ticker, year)")
+    print(graded['risk_level'].value_counts().to_string())
+
+    if '--upload' not in sys.argv[1:]:
+        return
+
+    for table, saved in upload_ratios(graded, year).items():
+        print(f"{table} 저장 완료 ({saved}개)")
+
+
+if __name__ == "__main__":
+    main()
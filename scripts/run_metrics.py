@@ -0,0 +1,219 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+# 지연 시간 히스토그램 버킷 상한(초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 로더 처리 단계
+STAGES = ('supabase_read', 'dart_cfs', 'dart_ofs', 'transform', 'write', 'db_write', 'store_write', 'sink_write')
+
+
+# get_logger로 만든 logger 이름 (set_log_level에서 한꺼번에 수준 변경)
+_LOGGER_NAMES = set()
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    DELIST_LOG_LEVEL(기본 INFO) 수준으로 stdout에 메시지만 출력하는 logger
+
+    DEBUG는 기업/작업별 상세 출력, INFO는 실행 요약, WARNING 이상은 문제 상황만 출력합니다.
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(os.getenv('DELIST_LOG_LEVEL', 'INFO').upper())
+        logger.propagate = False
+        _LOGGER_NAMES.add(name)
+    return logger
+
+
+def set_log_level(level: str):
+    """
+    이미 만든 logger와 이후에 만들 logger의 출력 수준 변경
+    """
+    os.environ['DELIST_LOG_LEVEL'] = level.upper()
+    for name in _LOGGER_NAMES:
+        logging.getLogger(name).setLevel(level.upper())
+
+
+class Histogram:
+    """
+    누적 버킷 히스토그램 (Prometheus histogram과 같은 구조)
+
+    관측값을 모두 보관하지 않으므로 긴 실행에서도 메모리가 일정하며,
+    분위수는 버킷 경계 사이를 선형 보간한 근사값입니다.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        q 분위수 근사값 (0~1)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        cumulative = 0
+        lower = 0.0
+        for i, count in enumerate(self.counts):
+            upper = self.buckets[i] if i < len(self.buckets) else self.max
+            if count and cumulative + count >= rank:
+                return min(lower + (upper - lower) * (rank - cumulative) / count, self.max)
+            cumulative += count
+            lower = upper
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum_sec': round(self.sum, 6),
+            'mean_ms': round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.5) * 1000, 3),
+            'p99_ms': round(self.quantile(0.99) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+        }
+
+
+class RunMetrics:
+    """
+    로더 실행 한 번의 단계별 소요 시간, 요청 지연 분포, 카운터 수집기
+
+    워커 스레드에서 동시에 기록해도 안전하며, 결과는 JSON 실행 보고서와
+    Prometheus 텍스트 형식으로 내보낼 수 있습니다.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, float] = {}
+        self.started_at = datetime.now()
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float):
+        """
+        소요 시간 기록
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        with 블록 실행 시간을 단계 소요 시간으로 기록
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def increment(self, name: str, value: float = 1):
+        """
+        카운터 증가
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name: str, value: float):
+        """
+        카운터 값 지정 (외부에서 집계한 값 반영)
+        """
+        with self._lock:
+            self.counters[name] = value
+
+    def hit_rates(self) -> Dict[str, float]:
+        """
+        CFS/OFS 조회 결과 비율 (fs_div_cfs, fs_div_ofs, fs_div_none 카운터 기준)
+        """
+        hits = {fs_div: self.counters.get(f'fs_div_{fs_div}', 0) for fs_div in ('cfs', 'ofs', 'none')}
+        total = sum(hits.values())
+        return {fs_div: round(count / total, 4) if total else 0.0 for fs_div, count in hits.items()}
+
+    def report(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        JSON 직렬화 가능한 실행 보고서
+        """
+        with self._lock:
+            histograms = {name: histogram.summary() for name, histogram in self.histograms.items()}
+            counters = dict(self.counters)
+
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'elapsed_sec': round(time.perf_counter() - self._started, 3),
+            'stages': {name: histograms[name] for name in STAGES if name in histograms},
+            'latency': {name: summary for name, summary in histograms.items() if name not in STAGES},
+            'counters': counters,
+            'fs_div_hit_rate': self.hit_rates(),
+            **(extra or {}),
+        }
+
+    def to_prometheus(self, prefix: str = 'delist_loader') -> str:
+        """
+        Prometheus 텍스트 노출 형식으로 변환
+        """
+        lines = []
+        with self._lock:
+            for name, histogram in sorted(self.histograms.items()):
+                metric = f"{prefix}_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric}_sum {histogram.sum}")
+                lines.append(f"{metric}_count {histogram.count}")
+
+            for name, value in sorted(self.counters.items()):
+                metric = f"{prefix}_{name}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def save(self, report_path: Optional[str] = None, prometheus_path: Optional[str] = None,
+             extra: Optional[Dict[str, Any]] = None):
+        """
+        실행 보고서(JSON)와 Prometheus 텍스트 파일 저장 (경로가 비어 있으면 건너뜀)
+        """
+        for path in (report_path, prometheus_path):
+            directory = os.path.dirname(path) if path else ''
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        if report_path:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(self.report(extra), f, ensure_ascii=False, indent=2)
+        if prometheus_path:
+            with open(prometheus_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
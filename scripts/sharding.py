@@ -0,0 +1,272 @@
+import argparse
+import csv
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from financial_ingest import DEFAULT_REPRT_CODE, FINANCIAL_COLUMNS
+from output_writer import CheckpointManifest
+
+# 보고서(filing) 단위 중복 판별 컬럼
+FILING_COLUMNS = ('ticker', 'year', 'reprt_code', 'fs_div')
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    'i/N' 형식 샤드 지정 파싱 (0 <= i < N)
+
+    Args:
+        value (str): 샤드 지정 (예: '0/4')
+
+    Returns:
+        Tuple[int, int]: (샤드 번호, 전체 샤드 수)
+    """
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"샤드는 'i/N' 형식이어야 합니다: {value}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"샤드 번호는 0 이상 {count} 미만이어야 합니다: {value}")
+    return index, count
+
+
+def shard_of(ticker: str, count: int) -> int:
+    """
+    ticker가 속하는 샤드 번호
+
+    프로세스마다 값이 달라지는 hash() 대신 CRC32를 사용하므로
+    어느 프로세스·머신에서 계산해도 같은 ticker는 항상 같은 샤드에 배정됩니다.
+    """
+    return zlib.crc32((ticker or '').encode('utf-8')) % count
+
+
+def select_shard(companies: Iterable[Dict[str, Any]], index: int, count: int) -> List[Dict[str, Any]]:
+    """
+    기업 목록에서 해당 샤드의 기업만 선택
+    """
+    return [company for company in companies if shard_of(company.get('ticker'), count) == index]
+
+
+def shard_output_path(path: str, index: int, count: int) -> str:
+    """
+    샤드별 출력 경로 (예: data/delisted_financials_all.shard-0-of-4.csv)
+    """
+    root, extension = os.path.splitext(path)
+    return f"{root}.shard-{index}-of-{count}{extension}"
+
+
+def shard_api_settings(count: int, keys: List[str], requests_per_second: float) -> List[Tuple[Optional[str], float]]:
+    """
+    샤드별 (DART API 키, 초당 호출 제한)
+
+    샤드 i는 i % 키 개수 번째 키를 사용하고, 같은 키를 쓰는 샤드끼리 초당 호출 제한을 나눠 가집니다.
+    (키 하나를 N개 프로세스가 쓰면서 프로세스마다 전체 제한을 쓰면 실제 호출 속도가 N배가 됨)
+
+    Args:
+        count (int): 전체 샤드 수
+        keys (List[str]): DART API 키 목록 (비어 있으면 모든 샤드가 DART_API_KEY 하나를 사용)
+        requests_per_second (float): 키 하나의 초당 호출 제한 (0이면 제한 없음)
+
+    Returns:
+        List[Tuple[Optional[str], float]]: 샤드 번호 순서의 (API 키, 초당 호출 제한)
+    """
+    slots = len(keys) or 1
+    sharing = [sum(1 for j in range(count) if j % slots == i % slots) for i in range(count)]
+
+    if requests_per_second <= 0 and max(sharing) > 1:
+        raise ValueError(
+            "여러 샤드가 같은 DART API 키를 쓰려면 DART_REQUESTS_PER_SECOND로 키별 호출 제한을 지정해야 합니다. "
+            "(또는 DART_API_KEYS에 샤드 수만큼 키 지정)"
+        )
+
+    return [
+        (keys[i % slots] if keys else None, requests_per_second / sharing[i] if requests_per_second > 0 else 0.0)
+        for i in range(count)
+    ]
+
+
+def _merge_csv(paths: List[str], output_path: str) -> int:
+    """
+    샤드 CSV를 한 행씩 읽어 합치기
+
+    앞선 샤드에 이미 있는 보고서는 건너뛰고, 보고서의 행은 그대로 모두 기록합니다.
+    (DART는 한 보고서 안에서 모든 컬럼이 같은 행을 돌려주기도 하므로 행 단위로는 중복 제거하지 않음)
+    reprt_code, raw_account_id 컬럼 이전에 만든 샤드 CSV는 FinancialStore.import_csv와 같은 값으로 채웁니다.
+    """
+    seen: Set[tuple] = set()
+    key_index = [FINANCIAL_COLUMNS.index(column) for column in FILING_COLUMNS]
+    rows_written = 0
+
+    with open(output_path, 'w', newline='', encoding='utf-8-sig') as out:
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(FINANCIAL_COLUMNS)
+
+        for path in paths:
+            added = set()
+            with open(path, newline='', encoding='utf-8-sig') as f:
+                reader = csv.reader(f)
+                columns = next(reader, None)
+                if columns is None:
+                    continue
+                missing = [
+                    column for column in FINANCIAL_COLUMNS
+                    if column not in columns and column not in ('reprt_code', 'raw_account_id')
+                ]
+                if missing:
+                    raise ValueError(f"샤드 출력에 컬럼이 없습니다: {path} ({', '.join(missing)})")
+
+                index = {column: columns.index(column) for column in FINANCIAL_COLUMNS if column in columns}
+                account_index = index['account_id']
+                for row in reader:
+                    values = [
+                        row[index[column]] if column in index
+                        else DEFAULT_REPRT_CODE if column == 'reprt_code' else row[account_index]
+                        for column in FINANCIAL_COLUMNS
+                    ]
+                    key = tuple(values[i] for i in key_index)
+                    if key in seen:
+                        continue
+                    added.add(key)
+                    writer.writerow(values)
+                    rows_written += 1
+
+            # 같은 샤드 안의 보고서는 여러 행이므로 샤드를 다 읽은 뒤에 등록
+            seen |= added
+
+    return rows_written
+
+
+def _merge_columnar(paths: List[str], output_path: str, file_format: str) -> int:
+    """
+    샤드 Parquet/Arrow 데이터셋을 합치기
+
+    앞선 샤드에 이미 있는 보고서는 건너뛰고, 보고서의 행은 그대로 모두 남깁니다.
+    """
+    import pandas as pd
+
+    from columnar_output import ColumnarBatchWriter, read_financials
+    from financial_ingest import AMOUNT_COLUMNS, FinancialBatch
+
+    frames = []
+    for index, path in enumerate(paths):
+        df = read_financials(path, file_format=file_format)
+        if df.empty:
+            continue
+        df = df.astype({column: str for column in FINANCIAL_COLUMNS if column not in AMOUNT_COLUMNS})
+        frames.append(df[FINANCIAL_COLUMNS].assign(_shard=index))
+
+    writer = ColumnarBatchWriter(output_path, file_format)
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
+
+        # 보고서마다 처음 나온 샤드의 행만 남김
+        first_shard = df.groupby(list(FILING_COLUMNS), sort=False)['_shard'].transform('min')
+        df = df[df['_shard'] == first_shard]
+
+        writer.write_batch(FinancialBatch({
+            column: df[column].to_numpy() if column in AMOUNT_COLUMNS else df[column].tolist()
+            for column in FINANCIAL_COLUMNS
+        }))
+
+    writer.close()
+    return writer.rows_written
+
+
+def merge_shard_outputs(output_path: str, count: int, file_format: str = 'csv') -> int:
+    """
+    샤드별 출력을 하나의 데이터셋으로 합치고 체크포인트도 합치기
+
+    같은 보고서(ticker, year, reprt_code, fs_div)가 여러 샤드에 있으면
+    (샤드 수를 바꿔 다시 실행한 경우 등) 번호가 작은 샤드의 행만 그대로 남깁니다.
+    (샤드 안에서 같은 행이 두 번 기록되는 경우는 --resume 시 체크포인트 이후 출력을 잘라 막음)
+
+    Args:
+        output_path (str): 합친 결과 경로 (샤드 경로의 기준)
+        count (int): 전체 샤드 수
+        file_format (str): 출력 형식 csv/parquet/arrow
+
+    Returns:
+        int: 합친 결과 행 수
+    """
+    paths = [shard_output_path(output_path, index, count) for index in range(count)]
+    missing = [path for path in paths if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"샤드 출력이 없습니다: {', '.join(missing)}")
+
+    if file_format == 'csv':
+        rows = _merge_csv(paths, output_path)
+    else:
+        rows = _merge_columnar(paths, output_path, file_format)
+
+    # 합친 결과에서 --resume으로 이어서 실행할 수 있도록 완료 작업도 합침
+    completed: Set[str] = set()
+    for path in paths:
+        completed |= CheckpointManifest(f"{path}.done").load()
+    manifest = CheckpointManifest(f"{output_path}.done")
+    manifest.reset()
+    manifest.mark_completed(sorted(completed))
+
+    return rows
+
+
+def run_shard(index: int, count: int, api_key: Optional[str] = None, limit: Optional[int] = None,
+              resume: bool = False, requests_per_second: Optional[float] = None) -> Dict[str, int]:
+    """
+    샤드 하나를 별도 프로세스에서 실행 (프로세스마다 DART API 키와 속도 제한기가 따로)
+    """
+    if api_key:
+        os.environ['DART_API_KEY'] = api_key
+
+    from delist_data_loader import DelistDataLoader
+
+    loader = DelistDataLoader(shard=(index, count), requests_per_second=requests_per_second or None)
+    return loader.process_all_delisted_companies(limit, resume=resume)
+
+
+def main():
+    """
+    한 머신에서 샤드를 프로세스별로 나눠 실행하고 결과 합치기
+
+    python sharding.py run --shards 4    : 샤드 4개를 프로세스 4개로 실행한 뒤 합침
+    python sharding.py merge --shards 4  : 여러 머신에서 만든 샤드 출력만 합침
+    DART_API_KEYS(쉼표 구분)를 지정하면 샤드 i는 i % 키 개수 번째 키를 사용하고,
+    같은 키를 쓰는 샤드끼리 DART_REQUESTS_PER_SECOND를 나눠 씁니다.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description='상장 폐지 기업 데이터 샤드 실행/병합')
+    parser.add_argument('command', choices=['run', 'merge'])
+    parser.add_argument('--shards', type=int, required=True, help='전체 샤드 수')
+    parser.add_argument('--limit', type=int, default=None, help='처리할 기업 수 제한 (샤드로 나누기 전)')
+    parser.add_argument('--resume', action='store_true', help='샤드별 체크포인트 이후부터 이어서 처리')
+    args = parser.parse_args()
+
+    output_format = os.getenv('DELIST_OUTPUT_FORMAT', 'csv').lower()
+    output_path = os.getenv('DELIST_OUTPUT_PATH', f"data/delisted_financials_all.{output_format}")
+
+    if args.command == 'run':
+        keys = [key for key in os.getenv('DART_API_KEYS', '').split(',') if key]
+        try:
+            settings = shard_api_settings(args.shards, keys, float(os.getenv('DART_REQUESTS_PER_SECOND', '0')))
+        except ValueError as e:
+            parser.error(str(e))
+        with ProcessPoolExecutor(max_workers=args.shards) as executor:
+            futures = [
+                executor.submit(run_shard, index, args.shards, api_key, args.limit, args.resume, rps)
+                for index, (api_key, rps) in enumerate(settings)
+            ]
+            summaries = [future.result() for future in futures]
+
+        succeeded = sum(summary['succeeded'] for summary in summaries)
+        companies = sum(summary['companies'] for summary in summaries)
+        print(f"샤드 {args.shards}개 처리 완료: {succeeded}/{companies} 성공")
+
+    rows = merge_shard_outputs(output_path, args.shards, output_format)
+    print(f"샤드 출력 병합 완료: {output_path} ({rows}개 항목)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+import argparse
+import json
+import os
+import warnings
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ratio_engine import RATIO_COLUMNS
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # 전수 비교(brute)만 사용할 때는 필요 없음
+    cKDTree = None
+
+# 기본 인덱스 파일 경로
+DEFAULT_INDEX_PATH = 'data/similarity_index.npz'
+
+# 검색 방식
+# - auto: scipy가 있으면 KD-트리, 없으면 전수 비교
+# - brute: 행렬 연산 전수 비교
+# - tree: scipy KD-트리 (결측값이 있는 질의는 전수 비교로 처리)
+SEARCH_METHODS = ('auto', 'brute', 'tree')
+
+# 정규화 후 값 범위 (극단값 하나가 거리를 지배하지 않도록 제한)
+CLIP_LIMIT = 5.0
+
+# 거리 계산 한 번에 만드는 (질의 수 × 인덱스 크기) 행렬의 최대 원소 수 (float64 기준 약 128MB)
+QUERY_BLOCK_ELEMENTS = 1 << 24
+
+
+def _require_scipy():
+    if cKDTree is None:
+        raise ImportError("트리 검색에는 scipy가 필요합니다. pip install scipy")
+
+
+def _robust_scale(values: np.ndarray):
+    """
+    컬럼별 중앙값과 사분위 범위 (값이 없는 컬럼은 0/1, 범위가 0이면 1)
+    """
+    with warnings.catch_warnings():
+        # 값이 하나도 없는 컬럼의 All-NaN 경고는 아래에서 기본값으로 처리
+        warnings.simplefilter('ignore', RuntimeWarning)
+        center = np.nanmedian(values, axis=0)
+        scale = np.nanpercentile(values, 75, axis=0) - np.nanpercentile(values, 25, axis=0)
+    center = np.where(np.isnan(center), 0.0, center)
+    scale = np.where(np.isnan(scale) | (scale == 0), 1.0, scale)
+    return center, scale
+
+
+class SimilarityIndex:
+    """
+    상장 폐지 기업 재무비율 프로필의 최근접 이웃 인덱스
+
+    - 비율을 컬럼별 중앙값/사분위 범위로 정규화한 행렬을 보관하고, 질의는
+      행렬 연산으로 여러 건을 한 번에 거리 계산합니다.
+    - 질의에 없는 비율(NaN)은 해당 차원을 빼고 비교하며, 인덱스 쪽 결측값은
+      중앙값(정규화 후 0)으로 채워 둡니다.
+    - 정규화 기준은 처음 만들 때 고정되므로 add로 기업을 추가해도 기존 행은 그대로이고,
+      분포가 많이 바뀌었을 때만 refit으로 다시 계산합니다.
+    """
+
+    def __init__(self, features: Sequence[str] = tuple(RATIO_COLUMNS), center: Optional[np.ndarray] = None,
+                 scale: Optional[np.ndarray] = None):
+        """
+        Args:
+            features (Sequence[str]): 비교할 비율 컬럼
+            center (Optional[np.ndarray]): 정규화 중심 (기본값: 처음 추가한 데이터의 중앙값)
+            scale (Optional[np.ndarray]): 정규화 척도 (기본값: 처음 추가한 데이터의 사분위 범위)
+        """
+        self.features = list(features)
+        self.center = center
+        self.scale = scale
+        self.tickers = np.array([], dtype=object)
+        self.years = np.array([], dtype=np.int64)
+        self.labels = np.array([], dtype=object)
+        self.raw = np.zeros((0, len(self.features)), dtype=np.float64)
+        self.matrix = np.zeros((0, len(self.features)), dtype=np.float64)
+        self._tree = None
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def _normalize(self, values: np.ndarray) -> np.ndarray:
+        return np.clip((values - self.center) / self.scale, -CLIP_LIMIT, CLIP_LIMIT)
+
+    def add(self, ratios, label_column: str = 'risk_level') -> int:
+        """
+        기업 비율 프로필 추가 (이미 있는 ticker는 새 값으로 교체)
+
+        Args:
+            ratios (pd.DataFrame): ticker, year, 비율 컬럼 (compute_ratios/grade_risk 결과)
+            label_column (str): 함께 보관할 라벨 컬럼 (없으면 빈 값)
+
+        Returns:
+            int: 추가(교체 포함)한 기업 수
+        """
+        # 기업마다 가장 최근 연도(폐지 직전) 프로필 하나만 사용
+        latest = ratios.sort_values('year').drop_duplicates('ticker', keep='last')
+        if latest.empty:
+            return 0
+
+        values = latest[self.features].to_numpy(dtype=np.float64)
+        if self.center is None or self.scale is None:
+            self.center, self.scale = _robust_scale(values)
+
+        tickers = latest['ticker'].astype(str).to_numpy(dtype=object)
+        keep = ~pd.Index(self.tickers).isin(tickers)
+        labels = latest[label_column].to_numpy(dtype=object) if label_column in latest.columns \
+            else np.full(len(latest), '', dtype=object)
+
+        self.tickers = np.concatenate([self.tickers[keep], tickers])
+        self.years = np.concatenate([self.years[keep], latest['year'].to_numpy(dtype=np.int64)])
+        self.labels = np.concatenate([self.labels[keep], labels])
+        self.raw = np.vstack([self.raw[keep], values])
+        self.matrix = np.vstack([self.matrix[keep], np.nan_to_num(self._normalize(values), nan=0.0)])
+        self._tree = None
+        return len(latest)
+
+    def refit(self):
+        """
+        현재 데이터로 정규화 기준을 다시 계산
+        """
+        self.center, self.scale = _robust_scale(self.raw)
+        self.matrix = np.nan_to_num(self._normalize(self.raw), nan=0.0)
+        self._tree = None
+
+    def _query_matrix(self, queries: np.ndarray, k: int):
+        """
+        정규화된 질의 행렬의 최근접 이웃 (질의별 인덱스, 거리)
+        """
+        k = min(k, len(self))
+        indices = np.empty((len(queries), k), dtype=np.int64)
+        distances = np.empty((len(queries), k), dtype=np.float64)
+        squares = self.matrix ** 2
+        squared_norms = squares.sum(axis=1)
+        chunk_size = max(1, QUERY_BLOCK_ELEMENTS // len(self))
+
+        for start in range(0, len(queries), chunk_size):
+            chunk = queries[start:start + chunk_size]
+            present = ~np.isnan(chunk)
+            filled = np.where(present, chunk, 0.0)
+
+            # |q - x|² = |q|² - 2 q·x + |x|² (질의에 없는 차원은 x 쪽도 빼고 계산)
+            cross = filled @ self.matrix.T
+            x_norms = (present.astype(np.float64) @ squares.T
+                       if not present.all() else squared_norms[np.newaxis, :])
+            squared = np.einsum('ij,ij->i', filled, filled)[:, np.newaxis] - 2 * cross + x_norms
+            # 비교한 차원 수가 달라도 거리를 견줄 수 있도록 전체 차원 기준으로 환산
+            dims = present.sum(axis=1, keepdims=True)
+            squared = np.maximum(squared, 0) * (len(self.features) / np.maximum(dims, 1))
+
+            nearest = np.argpartition(squared, k - 1, axis=1)[:, :k] if k < len(self) \
+                else np.tile(np.arange(len(self)), (len(chunk), 1))
+            nearest_squared = np.take_along_axis(squared, nearest, axis=1)
+            order = np.argsort(nearest_squared, axis=1, kind='stable')
+            indices[start:start + len(chunk)] = np.take_along_axis(nearest, order, axis=1)
+            distances[start:start + len(chunk)] = np.sqrt(np.take_along_axis(nearest_squared, order, axis=1))
+
+        return indices, distances
+
+    def _query_tree(self, queries: np.ndarray, k: int):
+        """
+        KD-트리 최근접 이웃 (모든 차원이 있는 질의만)
+        """
+        _require_scipy()
+        if self._tree is None:
+            self._tree = cKDTree(self.matrix)
+        k = min(k, len(self))
+        distances, indices = self._tree.query(queries, k=k)
+        return indices.reshape(len(queries), k), distances.reshape(len(queries), k)
+
+    def query_batch(self, values: np.ndarray, k: int = 5, method: str = 'auto'):
+        """
+        여러 기업의 비율 행렬로 한 번에 최근접 이웃 검색
+
+        Args:
+            values (np.ndarray): (질의 수 × 비율 수) 원래 단위 비율, 모르는 값은 NaN
+            k (int): 이웃 수
+            method (str): 검색 방식 (SEARCH_METHODS)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (질의 수 × k) 인덱스 행 번호, 거리
+        """
+        if not len(self):
+            raise ValueError("인덱스가 비어 있습니다.")
+        if method not in SEARCH_METHODS:
+            raise ValueError(f"지원하지 않는 검색 방식입니다: {method}")
+
+        queries = self._normalize(np.atleast_2d(np.asarray(values, dtype=np.float64)))
+        if method == 'auto':
+            method = 'tree' if cKDTree is not None else 'brute'
+        if method == 'brute' or np.isnan(queries).any():
+            return self._query_matrix(queries, k)
+        return self._query_tree(queries, k)
+
+    def query(self, ratios: Union[Dict[str, Optional[float]], Sequence[Optional[float]]], k: int = 5,
+              method: str = 'auto') -> List[Dict[str, Any]]:
+        """
+        기업 하나의 비율과 가장 비슷한 상장 폐지 기업 k개
+
+        Args:
+            ratios: 비율 컬럼명 → 값 (FinancialRatios 형식, 없는 비율은 생략 또는 None) 또는 features 순서의 값 목록
+            k (int): 이웃 수
+            method (str): 검색 방식 (SEARCH_METHODS)
+
+        Returns:
+            List[Dict[str, Any]]: 가까운 순서의 ticker, year, distance, 라벨, 비율
+        """
+        if isinstance(ratios, dict):
+            ratios = [ratios.get(feature) for feature in self.features]
+        values = np.array([np.nan if value is None else value for value in ratios], dtype=np.float64)
+
+        indices, distances = self.query_batch(values[np.newaxis, :], k, method)
+        return [
+            {
+                'ticker': self.tickers[i],
+                'year': int(self.years[i]),
+                'distance': round(float(distance), 6),
+                'label': self.labels[i],
+                'ratios': {
+                    feature: None if np.isnan(value) else float(value)
+                    for feature, value in zip(self.features, self.raw[i])
+                },
+            }
+            for i, distance in zip(indices[0], distances[0])
+        ]
+
+    def save(self, path: str = DEFAULT_INDEX_PATH):
+        """
+        인덱스를 npz 파일로 저장 (임시 파일에 쓴 뒤 교체)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            features=np.array(self.features), center=self.center, scale=self.scale,
+            tickers=self.tickers.astype(str), years=self.years, labels=self.labels.astype(str),
+            raw=self.raw, matrix=self.matrix,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> 'SimilarityIndex':
+        """
+        save로 저장한 인덱스 읽기
+        """
+        with np.load(path, allow_pickle=False) as data:
+            index = cls(data['features'].tolist(), data['center'], data['scale'])
+            index.tickers = data['tickers'].astype(object)
+            index.years = data['years']
+            index.labels = data['labels'].astype(object)
+            index.raw = data['raw']
+            index.matrix = data['matrix']
+        return index
+
+
+def _graded_ratios(csv_paths: Iterable[str]) -> pd.DataFrame:
+    """
+    재무 데이터 CSV → 위험 등급이 붙은 비율 DataFrame
+    """
+    from ratio_engine import compute_ratios, grade_risk
+
+    df = pd.concat([pd.read_csv(path, dtype={'ticker': str}) for path in csv_paths], ignore_index=True)
+    return grade_risk(compute_ratios(df))
+
+
+def main():
+    """
+    유사 기업 인덱스 만들기/추가/조회
+
+    python similarity_index.py build data/delisted_financials_all.csv
+    python similarity_index.py add data/new_delisted.csv
+    python similarity_index.py query --ratio debt_ratio=85 --ratio current_ratio=0.7 -k 5
+    (DELIST_SIMILARITY_INDEX로 인덱스 경로 지정)
+    """
+    parser = argparse.ArgumentParser(description='상장 폐지 기업 재무비율 유사도 인덱스')
+    parser.add_argument('command', choices=['build', 'add', 'query'])
+    parser.add_argument('csv_paths', nargs='*', help='delisted_financials_all 형식 CSV (build/add)')
+    parser.add_argument('--ratio', action='append', default=[], help='질의 비율 name=value (query)')
+    parser.add_argument('-k', type=int, default=5, help='이웃 수')
+    parser.add_argument('--method', choices=SEARCH_METHODS, default='auto')
+    args = parser.parse_args()
+
+    index_path = os.getenv('DELIST_SIMILARITY_INDEX') or DEFAULT_INDEX_PATH
+
+    if args.command == 'query':
+        ratios = {}
+        for item in args.ratio:
+            name, _, value = item.partition('=')
+            if name not in RATIO_COLUMNS:
+                parser.error(f"알 수 없는 비율입니다: {name} (가능: {', '.join(RATIO_COLUMNS)})")
+            ratios[name] = float(value)
+        results = SimilarityIndex.load(index_path).query(ratios, args.k, args.method)
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    csv_paths = args.csv_paths or ['data/delisted_financials_all.csv']
+    if args.command == 'add' and os.path.exists(index_path):
+        index = SimilarityIndex.load(index_path)
+    else:
+        index = SimilarityIndex()
+
+    added = index.add(_graded_ratios(csv_paths))
+    index.save(index_path)
+    print(f"유사도 인덱스 저장 완료: {index_path} (추가 {added}개, 전체 {len(index)}개 기업)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+# 폐지일 워터마크 메타 키
+WATERMARK_KEY = 'delisting_date_watermark'
+
+
+class LoaderStateStore:
+    """
+    증분 실행을 위한 로더 상태 저장소 (SQLite)
+
+    - fetched: 저장까지 끝난 (ticker, year, reprt_code) 조회 작업과 시각
+    - companies: 마지막으로 처리한 기업의 corp_code/폐지일 (변경 감지용)
+    - meta: 지금까지 처리한 가장 늦은 폐지일(워터마크)
+    - fs_routes: 기업(corp_code)별로 실제 데이터가 나온 재무제표 구분(CFS/OFS)
+    """
+
+    def __init__(self, path: str = "data/cache/loader_state.sqlite3"):
+        """
+        Args:
+            path (str): 상태 파일 경로
+        """
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # 샤드 프로세스들이 같은 상태 파일을 공유할 수 있도록 잠금 대기 시간을 넉넉히 둠
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS fetched (
+                ticker TEXT NOT NULL,
+                year TEXT NOT NULL,
+                reprt_code TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (ticker, year, reprt_code)
+            );
+            CREATE TABLE IF NOT EXISTS companies (
+                ticker TEXT PRIMARY KEY,
+                corp_code TEXT,
+                delisting_date TEXT,
+                processed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+            CREATE TABLE IF NOT EXISTS fs_routes (
+                corp_code TEXT PRIMARY KEY,
+                fs_div TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get_watermark(self, scope: str = '') -> Optional[str]:
+        """
+        지금까지 처리한 가장 늦은 폐지일 (없으면 None)
+
+        Args:
+            scope (str): 워터마크 구분 (샤드별로 따로 관리할 때 사용)
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = ?", (f"{WATERMARK_KEY}{scope}",)
+            ).fetchone()
+        return row[0] if row else None
+
+    def advance_watermark(self, delisting_dates: Iterable[Optional[str]], scope: str = '',
+                          ceiling: Optional[str] = None) -> Optional[str]:
+        """
+        워터마크를 주어진 폐지일 중 가장 늦은 값까지 올림 (내려가지 않음)
+
+        Args:
+            delisting_dates (Iterable[Optional[str]]): 처리한 기업의 폐지일
+            scope (str): 워터마크 구분
+            ceiling (Optional[str]): 워터마크 상한 (처리에 실패한 기업의 가장 이른 폐지일)
+
+        Returns:
+            Optional[str]: 갱신된 워터마크
+        """
+        current = self.get_watermark(scope)
+        latest = max((date for date in delisting_dates if date and (ceiling is None or date <= ceiling)), default=None)
+        if latest is None or (current is not None and latest <= current):
+            return current
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (f"{WATERMARK_KEY}{scope}", latest)
+            )
+            self._conn.commit()
+        return latest
+
+    def fetched_keys(self) -> Set[str]:
+        """
+        저장이 끝난 조회 작업 식별자 (FetchTask.checkpoint_key 형식)
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT ticker, year, reprt_code FROM fetched").fetchall()
+        return {'|'.join(row) for row in rows}
+
+    def record_fetched(self, checkpoint_keys: Iterable[str]):
+        """
+        저장이 끝난 조회 작업 기록
+
+        Args:
+            checkpoint_keys (Iterable[str]): 'ticker|year|reprt_code' 목록
+        """
+        now = time.time()
+        rows = [tuple(key.split('|')) + (now,) for key in checkpoint_keys]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fetched (ticker, year, reprt_code, fetched_at) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def changed_companies(self, companies: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        처음 보거나 corp_code/폐지일이 바뀐 기업만 선택
+        """
+        with self._lock:
+            known = {
+                ticker: (corp_code, delisting_date)
+                for ticker, corp_code, delisting_date in self._conn.execute(
+                    "SELECT ticker, corp_code, delisting_date FROM companies"
+                )
+            }
+        return [
+            company for company in companies
+            if known.get(company.get('ticker')) != (company.get('corp_code'), company.get('delisting_date'))
+        ]
+
+    def record_companies(self, companies: Iterable[Dict[str, Any]]):
+        """
+        처리한 기업의 corp_code/폐지일 기록
+        """
+        now = time.time()
+        rows = [
+            (company.get('ticker'), company.get('corp_code'), company.get('delisting_date'), now)
+            for company in companies if company.get('ticker')
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO companies (ticker, corp_code, delisting_date, processed_at) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def fs_routes(self) -> Dict[str, str]:
+        """
+        기업별 재무제표 구분 (corp_code → CFS/OFS)
+        """
+        with self._lock:
+            return dict(self._conn.execute("SELECT corp_code, fs_div FROM fs_routes").fetchall())
+
+    def record_fs_routes(self, routes: Dict[str, str]):
+        """
+        기업별 재무제표 구분 기록
+
+        Args:
+            routes (Dict[str, str]): corp_code → CFS/OFS
+        """
+        now = time.time()
+        rows = [(corp_code, fs_div, now) for corp_code, fs_div in routes.items() if corp_code and fs_div]
+        if not rows:
+            return
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO fs_routes (corp_code, fs_div, updated_at) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        저장된 조회 작업 수, 기업 수, 워터마크 목록
+        """
+        with self._lock:
+            fetched = self._conn.execute("SELECT COUNT(*) FROM fetched").fetchone()[0]
+            companies = self._conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+            routes = dict(self._conn.execute("SELECT fs_div, COUNT(*) FROM fs_routes GROUP BY fs_div").fetchall())
+            watermarks = dict(self._conn.execute(
+                "SELECT key, value FROM meta WHERE key LIKE ?", (f"{WATERMARK_KEY}%",)
+            ).fetchall())
+        return {'fetched': fetched, 'companies': companies, 'watermarks': watermarks, 'fs_routes': routes}
+
+    def close(self):
+        """
+        상태 파일 연결 종료
+        """
+        with self._lock:
+            self._conn.close()
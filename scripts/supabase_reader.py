@@ -0,0 +1,168 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+# PostgREST 기본 최대 응답 행 수(db-max-rows)보다 작게 유지
+DEFAULT_PAGE_SIZE = 1000
+
+# ticker=in.(...) 필터 하나에 넣을 값 개수 (URL 길이 제한 고려)
+DEFAULT_IN_CHUNK_SIZE = 200
+
+
+class SupabaseReader:
+    """
+    Supabase(PostgREST) 테이블을 페이지 단위로 읽는 reader
+
+    필요한 컬럼만 select로 가져오고, 필터는 서버에서 적용하며,
+    결과는 페이지 단위로 받아 한 행씩 yield합니다.
+    """
+
+    def __init__(self, supabase_url: str, supabase_key: str, page_size: int = DEFAULT_PAGE_SIZE, session=None):
+        """
+        Args:
+            supabase_url (str): Supabase 프로젝트 URL
+            supabase_key (str): Supabase API 키
+            page_size (int): 한 번에 가져올 행 수
+            session: requests 호환 세션 (기본값: requests 모듈)
+        """
+        self.base_url = f"{supabase_url}/rest/v1"
+        self.page_size = page_size
+        self.http = session or requests
+        self.headers = {
+            'apikey': supabase_key,
+            'Authorization': f'Bearer {supabase_key}',
+            'Content-Type': 'application/json'
+        }
+
+    def fetch_page(self, table: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        한 페이지 조회
+
+        Args:
+            table (str): 테이블명
+            params (Dict[str, Any]): PostgREST 쿼리 파라미터
+
+        Returns:
+            List[Dict[str, Any]]: 조회된 행
+        """
+        response = self.http.get(f"{self.base_url}/{table}", headers=self.headers, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    def iter_rows(self, table: str, select: str = '*', filters: Optional[Dict[str, str]] = None,
+                  key: Optional[str] = None, order: Optional[str] = None,
+                  page_size: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        테이블 행을 페이지 단위로 스트리밍
+
+        key가 주어지면 keyset 페이지네이션(key=gt.마지막값)을 사용하고,
+        없으면 limit/offset 페이지네이션을 사용합니다.
+
+        Args:
+            table (str): 테이블명
+            select (str): 가져올 컬럼 (예: 'ticker,corp_code')
+            filters (Optional[Dict[str, str]]): PostgREST 필터 (예: {'listed_company': 'eq.0'})
+            key (Optional[str]): keyset 페이지네이션에 사용할 고유 정렬 컬럼 (select에 포함되어야 함)
+            order (Optional[str]): offset 페이지네이션 시 정렬 조건
+            page_size (Optional[int]): 페이지 크기
+
+        Yields:
+            Dict[str, Any]: 조회된 행
+        """
+        page_size = page_size or self.page_size
+        last_key = None
+        offset = 0
+
+        while True:
+            params = dict(filters or {})
+            params['select'] = select
+            params['limit'] = page_size
+
+            if key:
+                params['order'] = f"{key}.asc"
+                if last_key is not None:
+                    params[key] = f"gt.{last_key}"
+            else:
+                params['offset'] = offset
+                if order:
+                    params['order'] = order
+
+            page = self.fetch_page(table, params)
+            yield from page
+
+            if len(page) < page_size:
+                return
+
+            if key:
+                last_key = page[-1][key]
+            else:
+                offset += len(page)
+
+    def iter_rows_in(self, table: str, column: str, values: Iterable[str], select: str = '*',
+                     chunk_size: int = DEFAULT_IN_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """
+        column=in.(...) 필터로 지정한 값의 행만 서버에서 골라 스트리밍
+
+        Args:
+            table (str): 테이블명
+            column (str): 필터 컬럼
+            values (Iterable[str]): 조회할 값 목록
+            select (str): 가져올 컬럼
+            chunk_size (int): 필터 하나에 넣을 값 개수
+
+        Yields:
+            Dict[str, Any]: 조회된 행
+        """
+        values = list(dict.fromkeys(v for v in values if v))
+
+        for start in range(0, len(values), chunk_size):
+            chunk = values[start:start + chunk_size]
+            quoted = ','.join(f'"{value}"' for value in chunk)
+            yield from self.iter_rows(
+                table, select=select, filters={column: f"in.({quoted})"}, order=f"{column}.asc"
+            )
+
+    def count(self, table: str, filters: Optional[Dict[str, str]] = None) -> int:
+        """
+        Prefer: count=exact HEAD 요청으로 행 수만 조회 (본문 없이 Content-Range 헤더의 전체 개수 사용)
+
+        Args:
+            table (str): 테이블명
+            filters (Optional[Dict[str, str]]): PostgREST 필터
+
+        Returns:
+            int: 필터에 맞는 행 수
+        """
+        params = dict(filters or {})
+        params['select'] = '*'
+        params['limit'] = 1
+        response = self.http.head(
+            f"{self.base_url}/{table}", headers={**self.headers, 'Prefer': 'count=exact'}, params=params
+        )
+        response.raise_for_status()
+
+        # 예: '0-0/1234', 행이 없으면 '*/0'
+        content_range = response.headers.get('Content-Range', '')
+        total = content_range.rpartition('/')[2]
+        if not total.isdigit():
+            raise ValueError(f"{table} 행 수를 확인할 수 없습니다 (Content-Range: {content_range!r})")
+        return int(total)
+
+    def aggregate_counts(self, table: str, column: str,
+                         filters: Optional[Dict[str, str]] = None) -> Dict[Any, int]:
+        """
+        서버 집계(select=column,count())로 값별 행 수 조회
+
+        PostgREST 집계 함수(db-aggregates-enabled)가 꺼져 있으면 HTTPError(400)가 발생합니다.
+
+        Args:
+            table (str): 테이블명
+            column (str): 분포를 볼 컬럼
+            filters (Optional[Dict[str, str]]): PostgREST 필터
+
+        Returns:
+            Dict[Any, int]: 값 → 행 수
+        """
+        params = dict(filters or {})
+        params['select'] = f"{column},count()"
+        return {row[column]: row['count'] for row in self.fetch_page(table, params)}
@@ -0,0 +1,290 @@
+import argparse
+import os
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backfill_planner import ANNUAL_REPORT
+from feature_matrix import DEFAULT_EXCLUDED_STATEMENTS
+from financial_ingest import FINANCIAL_COLUMNS
+
+# 원본 데이터 (기업 템플릿)
+TEMPLATE_PATH = 'data/delisted_financials_all.csv'
+
+# 원본 피벗의 계정별 결측 기업 수 (희소성 검증 기준)
+NAN_COUNT_PATH = 'data/pivot_nan_count.csv'
+
+# 한 번에 만드는 기업 수 (1000배 규모도 메모리에 나눠 생성)
+DEFAULT_CHUNK_COMPANIES = 2000
+
+
+def load_templates(path: str = TEMPLATE_PATH) -> pd.DataFrame:
+    """
+    원본 long 데이터를 기업 템플릿으로 읽기 (기업별 행이 연속되도록 정렬)
+    """
+    df = pd.read_csv(path, dtype={'ticker': str, 'reprt_code': str})
+    if 'reprt_code' not in df.columns:
+        df['reprt_code'] = ANNUAL_REPORT
+    df = df[df['reprt_code'] == ANNUAL_REPORT]
+    return df.sort_values(['ticker', 'year'], kind='stable').reset_index(drop=True)
+
+
+def load_nan_counts(path: str = NAN_COUNT_PATH) -> pd.Series:
+    """
+    pivot_nan_count.csv → account_id별 결측 기업 수
+    """
+    counts = pd.read_csv(path, index_col=0).iloc[:, 0]
+    counts.index.name = 'account_id'
+    return counts
+
+
+class SyntheticFinancials:
+    """
+    실제 데이터의 계정 분포와 희소성을 유지하는 합성 long 재무 데이터 생성기
+
+    - 합성 기업마다 실제 기업 하나를 템플릿으로 골라 계정 구성(어떤 계정이 함께 있는지)을 가져옵니다.
+    - 계정 구성이 템플릿 수만큼만 반복되지 않도록 계정 일부(dropout)를 빼고, 템플릿에 없는
+      계정을 다른 기업에서 빌려 오되 계정별 채움 비율의 기댓값은 원본과 같게 보정합니다.
+    - 금액은 기업 규모(로그정규)와 행별 잡음을 곱해 만들고 부호와 0은 유지합니다.
+    """
+
+    def __init__(self, templates: pd.DataFrame, dropout: float = 0.05, size_sigma: float = 0.8,
+                 noise_sigma: float = 0.1, years_per_company: int = 1, growth_sigma: float = 0.15,
+                 seed: Optional[int] = 0):
+        """
+        Args:
+            templates (pd.DataFrame): load_templates 결과
+            dropout (float): 템플릿 계정을 뺄 확률 (빌려 오는 계정으로 채움 비율 보정)
+            size_sigma (float): 기업 규모 배율의 로그 표준편차
+            noise_sigma (float): 행별 금액 잡음의 로그 표준편차
+            years_per_company (int): 기업당 연도 수 (템플릿 연도부터 과거로)
+            growth_sigma (float): 연도별 성장률 배율의 로그 표준편차
+            seed (Optional[int]): 난수 시드
+        """
+        if not 0 <= dropout < 1:
+            raise ValueError(f"dropout은 0 이상 1 미만이어야 합니다: {dropout}")
+        if years_per_company < 1:
+            raise ValueError(f"기업당 연도 수는 1 이상이어야 합니다: {years_per_company}")
+
+        self.templates = templates
+        self.dropout = dropout
+        self.size_sigma = size_sigma
+        self.noise_sigma = noise_sigma
+        self.years_per_company = years_per_company
+        self.growth_sigma = growth_sigma
+        self.rng = np.random.default_rng(seed)
+
+        # 템플릿 공시((ticker, year))별 행 범위
+        filing_codes = templates.groupby(['ticker', 'year'], sort=False).ngroup().to_numpy()
+        counts = np.bincount(filing_codes)
+        self.n_templates = len(counts)
+        self.starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        self.counts = counts
+        self.template_years = templates['year'].to_numpy(dtype=np.int64)[self.starts]
+        self.account_codes, self.accounts = pd.factorize(templates['account_id'])
+
+        # 계정별 채움 비율 f (공시 수 기준)
+        # 계정이 남을 확률 f(1 - d) + (1 - f)·f·q = f 가 되도록 제외 확률 d = min(dropout, 1 - f),
+        # 빌려 오는 확률 q = d / (1 - f)로 보정
+        pairs = pd.DataFrame({'t': filing_codes, 'a': self.account_codes}).drop_duplicates()
+        fill = np.bincount(pairs['a'], minlength=len(self.accounts)) / self.n_templates
+        self.drop_prob = np.minimum(dropout, 1 - fill)
+        self.borrow_prob = np.divide(self.drop_prob, 1 - fill, out=np.zeros_like(fill), where=fill < 1)
+
+    @property
+    def template_rows(self) -> int:
+        return len(self.templates)
+
+    def _account_draws(self, owners: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (합성 기업, 계정)마다 난수 하나 (한 계정의 여러 행이 함께 빠지거나 함께 들어가도록)
+        """
+        keys = owners.astype(np.int64) * len(self.accounts) + self.account_codes[rows]
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        return keys, self.rng.random(len(unique_keys))[inverse]
+
+    def _template_rows(self, template_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        템플릿 기업 번호 배열 → (합성 기업 위치, 템플릿 행 번호)
+        """
+        lengths = self.counts[template_ids]
+        owners = np.repeat(np.arange(len(template_ids)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        return owners, self.starts[template_ids][owners] + offsets
+
+    def _chunk(self, first_index: int, n_companies: int) -> pd.DataFrame:
+        """
+        합성 기업 n_companies개의 long 데이터 (기업 번호 first_index부터)
+        """
+        rng = self.rng
+        template_ids = rng.integers(0, self.n_templates, n_companies)
+
+        # 기본 템플릿의 계정 중 dropout 확률로 제외
+        owners, rows = self._template_rows(template_ids)
+        existing, draws = self._account_draws(owners, rows)
+        keep = draws >= self.drop_prob[self.account_codes[rows]]
+        owners, rows = owners[keep], rows[keep]
+
+        # 다른 템플릿에서 기본 템플릿에 없는 계정만 빌려 옴
+        donor_owners, donor_rows = self._template_rows(rng.integers(0, self.n_templates, n_companies))
+        candidates, draws = self._account_draws(donor_owners, donor_rows)
+        borrow = ~np.isin(candidates, existing) & (draws < self.borrow_prob[self.account_codes[donor_rows]])
+        owners = np.concatenate([owners, donor_owners[borrow]])
+        rows = np.concatenate([rows, donor_rows[borrow]])
+
+        # 같은 기업의 행은 템플릿 순서(재무제표/계정 순)대로 정렬
+        order = np.lexsort((rows, owners))
+        owners, rows = owners[order], rows[order]
+
+        size = rng.lognormal(0.0, self.size_sigma, n_companies)
+        template = self.templates.iloc[rows]
+        this_term = template['this_term_amount'].to_numpy(dtype=np.float64)
+        prev_term = template['prev_term_amount'].to_numpy(dtype=np.float64)
+        tickers = np.array([f"{i:06d}" for i in range(first_index, first_index + n_companies)], dtype=object)
+        # 빌려 온 행도 기본 템플릿 공시의 연도를 따름
+        base_years = self.template_years[template_ids][owners]
+
+        frames = []
+        growth = np.ones(n_companies)
+        for k in range(self.years_per_company):
+            noise = rng.lognormal(0.0, self.noise_sigma, len(rows))
+            scale = (size * growth)[owners] * noise
+            frames.append(pd.DataFrame({
+                'ticker': tickers[owners],
+                'year': base_years - k,
+                'account_id': template['account_id'].to_numpy(),
+                'account_nm': template['account_nm'].to_numpy(),
+                'account_detail': template['account_detail'].to_numpy(),
+                # DART 금액은 원 단위 정수
+                'this_term_amount': np.round(this_term * scale),
+                'prev_term_amount': np.round(prev_term * scale),
+                'statement_name': template['statement_name'].to_numpy(),
+                'fs_div': template['fs_div'].to_numpy(),
+                'reprt_code': ANNUAL_REPORT,
+                # 원본 계정 ID가 없는 템플릿(이전 형식 CSV)은 account_id를 그대로 사용
+                'raw_account_id': template.get('raw_account_id', template['account_id']).to_numpy(),
+            }, columns=FINANCIAL_COLUMNS))
+            # 한 해 전으로 갈수록 성장률만큼 규모를 되돌림
+            growth = growth / rng.lognormal(0.05, self.growth_sigma, n_companies)
+
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def iter_chunks(self, n_companies: int, chunk_companies: int = DEFAULT_CHUNK_COMPANIES) -> Iterator[pd.DataFrame]:
+        """
+        합성 기업 n_companies개를 chunk_companies개씩 나눠 생성
+        """
+        for start in range(0, n_companies, chunk_companies):
+            yield self._chunk(start, min(chunk_companies, n_companies - start))
+
+    def companies_for_scale(self, scale: float) -> int:
+        """
+        원본 행 수 × scale에 해당하는 합성 기업 수
+        """
+        return max(1, int(round(self.n_templates * scale / self.years_per_company)))
+
+
+def to_statement_lists(chunk: pd.DataFrame) -> List[Tuple[str, str, str, List[Dict[str, Any]]]]:
+    """
+    합성 long 데이터를 DART fnlttSinglAcntAll 응답 형식으로 변환 (수집 단계 벤치마크 입력)
+
+    Returns:
+        List[Tuple]: (ticker, year, fs_div, DART list 항목)
+    """
+    # DART 응답처럼 금액은 쉼표 없는 정수 문자열
+    this_term = chunk['this_term_amount'].astype(np.int64).astype(str).to_numpy()
+    prev_term = chunk['prev_term_amount'].astype(np.int64).astype(str).to_numpy()
+    items = [
+        {'sj_nm': sj_nm, 'account_id': account_id, 'account_nm': account_nm, 'account_detail': account_detail,
+         'thstrm_amount': thstrm, 'frmtrm_amount': frmtrm}
+        for sj_nm, account_id, account_nm, account_detail, thstrm, frmtrm in zip(
+            chunk['statement_name'], chunk['account_id'], chunk['account_nm'], chunk['account_detail'],
+            this_term, prev_term)
+    ]
+
+    groups = chunk.groupby(['ticker', 'year', 'fs_div'], sort=False).indices
+    return [
+        (ticker, str(year), fs_div, [items[i] for i in positions])
+        for (ticker, year, fs_div), positions in groups.items()
+    ]
+
+
+def account_presence(df: pd.DataFrame, exclude_statements=DEFAULT_EXCLUDED_STATEMENTS) -> pd.Series:
+    """
+    account_id별로 해당 계정이 있는 공시((ticker, year)) 수 (청크별 결과를 더해 전체 집계 가능)
+    """
+    data = df[~df['statement_name'].isin(list(exclude_statements))]
+    return data[['ticker', 'year', 'account_id']].drop_duplicates()['account_id'].value_counts()
+
+
+def sparsity_report(presence: pd.Series, filings: int, nan_counts: pd.Series) -> Dict[str, Any]:
+    """
+    합성 데이터의 계정별 채움 비율을 원본 pivot_nan_count.csv와 비교
+
+    Args:
+        presence (pd.Series): account_presence 결과 (여러 청크의 합)
+        filings (int): 전체 공시((ticker, year)) 수
+        nan_counts (pd.Series): load_nan_counts 결과
+
+    Returns:
+        Dict[str, Any]: 계정 수, 원본에 없는 계정 수, 채움 비율 평균/최대 오차, 밀도
+    """
+    # 원본 피벗 행 수는 파일에 없으므로 가장 많이 빠진 계정도 한 기업에는 있었다고 보고 최댓값 + 1 사용
+    n_original = int(nan_counts.max()) + 1 if len(nan_counts) else 0
+    target = 1 - nan_counts / n_original
+    fill = (presence / max(filings, 1)).reindex(target.index, fill_value=0.0)
+    error = (fill - target).abs()
+    return {
+        'filings': filings,
+        'accounts': int((fill > 0).sum()),
+        'target_accounts': len(target),
+        'unknown_accounts': int((~presence.index.isin(target.index)).sum()),
+        'fill_mean_abs_error': round(float(error.mean()), 4),
+        'fill_max_abs_error': round(float(error.max()), 4),
+        'density': round(float(fill.mean()), 4),
+        'target_density': round(float(target.mean()), 4),
+    }
+
+
+def main():
+    """
+    원본의 10~1000배 규모 합성 재무 데이터 생성
+
+    python synthetic_financials.py --scale 100 --output data/synthetic/financials_100x.csv
+    """
+    parser = argparse.ArgumentParser(description='계정 분포/희소성을 유지한 합성 long 재무 데이터 생성')
+    parser.add_argument('--scale', type=float, default=10.0, help='원본 행 수 대비 배율')
+    parser.add_argument('--years', type=int, default=1, help='기업당 연도 수')
+    parser.add_argument('--dropout', type=float, default=0.05, help='템플릿 행 제외 확률')
+    parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+    parser.add_argument('--template', default=TEMPLATE_PATH, help='원본 long 데이터 CSV')
+    parser.add_argument('--nan-counts', default=NAN_COUNT_PATH, help='원본 pivot_nan_count.csv (희소성 검증)')
+    parser.add_argument('--output', default=None, help='출력 CSV 경로 (기본값: data/synthetic/financials_{scale}x.csv)')
+    args = parser.parse_args()
+
+    generator = SyntheticFinancials(load_templates(args.template), dropout=args.dropout,
+                                    years_per_company=args.years, seed=args.seed)
+    n_companies = generator.companies_for_scale(args.scale)
+    output = args.output or f"data/synthetic/financials_{args.scale:g}x.csv"
+    directory = os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    rows = filings = 0
+    presence = pd.Series(dtype=np.int64)
+    for i, chunk in enumerate(generator.iter_chunks(n_companies)):
+        chunk.to_csv(output, mode='w' if i == 0 else 'a', header=i == 0, index=False,
+                     encoding='utf-8-sig' if i == 0 else 'utf-8')
+        rows += len(chunk)
+        filings += len(chunk[['ticker', 'year']].drop_duplicates())
+        presence = presence.add(account_presence(chunk), fill_value=0)
+
+    print(f"합성 데이터 저장 완료: {output} ({n_companies}개 기업, {rows}개 행, 원본의 {rows / generator.template_rows:.1f}배)")
+    if args.nan_counts and os.path.exists(args.nan_counts):
+        report = sparsity_report(presence, filings, load_nan_counts(args.nan_counts))
+        print(f"희소성 검증: 채움 비율 평균 오차 {report['fill_mean_abs_error']}, 최대 오차 {report['fill_max_abs_error']}, "
+              f"밀도 {report['density']} (원본 {report['target_density']})")
+
+
+if __name__ == "__main__":
+    main()
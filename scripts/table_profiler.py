@@ -0,0 +1,168 @@
+import argparse
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from dotenv import load_dotenv
+
+from http_client import create_session
+from supabase_reader import SupabaseReader
+
+# .env 파일 로드
+load_dotenv()
+
+# 서버 집계를 쓸 수 없을 때 후보 값을 고를 표본 행 수
+DEFAULT_CANDIDATE_SAMPLE = 1000
+
+# 후보 값 외의 행을 묶어 표시할 키
+OTHER_VALUES = '(기타)'
+
+
+def value_counts(reader: SupabaseReader, table: str, column: str, filters: Optional[Dict[str, str]] = None,
+                 candidates: Optional[Iterable[Any]] = None,
+                 sample_size: int = DEFAULT_CANDIDATE_SAMPLE) -> Dict[str, Any]:
+    """
+    컬럼 값 분포를 서버에서 집계
+
+    PostgREST 집계 함수(select=column,count())를 먼저 사용하고, 서버에서 꺼져 있으면
+    후보 값(지정하지 않으면 표본 한 페이지의 고유값)별로 count=exact HEAD 요청을 보냅니다.
+    어느 쪽이든 테이블 크기와 관계없이 요청 수와 응답 크기가 일정합니다.
+
+    Args:
+        reader (SupabaseReader): Supabase reader
+        table (str): 테이블명
+        column (str): 분포를 볼 컬럼
+        filters (Optional[Dict[str, str]]): PostgREST 필터
+        candidates (Optional[Iterable[Any]]): 집계 함수를 쓸 수 없을 때 개수를 셀 값 목록
+        sample_size (int): 후보 값을 고를 표본 행 수
+
+    Returns:
+        Dict[str, Any]: {'method': 'aggregate' 또는 'head', 'counts': {값: 행 수}}
+    """
+    filters = dict(filters or {})
+    try:
+        return {'method': 'aggregate', 'counts': reader.aggregate_counts(table, column, filters)}
+    except requests.HTTPError as e:
+        # 400: 집계 함수 비활성화(PGRST123 등), 그 외 오류는 그대로 전달
+        if e.response is None or e.response.status_code != 400:
+            raise
+
+    if candidates is None:
+        sample = reader.fetch_page(table, {**filters, 'select': column, 'limit': sample_size})
+        candidates = dict.fromkeys(row.get(column) for row in sample)
+
+    counts = {}
+    for value in candidates:
+        condition = 'is.null' if value is None else f'eq.{value}'
+        counts[value] = reader.count(table, {**filters, column: condition})
+
+    # 후보에 없는 값의 행 수 (전체 - 후보 합계)
+    other = reader.count(table, filters) - sum(counts.values())
+    if other > 0:
+        counts[OTHER_VALUES] = other
+    return {'method': 'head', 'counts': counts}
+
+
+def profile_table(reader: SupabaseReader, table: str, distribution_columns: Iterable[str] = (),
+                  null_counts: bool = False, filters: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    테이블 행 수, 컬럼 목록, 첫 행 예시, 값 분포를 서버 측 요청만으로 조사
+
+    행 수는 count=exact HEAD, 컬럼은 limit=1 표본, 분포는 서버 집계를 사용하므로
+    테이블을 내려받지 않으며 테이블이 커져도 조사 시간이 늘지 않습니다.
+
+    Args:
+        reader (SupabaseReader): Supabase reader
+        table (str): 테이블명
+        distribution_columns (Iterable[str]): 값 분포를 볼 컬럼 (테이블에 없는 컬럼은 건너뜀)
+        null_counts (bool): 컬럼별 NULL 개수 조사 여부 (컬럼당 HEAD 요청 1회)
+        filters (Optional[Dict[str, str]]): PostgREST 필터
+
+    Returns:
+        Dict[str, Any]: 조사 결과 (exists, rows, columns, sample, nulls, distributions)
+    """
+    filters = dict(filters or {})
+    try:
+        sample = reader.fetch_page(table, {**filters, 'select': '*', 'limit': 1})
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code == 404:
+            return {'table': table, 'exists': False}
+        raise
+
+    columns = list(sample[0].keys()) if sample else []
+    profile = {
+        'table': table,
+        'exists': True,
+        'rows': reader.count(table, filters),
+        'columns': columns,
+        'sample': sample[0] if sample else None,
+    }
+
+    if null_counts:
+        profile['nulls'] = {column: reader.count(table, {**filters, column: 'is.null'}) for column in columns}
+
+    # 여러 테이블을 한 번에 조사할 때 해당 테이블에 없는 컬럼은 제외
+    profile['distributions'] = {
+        column: value_counts(reader, table, column, filters)
+        for column in distribution_columns if not columns or column in columns
+    }
+    return profile
+
+
+def print_profile(profile: Dict[str, Any]):
+    """
+    조사 결과 출력
+    """
+    table = profile['table']
+    if not profile['exists']:
+        print(f"❌ {table} 테이블이 존재하지 않습니다.")
+        return
+
+    print(f"✅ {table}: {profile['rows']}개 행")
+    print(f"  컬럼: {profile['columns']}")
+    if profile['sample']:
+        print(f"  첫 번째 레코드 예시: {profile['sample']}")
+
+    for column, count in profile.get('nulls', {}).items():
+        if count:
+            print(f"  {column} NULL: {count}개")
+
+    for column, distribution in profile['distributions'].items():
+        print(f"  {column} 값 분포 ({distribution['method']}):")
+        for value, count in sorted(distribution['counts'].items(), key=lambda item: -item[1]):
+            print(f"    {value}: {count}개")
+
+
+def main():
+    """
+    Supabase 테이블 조사
+
+    python table_profiler.py ticker_info delisted_stocks --distribution listed_company --nulls
+    """
+    parser = argparse.ArgumentParser(description='Supabase 테이블 행 수/컬럼/값 분포 조사 (서버 측 집계)')
+    parser.add_argument('tables', nargs='+', help='조사할 테이블명')
+    parser.add_argument('--distribution', action='append', default=[], help='값 분포를 볼 컬럼 (여러 번 지정 가능)')
+    parser.add_argument('--nulls', action='store_true', help='컬럼별 NULL 개수 조사')
+    parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+    args = parser.parse_args()
+
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_ANON_KEY')
+    if not supabase_url or not supabase_key:
+        raise ValueError("Supabase URL과 API 키가 필요합니다. .env 파일을 확인해주세요.")
+
+    reader = SupabaseReader(supabase_url, supabase_key, session=create_session())
+    profiles: List[Dict[str, Any]] = []
+    for table in args.tables:
+        profile = profile_table(reader, table, args.distribution, args.nulls)
+        profiles.append(profile)
+        if not args.json:
+            print_profile(profile)
+
+    if args.json:
+        print(json.dumps(profiles, ensure_ascii=False, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import os
+import sys
+
+import pytest
+
+# scripts/ 모듈은 패키지가 아니라 같은 디렉터리에서 서로 import하므로 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from financial_ingest import FINANCIAL_COLUMNS, FinancialBatch  # noqa: E402
+
+
+def make_rows(filings, accounts=3):
+    """
+    (ticker, year, reprt_code, fs_div) 보고서마다 계정 행 accounts개씩 만들기
+    """
+    rows = []
+    for ticker, year, reprt_code, fs_div in filings:
+        for i in range(accounts):
+            rows.append({
+                'ticker': ticker, 'year': year, 'account_id': f'ifrs-full_Account{i}',
+                'account_nm': f'계정{i}', 'account_detail': '-',
+                'this_term_amount': 1000 * (i + 1), 'prev_term_amount': 900 * (i + 1),
+                'statement_name': '재무상태표', 'fs_div': fs_div, 'reprt_code': reprt_code,
+            })
+    return rows
+
+
+@pytest.fixture
+def batch_factory():
+    def factory(filings, accounts=3):
+        return FinancialBatch.from_rows(make_rows(filings, accounts))
+    return factory
+
+
+@pytest.fixture
+def columns():
+    return FINANCIAL_COLUMNS
+
+
+# 가짜 서버 기업 fixture: (ticker, corp_code, 폐지일, 폐지 직전년도 재무제표 구분)
+STUB_COMPANIES = [
+    ('000010', '00000010', '20210501', 'CFS'),
+    ('000020', '00000020', '20220301', None),
+    ('000030', '00000030', '20230301', 'OFS'),
+    ('000040', '00000040', '20240301', 'CFS'),
+]
+
+
+@pytest.fixture
+def stub_fixtures(tmp_path):
+    """
+    STUB_COMPANIES로 가짜 서버용 (재무제표 CSV, 기업 목록 CSV) fixture 파일 만들기
+    """
+    import csv
+
+    from output_writer import CsvBatchWriter
+
+    companies_path = str(tmp_path / 'companies.csv')
+    with open(companies_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ticker', 'corp_name', 'delisting_date', 'delisting_reason', 'corp_code', 'listed_company'])
+        for ticker, corp_code, delisting_date, _ in STUB_COMPANIES:
+            writer.writerow([ticker, f'기업{ticker}', delisting_date, '-', corp_code, '0'])
+
+    financials_path = str(tmp_path / 'financials.csv')
+    writer = CsvBatchWriter(financials_path)
+    writer.write_rows(make_rows([
+        (ticker, str(int(delisting_date[:4]) - 1), '11011', fs_div)
+        for ticker, _, delisting_date, fs_div in STUB_COMPANIES if fs_div
+    ]))
+    writer.close()
+    return financials_path, companies_path
+
+
+@pytest.fixture
+def stub_server(stub_fixtures):
+    """
+    작은 fixture로 가짜 DART/Supabase 서버를 띄우고 StubState 반환 (state.config로 장애 주입)
+    """
+    import threading
+
+    from dart_stub_server import StubState, create_server, load_fixtures
+
+    state = StubState(*load_fixtures(*stub_fixtures))
+    server = create_server(state)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    state.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def loader_env(tmp_path, stub_server, monkeypatch):
+    """
+    가짜 서버와 임시 경로를 쓰는 로더 환경 변수 (재시도 없음, 출력은 tmp_path/out.csv)
+    """
+    settings = {
+        'SUPABASE_URL': stub_server.base_url,
+        'SUPABASE_ANON_KEY': 'test',
+        'DART_API_KEY': 'test',
+        'DART_BASE_URL': f"{stub_server.base_url}/api",
+        'DART_REQUESTS_PER_SECOND': '1000',
+        'DART_CACHE_PATH': '',
+        'DART_CORP_INDEX_PATH': '',
+        'DELIST_COMPANIES_PATH': '',
+        'DELIST_STATE_PATH': str(tmp_path / 'state.sqlite3'),
+        'DELIST_OUTPUT_PATH': str(tmp_path / 'out.csv'),
+        'DELIST_REPORT_PATH': '',
+        'DELIST_PROMETHEUS_PATH': '',
+        'DELIST_STORE': '',
+        'DELIST_ACCOUNT_TAXONOMY': '',
+        'HTTP_MAX_RETRIES': '0',
+    }
+    for key, value in settings.items():
+        monkeypatch.setenv(key, value)
+    for key in ('DELIST_SHARD', 'DART_FS_ROUTING', 'DELIST_DB_SINK', 'DART_MAX_WORKERS'):
+        monkeypatch.delenv(key, raising=False)
+    return settings
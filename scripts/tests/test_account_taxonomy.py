@@ -0,0 +1,36 @@
+from account_taxonomy import AccountTaxonomy, normalize_account_nm
+from financial_ingest import ingest_statement_list
+
+STATEMENT = [
+    {'account_id': 'ifrs_CurrentAssets', 'account_nm': '유동자산', 'sj_nm': '재무상태표',
+     'thstrm_amount': '100', 'frmtrm_amount': '90'},
+    {'account_id': '-표준계정코드 미사용-', 'account_nm': '현금및현금성자산', 'sj_nm': '재무상태표',
+     'thstrm_amount': '10', 'frmtrm_amount': '9'},
+]
+
+
+def test_canonicalize_batch_keeps_raw_account_id():
+    batch = ingest_statement_list('000010', '2020', STATEMENT, 'CFS', '11011')
+
+    canonical = AccountTaxonomy().canonicalize_batch(batch)
+
+    assert canonical.columns['account_id'] == ['ifrs-full_CurrentAssets', 'ifrs-full_CashAndCashEquivalents']
+    assert canonical.columns['raw_account_id'] == ['ifrs_CurrentAssets', '-표준계정코드 미사용-']
+
+
+def test_learn_csv_uses_raw_account_id(tmp_path):
+    from output_writer import CsvBatchWriter
+
+    statement = [{'account_id': 'entity00010_Special', 'account_nm': '특수자산', 'sj_nm': '재무상태표',
+                  'thstrm_amount': '1', 'frmtrm_amount': '1'}]
+    taxonomy = AccountTaxonomy({('재무상태표', normalize_account_nm('특수자산')): 'dart_SpecialAssets'})
+
+    path = tmp_path / 'financials.csv'
+    writer = CsvBatchWriter(str(path))
+    for ticker in ('000010', '000020', '000030'):
+        writer.write_batch(taxonomy.canonicalize_batch(ingest_statement_list(ticker, '2020', statement, 'CFS', '11011')))
+    writer.close()
+
+    # 색인이 바꿔 쓴 account_id를 DART 원본처럼 다시 학습하지 않음
+    learned = AccountTaxonomy.learn_csv(str(path))
+    assert ('재무상태표', normalize_account_nm('특수자산')) not in learned.names
@@ -0,0 +1,9 @@
+from backfill_planner import BackfillPlanner
+
+
+def test_every_year_is_fetched_by_default():
+    assert BackfillPlanner(years_back=3).annual_years(2022) == [2022, 2021, 2020]
+
+
+def test_skip_covered_years_is_opt_in():
+    assert BackfillPlanner(years_back=3, skip_covered_years=True).annual_years(2022) == [2022, 2020]
@@ -0,0 +1,23 @@
+import json
+import sys
+
+import benchmark_loader
+
+
+def test_benchmark_writes_json_output(tmp_path, stub_fixtures, monkeypatch):
+    financials_path, companies_path = stub_fixtures
+    output = tmp_path / 'benchmark.json'
+    monkeypatch.setenv('DELIST_STORE', '')
+    monkeypatch.setenv('DELIST_ACCOUNT_TAXONOMY', '')
+    monkeypatch.setenv('DELIST_REPORT_PATH', '')
+    monkeypatch.setenv('DELIST_PROMETHEUS_PATH', '')
+    monkeypatch.setattr(sys, 'argv', [
+        'benchmark_loader.py', '--workers', '1', '--latency', '0', '--jitter', '0',
+        '--financials', financials_path, '--companies', companies_path, '--output', str(output),
+    ])
+
+    benchmark_loader.main()
+
+    result = json.loads(output.read_text(encoding='utf-8'))
+    assert result['config']['failing'] == []
+    assert result['results'][0]['companies'] == 4
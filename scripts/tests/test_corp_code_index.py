@@ -0,0 +1,52 @@
+import io
+import zipfile
+
+import pytest
+import requests
+
+from corp_code_index import CorpCodeIndex, download_corp_code_zip
+
+CORP_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?><result><list><corp_code>00000010</corp_code>'
+    '<corp_name>기업000010</corp_name><stock_code>000010</stock_code><modify_date>20240101</modify_date>'
+    '</list></result>'
+)
+
+
+class StreamingSession:
+    def __init__(self, body):
+        self.body = body
+        self.kwargs = None
+
+    def get(self, url, **kwargs):
+        self.kwargs = kwargs
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(self.body)
+        return response
+
+
+def _zip_bytes():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('CORPCODE.xml', CORP_XML)
+    return buffer.getvalue()
+
+
+def test_download_streams_zip_to_file(tmp_path):
+    session = StreamingSession(_zip_bytes())
+    path = str(tmp_path / 'corp' / 'corpCode.zip')
+
+    assert download_corp_code_zip(session, 'key', path) == path
+    assert session.kwargs['stream'] is True
+    assert not (tmp_path / 'corp' / 'corpCode.zip.tmp').exists()
+    assert CorpCodeIndex.from_xml(path).by_corp_code['00000010'].stock_code == '000010'
+
+
+def test_download_error_response_raises(tmp_path):
+    body = '<result><status>010</status><message>등록되지 않은 키입니다.</message></result>'.encode()
+    path = tmp_path / 'corpCode.zip'
+
+    with pytest.raises(ValueError, match='등록되지 않은 키'):
+        download_corp_code_zip(StreamingSession(body), 'key', str(path))
+    assert not path.exists() and not (tmp_path / 'corpCode.zip.tmp').exists()
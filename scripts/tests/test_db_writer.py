@@ -0,0 +1,46 @@
+from account_taxonomy import AccountTaxonomy
+from db_writer import KEY_COLUMNS, PostgrestUpsertWriter, create_table_sql
+from financial_ingest import ingest_statement_list
+
+STATEMENT = [
+    {'account_id': 'entity00010_Special', 'account_nm': '특수자산', 'sj_nm': '재무상태표',
+     'thstrm_amount': '1', 'frmtrm_amount': '1'},
+    {'account_id': 'entity00010_Special', 'account_nm': '특수자산', 'sj_nm': '재무상태표',
+     'thstrm_amount': '2', 'frmtrm_amount': '2'},
+]
+
+
+class RecordingSession:
+    def __init__(self):
+        self.posts = []
+
+    def post(self, url, headers=None, params=None, json=None):
+        self.posts.append((params, json))
+        return self
+
+    def raise_for_status(self):
+        pass
+
+
+def test_upsert_key_does_not_depend_on_taxonomy():
+    session = RecordingSession()
+    writer = PostgrestUpsertWriter(session, 'http://supabase', 'key')
+    batch = ingest_statement_list('000010', '2020', STATEMENT, 'CFS', '11011')
+
+    # 계정 색인을 바꾼 뒤 같은 보고서를 다시 저장
+    writer.write_batch(batch)
+    taxonomy = AccountTaxonomy({('재무상태표', '특수자산'): 'dart_SpecialAssets'})
+    writer.write_batch(taxonomy.canonicalize_batch(batch))
+
+    (first_params, first), (second_params, second) = session.posts
+    assert first_params['on_conflict'] == second_params['on_conflict'] == ','.join(KEY_COLUMNS)
+    assert [[row[c] for c in KEY_COLUMNS] for row in first] == [[row[c] for c in KEY_COLUMNS] for row in second]
+    assert [row['account_id'] for row in second] == ['dart_SpecialAssets'] * 2
+    assert [row['raw_account_id'] for row in second] == ['entity00010_Special'] * 2
+
+
+def test_create_table_sql_migrates_old_primary_key():
+    sql = create_table_sql('delisted_financials')
+
+    assert 'PRIMARY KEY (ticker, year, reprt_code, fs_div, line_no)' in sql
+    assert 'DROP CONSTRAINT delisted_financials_pkey' in sql
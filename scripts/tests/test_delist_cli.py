@@ -0,0 +1,31 @@
+import pandas as pd
+
+from delist_cli import main
+from output_writer import CsvBatchWriter
+
+BALANCE_ACCOUNTS = {'ifrs-full_Assets': 1000, 'ifrs-full_Liabilities': 600, 'ifrs-full_Equity': 400}
+
+
+def _write_balance_sheets(path, filings):
+    rows = [
+        {
+            'ticker': ticker, 'year': year, 'account_id': account_id, 'account_nm': account_id,
+            'account_detail': '-', 'this_term_amount': amount, 'prev_term_amount': amount,
+            'statement_name': '재무상태표', 'fs_div': 'CFS', 'reprt_code': '11011',
+        }
+        for ticker, year in filings
+        for account_id, amount in BALANCE_ACCOUNTS.items()
+    ]
+    writer = CsvBatchWriter(str(path))
+    writer.write_rows(rows)
+    writer.close()
+
+
+def test_ratios_filters_every_requested_year(tmp_path):
+    source, output = tmp_path / 'financials.csv', tmp_path / 'ratios.csv'
+    _write_balance_sheets(source, [('000010', '2020'), ('000010', '2021'), ('000020', '2022')])
+
+    assert main(['ratios', '--input', str(source), '--year', '2020', '--year', '2021', '--output', str(output)]) == 0
+
+    graded = pd.read_csv(output, dtype={'ticker': str})
+    assert sorted(graded['year'].tolist()) == [2020, 2021]
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_matrix import build_feature_matrix
+
+
+@pytest.fixture
+def financials(batch_factory):
+    df = batch_factory([
+        ('000010', '2020', '11011', 'CFS'),
+        ('000020', '2020', '11011', 'CFS'),
+        ('000030', '2020', '11011', 'OFS'),
+    ], accounts=3).to_pandas()
+    # 000020은 계정 하나가 없고, 000030의 금액 0은 결측이 아닌 값으로 남아야 함
+    df = df[~((df['ticker'] == '000020') & (df['account_id'] == 'ifrs-full_Account1'))]
+    df.loc[(df['ticker'] == '000030') & (df['account_id'] == 'ifrs-full_Account2'), 'this_term_amount'] = 0.0
+    return df.reset_index(drop=True)
+
+
+@pytest.mark.parametrize('backend', ['sparse', 'csr'])
+def test_sparse_backends_match_dense(financials, backend):
+    if backend == 'csr':
+        pytest.importorskip('scipy')
+    dense = build_feature_matrix(financials)
+
+    result = build_feature_matrix(financials, backend=backend)
+    frame = result if backend == 'sparse' else result.to_pandas()
+
+    assert all(isinstance(dtype, pd.SparseDtype) for dtype in frame.dtypes)
+    pd.testing.assert_frame_equal(frame.sparse.to_dense(), dense, check_names=False)
+    assert np.isnan(dense.loc['000020', 'ifrs-full_Account1'])
+    assert frame.loc['000030', 'ifrs-full_Account2'] == 0.0
+    assert frame['ifrs-full_Account1'].sparse.density == pytest.approx(2 / 3)
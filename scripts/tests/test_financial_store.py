@@ -0,0 +1,94 @@
+from financial_store import FinancialStore
+from output_writer import CsvBatchWriter
+
+FILINGS = [
+    ('000010', '2020', '11011', 'CFS'),
+    ('000010', '2021', '11011', 'CFS'),
+    ('000020', '2020', '11011', 'OFS'),
+    ('000030', '2019', '11014', 'CFS'),
+]
+
+
+def _write_csv(path, batch):
+    writer = CsvBatchWriter(str(path))
+    writer.write_batch(batch)
+    writer.close()
+
+
+def _count(store):
+    return store._conn.execute("SELECT COUNT(*) FROM financials").fetchone()[0]
+
+
+def test_import_csv_keeps_filings_split_across_chunks(tmp_path, batch_factory):
+    path = tmp_path / 'financials.csv'
+    _write_csv(path, batch_factory(FILINGS, accounts=7))
+
+    store = FinancialStore(str(tmp_path / 'store.sqlite3'))
+    # 청크 경계가 보고서 중간에 걸리도록 보고서 행 수(7)보다 작고 서로소인 크기 사용
+    assert store.import_csv(str(path), chunksize=3) == 28
+    assert _count(store) == 28
+    assert len(store.query(tickers=['000010'], years=[2020])) == 7
+    store.close()
+
+
+def test_reimport_replaces_instead_of_duplicating(tmp_path, batch_factory):
+    path = tmp_path / 'financials.csv'
+    _write_csv(path, batch_factory(FILINGS, accounts=5))
+
+    store = FinancialStore(str(tmp_path / 'store.sqlite3'))
+    store.import_csv(str(path), chunksize=4)
+    store.import_csv(str(path), chunksize=4)
+    assert _count(store) == 20
+    store.close()
+
+
+def test_write_batch_replaces_whole_filing(tmp_path, batch_factory):
+    store = FinancialStore(str(tmp_path / 'store.sqlite3'))
+    store.write_batch(batch_factory(FILINGS[:2], accounts=5))
+    store.write_batch(batch_factory(FILINGS[:1], accounts=2))
+
+    assert len(store.query(tickers=['000010'], years=[2020])) == 2
+    assert len(store.query(tickers=['000010'], years=[2021])) == 5
+    store.close()
+
+
+def test_legacy_store_gets_raw_account_id_column(tmp_path, batch_factory):
+    import sqlite3
+
+    path = str(tmp_path / 'store.sqlite3')
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE financials (ticker TEXT NOT NULL, year INTEGER NOT NULL, account_id TEXT, account_nm TEXT, "
+        "account_detail TEXT, this_term_amount DOUBLE, prev_term_amount DOUBLE, statement_name TEXT, "
+        "fs_div TEXT NOT NULL, reprt_code TEXT NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO financials VALUES ('000010', 2020, 'ifrs_Assets', '자산', '-', 1, 1, '재무상태표', 'CFS', '11011')"
+    )
+    conn.commit()
+    conn.close()
+
+    store = FinancialStore(path)
+    store.write_batch(batch_factory([('000020', '2020', '11011', 'CFS')]))
+
+    df = store.query(columns=['ticker', 'account_id', 'raw_account_id'])
+    assert (df['raw_account_id'] == df['account_id']).all()
+    assert len(df) == 4
+    store.close()
+
+
+def test_loader_store_is_opt_in(loader_env, monkeypatch):
+    from delist_data_loader import DelistDataLoader
+
+    monkeypatch.delenv('DELIST_STORE')
+    monkeypatch.delenv('DELIST_STORE_PATH', raising=False)
+    assert DelistDataLoader().store_engine == ''
+
+
+def test_sharded_loader_uses_per_shard_store(loader_env, monkeypatch):
+    from delist_data_loader import DelistDataLoader
+
+    monkeypatch.setenv('DELIST_STORE', 'sqlite')
+    monkeypatch.delenv('DELIST_STORE_PATH', raising=False)
+    paths = {DelistDataLoader(shard=(index, 2)).store_path for index in range(2)}
+    assert paths == {'data/delisted_financials.shard-0-of-2.sqlite3', 'data/delisted_financials.shard-1-of-2.sqlite3'}
@@ -0,0 +1,66 @@
+import pytest
+
+from dart_stub_server import StubConfig
+from fs_router import CFS, OFS, SEQUENTIAL_CFS_FIRST, SEQUENTIAL_OFS_FIRST, SPECULATIVE, FsDivRouter
+
+
+def test_default_mode_queries_cfs_then_ofs():
+    router = FsDivRouter({'00000010': CFS, '00000030': OFS})
+
+    # 추가 DART 호출이 없는 순차 조회가 기본값
+    assert router.mode == 'off'
+    assert {router.route(corp_code) for corp_code in ('00000010', '00000030', '00000099')} == {SEQUENTIAL_CFS_FIRST}
+
+
+def test_strict_mode_keeps_cfs_first_for_known_ofs_companies():
+    router = FsDivRouter({'00000010': CFS, '00000030': OFS}, mode='strict')
+
+    assert router.route('00000010') == SEQUENTIAL_CFS_FIRST
+    assert router.route('00000030') == SPECULATIVE
+    assert router.route('00000099') == SPECULATIVE
+
+
+def test_learned_mode_routes_known_ofs_companies_ofs_first():
+    router = FsDivRouter({'00000030': OFS}, mode='learned')
+
+    assert router.route('00000030') == SEQUENTIAL_OFS_FIRST
+    with pytest.raises(ValueError):
+        FsDivRouter(mode='cfs-only')
+
+
+@pytest.fixture
+def loader(loader_env):
+    from delist_data_loader import DelistDataLoader
+
+    loader = DelistDataLoader(max_workers=1)
+    yield loader
+    loader.state.close()
+
+
+def test_flaky_cfs_does_not_learn_ofs_route(loader, stub_server):
+    # 000030(00000030)은 2022년 OFS만 있는 기업
+    stub_server.config = StubConfig(failing=frozenset({('00000030', CFS)}))
+    fetch = loader.fetch_financial_data('00000030', '2022')
+
+    assert fetch.data == [] and not fetch.definitive
+    assert not loader.fs_router.is_known('00000030')
+
+    stub_server.config = StubConfig()
+    fetch = loader.fetch_financial_data('00000030', '2022')
+
+    assert fetch.fs_div == OFS and fetch.definitive
+    assert loader.fs_router.routes['00000030'] == OFS
+
+
+@pytest.mark.parametrize('mode', ['strict', 'learned', 'off'])
+def test_company_that_starts_filing_cfs_gets_cfs(loader, stub_server, mode):
+    # OFS로 기록된 기업이 이번 연도에는 CFS와 OFS를 모두 공시한 경우
+    cfs = stub_server.statements[('00000010', '2020', '11011', CFS)]
+    stub_server.statements[('00000010', '2020', '11011', OFS)] = [dict(item, account_nm='개별') for item in cfs]
+    loader.fs_router = FsDivRouter({'00000010': OFS}, mode=mode)
+
+    fetch = loader.fetch_financial_data('00000010', '2020')
+
+    assert fetch.fs_div == CFS and fetch.definitive
+    assert {item['account_nm'] for item in fetch.data} != {'개별'}
+    assert loader.fs_router.routes['00000010'] == CFS
@@ -0,0 +1,89 @@
+import json
+
+import requests
+from requests.adapters import BaseAdapter
+
+from http_client import RetryingSession
+
+
+class SequenceAdapter(BaseAdapter):
+    """
+    미리 정한 (HTTP 상태, DART status) 순서대로 응답하는 어댑터
+    """
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.calls = 0
+
+    def send(self, request, **kwargs):
+        status_code, dart_status = self.responses[min(self.calls, len(self.responses) - 1)]
+        self.calls += 1
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers['Content-Type'] = 'application/json'
+        response._content = json.dumps({'status': dart_status}).encode()
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self, tokens=1.0):
+        self.acquired += tokens
+        return 0.0
+
+
+def _session(responses, max_retries=3):
+    session = RetryingSession(max_retries=max_retries, backoff_base=0)
+    adapter = SequenceAdapter(responses)
+    session.mount('http://', adapter)
+    return session, adapter
+
+
+def test_every_retry_takes_a_limiter_token():
+    session, adapter = _session([(429, None), (200, '020'), (200, '000')])
+    limiter = CountingLimiter()
+
+    response = session.get('http://dart.test/api/x.json', limiter=limiter)
+
+    assert response.json()['status'] == '000'
+    assert adapter.calls == 3
+    assert limiter.acquired == 3
+    assert session.throttle_count == 2
+
+
+def test_exhausted_retries_return_last_response():
+    session, adapter = _session([(200, '020')], max_retries=2)
+    limiter = CountingLimiter()
+
+    response = session.get('http://dart.test/api/x.json', limiter=limiter)
+
+    assert response.json()['status'] == '020'
+    assert adapter.calls == limiter.acquired == 3
+
+
+def test_without_limiter():
+    session, adapter = _session([(503, None), (200, '000')])
+
+    assert session.get('http://dart.test/api/x.json').json()['status'] == '000'
+    assert adapter.calls == 2
+
+
+def test_dart_body_is_parsed_once(monkeypatch):
+    session, _ = _session([(200, '000')])
+    parses = []
+    original = requests.Response.json
+    monkeypatch.setattr(requests.Response, 'json', lambda self, **kwargs: parses.append(1) or original(self, **kwargs))
+
+    response = session.get('http://dart.test/api/x.json')
+
+    assert response.json()['status'] == '000'
+    assert response.json() is response.json()
+    assert len(parses) == 1
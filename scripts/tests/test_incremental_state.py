@@ -0,0 +1,67 @@
+import pandas as pd
+
+from dart_stub_server import StubConfig
+from delist_data_loader import DelistDataLoader
+from state_store import LoaderStateStore
+
+
+def _run(loader_env, **kwargs):
+    loader = DelistDataLoader(max_workers=2)
+    try:
+        return loader.process_all_delisted_companies(incremental=True, **kwargs)
+    finally:
+        loader.state.close()
+
+
+def _state(loader_env):
+    return LoaderStateStore(loader_env['DELIST_STATE_PATH'])
+
+
+def _tickers(loader_env):
+    return set(pd.read_csv(loader_env['DELIST_OUTPUT_PATH'], dtype=str, encoding='utf-8-sig')['ticker'])
+
+
+def test_failed_company_is_retried_on_next_incremental_run(loader_env, stub_server):
+    stub_server.config = StubConfig(failing=frozenset({'00000040'}))
+    summary = _run(loader_env)
+    assert summary['failed'] == 1
+
+    state = _state(loader_env)
+    # 데이터 없음(013)으로 확인된 000020은 처리 완료, 조회에 실패한 000040은 기록하지 않음
+    assert state.stats()['companies'] == 3
+    assert state.get_watermark() == '20230301'
+    state.close()
+
+    stub_server.config = StubConfig()
+    summary = _run(loader_env)
+    assert (summary['companies'], summary['succeeded'], summary['failed']) == (1, 1, 0)
+    assert _tickers(loader_env) == {'000010', '000030', '000040'}
+
+    state = _state(loader_env)
+    assert state.stats()['companies'] == 4
+    assert state.get_watermark() == '20240301'
+    state.close()
+
+    assert _run(loader_env)['companies'] == 0
+
+
+def test_watermark_stays_below_earliest_failure(loader_env, stub_server):
+    stub_server.config = StubConfig(failing=frozenset({'00000010'}))
+    _run(loader_env)
+
+    state = _state(loader_env)
+    assert state.get_watermark() is None
+    assert state.stats()['companies'] == 3
+    state.close()
+
+
+def test_ofs_result_is_withheld_when_cfs_lookup_fails(loader_env, stub_server):
+    stub_server.config = StubConfig(failing=frozenset({('00000030', 'CFS')}))
+    summary = _run(loader_env)
+
+    assert summary['failed'] == 1
+    assert '000030' not in _tickers(loader_env)
+
+    stub_server.config = StubConfig()
+    _run(loader_env)
+    assert '000030' in _tickers(loader_env)
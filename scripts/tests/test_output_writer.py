@@ -0,0 +1,103 @@
+import pandas as pd
+import pytest
+
+from output_writer import CheckpointManifest, CsvBatchWriter
+
+
+def _read(path):
+    return pd.read_csv(path, dtype=str, encoding='utf-8-sig')
+
+
+def test_checkpoint_keys_round_trip(tmp_path):
+    manifest = CheckpointManifest(str(tmp_path / 'out.csv.done'))
+    manifest.mark_completed(['000010|2020|11011', '000020|2021|11014'], '100')
+
+    assert manifest.load() == {'000010|2020|11011', '000020|2021|11014'}
+    assert manifest.positions() == ['100']
+
+
+def test_checkpoint_ignores_keys_without_position(tmp_path):
+    path = tmp_path / 'out.csv.done'
+    path.write_text('000010|2020|11011\n@100\n000020|2020|11011\n000030|2020|11011', encoding='utf-8')
+
+    assert CheckpointManifest(str(path)).load() == {'000010|2020|11011'}
+
+
+def test_checkpoint_legacy_file_without_positions(tmp_path):
+    path = tmp_path / 'out.csv.done'
+    path.write_text('000010|2020|11011\n000020|2020|11011\n', encoding='utf-8')
+
+    manifest = CheckpointManifest(str(path))
+    assert manifest.load() == {'000010|2020|11011', '000020|2020|11011'}
+    assert manifest.positions() == []
+
+
+def test_resume_discards_rows_written_after_last_checkpoint(tmp_path, batch_factory):
+    output = str(tmp_path / 'out.csv')
+    manifest = CheckpointManifest(f"{output}.done")
+
+    writer = CsvBatchWriter(output)
+    manifest.mark_completed([], writer.position())
+    writer.write_batch(batch_factory([('000010', '2020', '11011', 'CFS')]))
+    manifest.mark_completed(['000010|2020|11011'], writer.position())
+    # 기록은 끝났지만 체크포인트를 남기기 전에 중단
+    writer.write_batch(batch_factory([('000020', '2020', '11011', 'CFS')]))
+    writer.close()
+    assert len(_read(output)) == 6
+
+    resumed = CsvBatchWriter(output, append=True)
+    assert resumed.discard_uncommitted(manifest.positions()) == 3
+    assert manifest.load() == {'000010|2020|11011'}
+    resumed.write_batch(batch_factory([('000020', '2020', '11011', 'CFS')]))
+    resumed.close()
+
+    frame = _read(output)
+    assert len(frame) == 6
+    assert not frame.duplicated().any()
+
+
+def test_resume_without_positions_keeps_output(tmp_path, batch_factory):
+    output = str(tmp_path / 'out.csv')
+    writer = CsvBatchWriter(output)
+    writer.write_batch(batch_factory([('000010', '2020', '11011', 'CFS')]))
+    writer.close()
+
+    resumed = CsvBatchWriter(output, append=True)
+    assert resumed.discard_uncommitted([]) == 0
+    resumed.close()
+    assert len(_read(output)) == 3
+
+
+def test_columnar_resume_discards_uncommitted_parts(tmp_path, batch_factory):
+    pytest.importorskip('pyarrow')
+    from columnar_output import ColumnarBatchWriter, read_financials
+
+    root = str(tmp_path / 'dataset')
+    manifest = CheckpointManifest(f"{root}.done")
+
+    writer = ColumnarBatchWriter(root)
+    manifest.mark_completed([], writer.position())
+    writer.write_batch(batch_factory([('000010', '2020', '11011', 'CFS')]))
+    manifest.mark_completed(['000010|2020|11011'], writer.position())
+    writer.write_batch(batch_factory([('000020', '2021', '11011', 'OFS')]))
+
+    resumed = ColumnarBatchWriter(root, append=True)
+    assert resumed.discard_uncommitted(manifest.positions()) == 1
+    assert len(read_financials(root)) == 3
+
+
+def test_append_to_legacy_csv_keeps_existing_header(tmp_path, batch_factory, columns):
+    output = tmp_path / 'out.csv'
+    legacy = [column for column in columns if column != 'raw_account_id']
+    writer = CsvBatchWriter(str(output), columns=legacy)
+    writer.write_batch(batch_factory([('000010', '2020', '11011', 'CFS')]))
+    writer.close()
+
+    writer = CsvBatchWriter(str(output), append=True)
+    writer.write_batch(batch_factory([('000020', '2020', '11011', 'CFS')]))
+    writer.close()
+
+    df = _read(output)
+    assert list(df.columns) == legacy
+    assert len(df) == 6
+    assert df.notna().all().all()
@@ -0,0 +1,104 @@
+import pandas as pd
+import pytest
+
+from financial_ingest import FINANCIAL_COLUMNS, FinancialBatch
+from output_writer import CsvBatchWriter
+from sharding import merge_shard_outputs, shard_api_settings, shard_of, shard_output_path
+
+
+def test_shard_assignment_is_stable():
+    assert shard_of('005930', 4) == shard_of('005930', 4)
+    assert {shard_of(f'{i:06d}', 4) for i in range(200)} == {0, 1, 2, 3}
+
+
+def test_single_key_splits_rate_across_shards():
+    assert shard_api_settings(4, [], 10.0) == [(None, 2.5)] * 4
+
+
+def test_keys_split_rate_between_shards_sharing_a_key():
+    settings = shard_api_settings(3, ['a', 'b'], 10.0)
+    assert settings == [('a', 5.0), ('b', 10.0), ('a', 5.0)]
+
+
+def test_one_key_per_shard_keeps_full_rate():
+    assert shard_api_settings(2, ['a', 'b'], 0) == [('a', 0.0), ('b', 0.0)]
+
+
+def test_shared_key_without_rate_limit_is_refused():
+    with pytest.raises(ValueError):
+        shard_api_settings(4, [], 0)
+
+
+def _write_shard(path, batches):
+    writer = CsvBatchWriter(path)
+    for batch in batches:
+        writer.write_batch(batch)
+    writer.close()
+
+
+def test_csv_merge_keeps_first_shard_per_filing(tmp_path, batch_factory):
+    output = str(tmp_path / 'out.csv')
+    first = batch_factory([('000010', '2020', '11011', 'CFS')])
+    # DART가 한 보고서 안에서 모든 컬럼이 같은 행을 돌려준 경우 (그대로 남아야 함)
+    repeated = FinancialBatch.concat([first, FinancialBatch.from_rows(list(first.iter_rows())[:1])])
+    _write_shard(shard_output_path(output, 0, 2), [repeated])
+    # 샤드 1에도 같은 보고서가 있고(샤드 수 변경 등) 새 보고서가 하나 있음
+    _write_shard(shard_output_path(output, 1, 2), [first, batch_factory([('000020', '2021', '11011', 'OFS')])])
+
+    assert merge_shard_outputs(output, 2) == 7
+
+    merged = pd.read_csv(output, dtype=str, encoding='utf-8-sig')
+    assert merged.duplicated(subset=FINANCIAL_COLUMNS).sum() == 1
+    assert merged['ticker'].value_counts().to_dict() == {'000010': 4, '000020': 3}
+
+
+def test_csv_merge_fills_columns_missing_from_legacy_shards(tmp_path, batch_factory):
+    output = str(tmp_path / 'out.csv')
+    legacy = [column for column in FINANCIAL_COLUMNS if column not in ('reprt_code', 'raw_account_id')]
+    writer = CsvBatchWriter(shard_output_path(output, 0, 2), columns=legacy)
+    writer.write_batch(batch_factory([('000010', '2020', '11011', 'CFS')]))
+    writer.close()
+    _write_shard(shard_output_path(output, 1, 2), [batch_factory([('000020', '2021', '11014', 'OFS')])])
+
+    assert merge_shard_outputs(output, 2) == 6
+
+    merged = pd.read_csv(output, dtype=str, encoding='utf-8-sig')
+    assert list(merged.columns) == FINANCIAL_COLUMNS
+    assert list(merged['reprt_code']) == ['11011'] * 3 + ['11014'] * 3
+    assert (merged['raw_account_id'] == merged['account_id']).all()
+
+
+def test_columnar_merge_keeps_first_shard_per_filing(tmp_path, batch_factory):
+    pytest.importorskip('pyarrow')
+    from columnar_output import ColumnarBatchWriter, read_financials
+
+    output = str(tmp_path / 'dataset')
+    first = batch_factory([('000010', '2020', '11011', 'CFS')])
+    repeated = FinancialBatch.concat([first, FinancialBatch.from_rows(list(first.iter_rows())[:1])])
+    for index, batches in enumerate([[repeated], [first, batch_factory([('000020', '2021', '11011', 'OFS')])]]):
+        writer = ColumnarBatchWriter(shard_output_path(output, index, 2))
+        for batch in batches:
+            writer.write_batch(batch)
+
+    assert merge_shard_outputs(output, 2, 'parquet') == 7
+    assert len(read_financials(output)) == 7
+
+
+def test_columnar_merge_reads_shards_without_raw_account_id(tmp_path, batch_factory):
+    import pyarrow.parquet as pq
+
+    from columnar_output import ColumnarBatchWriter, read_financials
+
+    output = str(tmp_path / 'out.parquet')
+    for index, filings in enumerate(([('000010', '2020', '11011', 'CFS')], [('000020', '2020', '11011', 'CFS')])):
+        writer = ColumnarBatchWriter(shard_output_path(output, index, 2), 'parquet')
+        writer.write_batch(batch_factory(filings))
+        writer.close()
+
+    # 0번 샤드를 raw_account_id 컬럼 이전 형식 파일로 바꿈
+    for path in (tmp_path / 'out.shard-0-of-2.parquet').rglob('*.parquet'):
+        pq.write_table(pq.read_table(path).drop_columns(['raw_account_id']), path)
+
+    assert merge_shard_outputs(output, 2, 'parquet') == 6
+    df = read_financials(output)
+    assert list(df['raw_account_id']) == list(df['account_id'])